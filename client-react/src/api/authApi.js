@@ -92,6 +92,27 @@ export const resetPassword = async (token, password) => {
   }
 };
 
+/**
+ * Cierra la sesión en el servidor (revoca el refresh token y los access
+ * tokens de la sesión)
+ * @param {string} refreshToken - Refresh token de la sesión
+ * @returns {Promise<Object>} Confirmación del cierre
+ */
+export const logoutUser = async (refreshToken) => {
+  try {
+    const res = await api.post("/api/auth/logout", {
+      refresh_token: refreshToken,
+    });
+    return res.data;
+  } catch (error) {
+    console.error(
+      "Error al cerrar sesión:",
+      error.response?.data?.error || error.message
+    );
+    throw error;
+  }
+};
+
 /**
  * Elimina la cuenta del usuario autenticado
  * @returns {Promise<Object>} Confirmación de eliminación
@@ -3,9 +3,15 @@
  * - Establece la URL base del backend
  * - Configura headers por defecto
  * - Añade interceptor para incluir JWT token automáticamente en todas las peticiones
+ * - Renueva el access token con el refresh token cuando expira y reintenta
  */
 import axios from "axios";
-import { getToken } from "../utils/sessionManager";
+import {
+  getToken,
+  getRefreshToken,
+  setTokens,
+  clearSession,
+} from "../utils/sessionManager";
 
 const api = axios.create({
   baseURL: "http://localhost:5000",
@@ -27,4 +33,55 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+let renovacionEnCurso = null;
+
+/**
+ * Canjea el refresh token por un par nuevo. Las peticiones que fallan a la
+ * vez comparten una sola renovación.
+ * @returns {Promise<string>} Access token nuevo
+ */
+export const refrescarSesion = () => {
+  if (!renovacionEnCurso) {
+    const refreshToken = getRefreshToken();
+    renovacionEnCurso = axios
+      .post(`${api.defaults.baseURL}/api/auth/refresh`, {
+        refresh_token: refreshToken,
+      })
+      .then((res) => {
+        setTokens(res.data.token, res.data.refresh_token);
+        return res.data.token;
+      })
+      .catch((error) => {
+        // Otra pestaña pudo renovar con el mismo refresh token
+        if (getRefreshToken() !== refreshToken) return getToken();
+        clearSession();
+        throw error;
+      })
+      .finally(() => {
+        renovacionEnCurso = null;
+      });
+  }
+  return renovacionEnCurso;
+};
+
+// Interceptor para renovar el access token expirado y repetir la petición
+api.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const config = error.config;
+    if (
+      error.response?.status === 401 &&
+      error.response.data?.error === "Token expirado" &&
+      getRefreshToken() &&
+      !config._reintentado
+    ) {
+      config._reintentado = true;
+      const token = await refrescarSesion();
+      config.headers.Authorization = `Bearer ${token}`;
+      return api(config);
+    }
+    return Promise.reject(error);
+  }
+);
+
 export default api;
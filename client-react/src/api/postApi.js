@@ -5,8 +5,19 @@ export const getPostulaciones = async () => {
   return res.data;
 };
 
-export const postularVacante = async (idVacante) => {
-  const res = await api.post(`/api/postular/${idVacante}`);
+/**
+ * Postularse a una vacante
+ * @param {string} idVacante
+ * @param {string} clave - Idempotency-Key; reintentar con la misma clave
+ * devuelve la postulación ya creada en lugar de un 409
+ */
+export const postularVacante = async (
+  idVacante,
+  clave = crypto.randomUUID()
+) => {
+  const res = await api.post(`/api/postular/${idVacante}`, null, {
+    headers: { "Idempotency-Key": clave },
+  });
   return res.data;
 };
 
@@ -15,8 +26,21 @@ export const getPostulacionesByFreelancer = async () => {
   return res.data;
 };
 
-export const getPostulacionesByEmpresa = async () => {
-  const res = await api.get("/api/empresa/postulaciones");
+/**
+ * Página de postulaciones a las vacantes de la empresa
+ * @param {Object} params - vacante, estado, desde, hasta, orden, limit, cursor
+ * @returns {Promise<{postulaciones: Array, next_cursor: string|null}>}
+ */
+export const getPostulacionesByEmpresa = async (params = {}) => {
+  const res = await api.get("/api/empresa/postulaciones", { params });
+  return res.data;
+};
+
+/**
+ * Detalle completo de una postulación (incluye la experiencia entera)
+ */
+export const getPostulacionEmpresa = async (idPostulacion) => {
+  const res = await api.get(`/api/empresa/postulaciones/${idPostulacion}`);
   return res.data;
 };
 
@@ -36,6 +60,24 @@ export const updatePostulacionEstado = async (idPostulacion, estado) => {
   }
 };
 
+/**
+ * Actualiza el estado de varias postulaciones en una sola petición
+ * @param {Array<{id_post: string, estado: string}>} postulaciones
+ */
+export const updatePostulacionesEstado = async (postulaciones) => {
+  try {
+    const res = await api.put("/api/postulaciones/estado", { postulaciones });
+    return res.data;
+  } catch (error) {
+    if (error.response && error.response.data) {
+      throw new Error(
+        error.response.data.error || "Error al actualizar los estados"
+      );
+    }
+    throw error;
+  }
+};
+
 export const getCambiosRecientes = async () => {
   try {
     const res = await api.get("/api/postulaciones/cambios-recientes");
@@ -50,6 +92,22 @@ export const getCambiosRecientes = async () => {
   }
 };
 
+export const marcarCambiosVistos = async (hasta) => {
+  try {
+    const res = await api.post("/api/postulaciones/cambios-recientes/vistos", {
+      hasta,
+    });
+    return res.data;
+  } catch (error) {
+    if (error.response && error.response.data) {
+      throw new Error(
+        error.response.data.error || "Error al marcar cambios como vistos"
+      );
+    }
+    throw error;
+  }
+};
+
 export const cancelarPostulacion = async (idPostulacion) => {
   try {
     const res = await api.delete(`/api/postulacion/cancelar/${idPostulacion}`);
@@ -65,28 +123,77 @@ export const cancelarPostulacion = async (idPostulacion) => {
 };
 
 /**
- * Verificar si el freelancer ya se postuló a una vacante
- * @param {string} idVacante - ID de la vacante a verificar
- * @returns {Promise<{postulado: boolean, estado: string}>}
+ * Verificar de una vez si el freelancer se postuló a varias vacantes
+ * @param {string[]} idsVacantes - IDs de las vacantes (máximo 100)
+ * @returns {Promise<Object<string, {postulado: boolean, estado: string}>>}
  */
-export const verificarPostulacion = async (idVacante) => {
+export const verificarPostulaciones = async (idsVacantes) => {
   try {
-    const res = await api.get(`/api/verificar-postulacion/${idVacante}`);
-    return res.data;
+    const res = await api.get("/api/verificar-postulaciones", {
+      params: { vacantes: idsVacantes.join(",") },
+    });
+    return res.data.postulaciones;
   } catch (error) {
     if (error.response && error.response.data) {
       throw new Error(
-        error.response.data.error || "Error al verificar postulación"
+        error.response.data.error || "Error al verificar postulaciones"
       );
     }
     throw error;
   }
 };
 
-export const getNuevasPostulacionesEmpresa = async () => {
+const MAXIMO_VERIFICACION_LOTE = 100;
+let verificacionesPendientes = null;
+
+const enviarVerificaciones = async () => {
+  const pendientes = verificacionesPendientes;
+  verificacionesPendientes = null;
+  const ids = [...pendientes.keys()];
+  for (let i = 0; i < ids.length; i += MAXIMO_VERIFICACION_LOTE) {
+    const lote = ids.slice(i, i + MAXIMO_VERIFICACION_LOTE);
+    try {
+      const resultado = await verificarPostulaciones(lote);
+      lote.forEach((id) =>
+        pendientes
+          .get(id)
+          .forEach(({ resolve }) =>
+            resolve(resultado[id] || { postulado: false, estado: null })
+          )
+      );
+    } catch (error) {
+      lote.forEach((id) =>
+        pendientes.get(id).forEach(({ reject }) => reject(error))
+      );
+    }
+  }
+};
+
+/**
+ * Verificar si el freelancer ya se postuló a una vacante.
+ * Las llamadas hechas en el mismo ciclo (p. ej. todas las tarjetas de una
+ * página al montarse) se agrupan en una sola petición a
+ * /api/verificar-postulaciones.
+ * @param {string} idVacante - ID de la vacante a verificar
+ * @returns {Promise<{postulado: boolean, estado: string}>}
+ */
+export const verificarPostulacion = (idVacante) =>
+  new Promise((resolve, reject) => {
+    if (!verificacionesPendientes) {
+      verificacionesPendientes = new Map();
+      setTimeout(enviarVerificaciones, 0);
+    }
+    if (!verificacionesPendientes.has(idVacante)) {
+      verificacionesPendientes.set(idVacante, []);
+    }
+    verificacionesPendientes.get(idVacante).push({ resolve, reject });
+  });
+
+export const getNuevasPostulacionesEmpresa = async (since = null) => {
   try {
     const res = await api.get(
-      "/api/empresa/notificaciones/nuevas-postulaciones"
+      "/api/empresa/notificaciones/nuevas-postulaciones",
+      { params: since ? { since } : {} }
     );
     return res.data;
   } catch (error) {
@@ -1,11 +1,14 @@
 import api from "./axiosConfig.js";
 
 /**
- * Obtiene todas las vacantes disponibles
- * @returns {Promise<Object>} Lista de vacantes
+ * Obtiene una página de vacantes disponibles (paginación por cursor)
+ * @param {Object} [params] - Parámetros de paginación
+ * @param {number} [params.limit] - Cantidad máxima de vacantes por página
+ * @param {string} [params.cursor] - Cursor devuelto en `next_cursor` por la página anterior
+ * @returns {Promise<{vacantes: Array, next_cursor: string|null, limit: number}>}
  */
-export const getVacantes = async () => {
-  const res = await api.get("/api/vacantes");
+export const getVacantes = async (params = {}) => {
+  const res = await api.get("/api/vacantes", { params });
   return res.data;
 };
 
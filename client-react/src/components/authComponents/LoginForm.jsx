@@ -27,6 +27,7 @@ export default function LoginForm() {
       if (res.usuario) {
         login({
           token: res.token || "token-placeholder",
+          refreshToken: res.refresh_token,
           userRole: res.usuario.rol,
           userName: res.usuario.nombre,
           userId: res.usuario.id,
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { getVacantesByEmpresa } from "../../api/vacancyApi";
 import {
   getPostulacionesByEmpresa,
+  getPostulacionEmpresa,
   updatePostulacionEstado,
 } from "../../api/postApi";
 import { obtenerCalificacionFreelancer } from "../../api/ratingApi";
@@ -20,9 +21,12 @@ import {
 } from "react-icons/md";
 import styles from "../../styles/modules_vacancies/VacanciesWithApplications.module.css";
 
+const POSTULACIONES_POR_PAGINA = 20;
+
 export default function VacanciesWithApplications() {
   const [vacantes, setVacantes] = useState([]);
-  const [postulaciones, setPostulaciones] = useState([]);
+  // Postulaciones cargadas por vacante: { [id]: { items, siguiente, cargando } }
+  const [postulaciones, setPostulaciones] = useState({});
   const [expandedVacancy, setExpandedVacancy] = useState(null);
   const [loading, setLoading] = useState(true);
   const [ratings, setRatings] = useState({});
@@ -35,51 +39,116 @@ export default function VacanciesWithApplications() {
   const loadData = async () => {
     try {
       setLoading(true);
-
-      const [vacantesData, postulacionesData] = await Promise.all([
-        getVacantesByEmpresa(userId),
-        getPostulacionesByEmpresa(),
-      ]);
-
+      const vacantesData = await getVacantesByEmpresa(userId);
       setVacantes(vacantesData || []);
-      setPostulaciones(postulacionesData || []);
-
-      // Cargar calificaciones de cada freelancer
-      if (postulacionesData && postulacionesData.length > 0) {
-        const ratingsMap = {};
-        await Promise.all(
-          postulacionesData.map(async (post) => {
-            if (post.freelancer && post.freelancer.id) {
-              try {
-                const ratingData = await obtenerCalificacionFreelancer(
-                  post.freelancer.id
-                );
-                ratingsMap[post.freelancer.id] = ratingData.promedio || 0;
-              } catch (error) {
-                console.error("Error al cargar rating:", error);
-                ratingsMap[post.freelancer.id] = 0;
-              }
-            }
-          })
-        );
-        setRatings(ratingsMap);
+      setPostulaciones({});
+      if (expandedVacancy) {
+        cargarPostulaciones(expandedVacancy);
       }
     } catch (error) {
       console.error("Error al cargar datos:", error);
       setVacantes([]);
-      setPostulaciones([]);
+      setPostulaciones({});
     } finally {
       setLoading(false);
     }
   };
 
-  // Agrupar postulaciones por vacante
+  // Carga una página de postulaciones de la vacante (la primera sin cursor)
+  const cargarPostulaciones = async (vacanteId, cursor = null) => {
+    setPostulaciones((prev) => ({
+      ...prev,
+      [vacanteId]: { ...(prev[vacanteId] || { items: [] }), cargando: true },
+    }));
+    try {
+      const pagina = await getPostulacionesByEmpresa({
+        vacante: vacanteId,
+        limit: POSTULACIONES_POR_PAGINA,
+        ...(cursor && { cursor }),
+      });
+      const nuevas = pagina.postulaciones || [];
+      setPostulaciones((prev) => ({
+        ...prev,
+        [vacanteId]: {
+          items: cursor ? [...(prev[vacanteId]?.items || []), ...nuevas] : nuevas,
+          siguiente: pagina.next_cursor,
+          cargando: false,
+        },
+      }));
+      cargarRatings(nuevas);
+    } catch (error) {
+      console.error("Error al cargar postulaciones:", error);
+      setPostulaciones((prev) => ({
+        ...prev,
+        [vacanteId]: { ...(prev[vacanteId] || { items: [] }), cargando: false },
+      }));
+    }
+  };
+
+  // Cargar calificaciones de los freelancers que aún no se tienen
+  const cargarRatings = async (nuevas) => {
+    const ids = [
+      ...new Set(nuevas.map((post) => post.freelancer?.id).filter(Boolean)),
+    ].filter((id) => !(id in ratings));
+    if (ids.length === 0) return;
+
+    const ratingsMap = {};
+    await Promise.all(
+      ids.map(async (id) => {
+        try {
+          const ratingData = await obtenerCalificacionFreelancer(id);
+          ratingsMap[id] = ratingData.promedio || 0;
+        } catch (error) {
+          console.error("Error al cargar rating:", error);
+          ratingsMap[id] = 0;
+        }
+      })
+    );
+    setRatings((prev) => ({ ...prev, ...ratingsMap }));
+  };
+
+  // El listado trae la experiencia recortada; el detalle la trae completa
+  const verExperienciaCompleta = async (vacanteId, postulacionId) => {
+    try {
+      const detalle = await getPostulacionEmpresa(postulacionId);
+      setPostulaciones((prev) => ({
+        ...prev,
+        [vacanteId]: {
+          ...prev[vacanteId],
+          items: prev[vacanteId].items.map((p) =>
+            p.id === postulacionId
+              ? {
+                  ...p,
+                  experiencia: detalle.experiencia,
+                  experiencia_recortada: false,
+                }
+              : p
+          ),
+        },
+      }));
+    } catch (error) {
+      console.error("Error al cargar la postulación:", error);
+    }
+  };
+
   const getPostulacionesByVacante = (vacanteId) => {
-    return postulaciones.filter((p) => p.vacante && p.vacante.id === vacanteId);
+    return postulaciones[vacanteId]?.items || [];
+  };
+
+  // Total de postulaciones de la vacante (contadores del servidor)
+  const getTotalPostulaciones = (vacante) => {
+    return (
+      vacante.postulaciones?.total ??
+      getPostulacionesByVacante(vacante.id).length
+    );
   };
 
   const toggleExpand = (vacanteId) => {
-    setExpandedVacancy(expandedVacancy === vacanteId ? null : vacanteId);
+    const expandir = expandedVacancy !== vacanteId;
+    setExpandedVacancy(expandir ? vacanteId : null);
+    if (expandir && !postulaciones[vacanteId]) {
+      cargarPostulaciones(vacanteId);
+    }
   };
 
   const handleUpdateEstado = async (postulacionId, nuevoEstado) => {
@@ -126,7 +195,9 @@ export default function VacanciesWithApplications() {
             <MdDescription /> {vacantes.length} Vacantes
           </span>
           <span className={styles.statItem}>
-            <MdPeople /> {postulaciones.length} Postulaciones
+            <MdPeople />{" "}
+            {vacantes.reduce((total, v) => total + getTotalPostulaciones(v), 0)}{" "}
+            Postulaciones
           </span>
         </div>
       </div>
@@ -143,6 +214,8 @@ export default function VacanciesWithApplications() {
         <div className={styles.vacanciesList}>
           {vacantes.map((vacante) => {
             const vacancyApplications = getPostulacionesByVacante(vacante.id);
+            const totalApplications = getTotalPostulaciones(vacante);
+            const estadoCarga = postulaciones[vacante.id];
             const isExpanded = expandedVacancy === vacante.id;
 
             return (
@@ -161,7 +234,7 @@ export default function VacanciesWithApplications() {
                         {vacante.estado === "abierta" ? "Activa" : "Cerrada"}
                       </span>
                       <span className={styles.applicationsCount}>
-                        <MdPeople /> {vacancyApplications.length} postulaciones
+                        <MdPeople /> {totalApplications} postulaciones
                       </span>
                     </div>
                   </div>
@@ -197,10 +270,15 @@ export default function VacanciesWithApplications() {
 
                     <div className={styles.applicationsList}>
                       <h4 className={styles.applicationsTitle}>
-                        Postulaciones ({vacancyApplications.length})
+                        Postulaciones ({totalApplications})
                       </h4>
 
-                      {vacancyApplications.length === 0 ? (
+                      {vacancyApplications.length === 0 &&
+                      estadoCarga?.cargando ? (
+                        <div className={styles.noApplications}>
+                          <p>Cargando postulaciones...</p>
+                        </div>
+                      ) : vacancyApplications.length === 0 ? (
                         <div className={styles.noApplications}>
                           <p>Aún no hay postulaciones para esta vacante</p>
                         </div>
@@ -271,9 +349,23 @@ export default function VacanciesWithApplications() {
 
                               {postulacion.experiencia && (
                                 <p className={styles.experience}>
-                                  {postulacion.experiencia.substring(0, 100)}
-                                  {postulacion.experiencia.length > 100 &&
-                                    "..."}
+                                  {postulacion.experiencia}
+                                  {postulacion.experiencia_recortada && (
+                                    <>
+                                      ...{" "}
+                                      <button
+                                        className={styles.moreLink}
+                                        onClick={() =>
+                                          verExperienciaCompleta(
+                                            vacante.id,
+                                            postulacion.id
+                                          )
+                                        }
+                                      >
+                                        Ver más
+                                      </button>
+                                    </>
+                                  )}
                                 </p>
                               )}
 
@@ -354,6 +446,23 @@ export default function VacanciesWithApplications() {
                           ))}
                         </div>
                       )}
+
+                      {estadoCarga?.siguiente && (
+                        <button
+                          className={styles.loadMoreButton}
+                          disabled={estadoCarga.cargando}
+                          onClick={() =>
+                            cargarPostulaciones(
+                              vacante.id,
+                              estadoCarga.siguiente
+                            )
+                          }
+                        >
+                          {estadoCarga.cargando
+                            ? "Cargando..."
+                            : "Cargar más postulaciones"}
+                        </button>
+                      )}
                     </div>
                   </div>
                 )}
@@ -13,6 +13,8 @@ export default function VacanciesView() {
   const [searchTerm, setSearchTerm] = useState("");
   const [durationFilter, setDurationFilter] = useState("");
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedVacancy, setSelectedVacancy] = useState(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [yaPostulado, setYaPostulado] = useState(false);
@@ -29,18 +31,34 @@ export default function VacanciesView() {
 
   const loadVacancies = async () => {
     try {
-      const vacantesData = await getVacantes();
-      setVacancies(vacantesData || []);
-      setFilteredVacancies(vacantesData || []);
+      const pagina = await getVacantes();
+      setVacancies(pagina?.vacantes || []);
+      setFilteredVacancies(pagina?.vacantes || []);
+      setNextCursor(pagina?.next_cursor || null);
     } catch (error) {
       console.error("Error al cargar vacantes:", error);
       setVacancies([]);
       setFilteredVacancies([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMoreVacancies = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const pagina = await getVacantes({ cursor: nextCursor });
+      setVacancies((prev) => [...prev, ...(pagina?.vacantes || [])]);
+      setNextCursor(pagina?.next_cursor || null);
+    } catch (error) {
+      console.error("Error al cargar más vacantes:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filterVacancies = () => {
     let filtered = vacancies;
 
@@ -209,6 +227,17 @@ export default function VacanciesView() {
         )}
       </div>
 
+      {/* Cargar la siguiente página del feed */}
+      {nextCursor && (
+        <button
+          className={styles.clearButton}
+          onClick={loadMoreVacancies}
+          disabled={loadingMore}
+        >
+          {loadingMore ? "Cargando..." : "Cargar más vacantes"}
+        </button>
+      )}
+
       {/* Modal de detalles */}
       <VacancyDetailModal
         vacante={selectedVacancy}
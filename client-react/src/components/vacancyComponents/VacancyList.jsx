@@ -10,7 +10,7 @@ export default function VacancyList() {
 
   useEffect(() => {
     getVacantes()
-      .then(setVacantes)
+      .then((pagina) => setVacantes(pagina?.vacantes || []))
       .catch(console.error)
       .finally(() => setLoading(false));
   }, []);
@@ -14,6 +14,7 @@ import React, {
 import { useNavigate } from "react-router-dom";
 import {
   getToken,
+  getRefreshToken,
   getUserRole,
   getUserId,
   getUserName,
@@ -21,6 +22,7 @@ import {
   clearSession,
   hasActiveSession,
 } from "../utils/sessionManager";
+import { logoutUser } from "../api/authApi";
 
 // Crear el contexto de autenticación
 const AuthContext = createContext(null);
@@ -83,6 +85,9 @@ export const AuthProvider = ({ children }) => {
    */
   const logout = useCallback(
     (redirect = true) => {
+      const refreshToken = getRefreshToken();
+      // Sin esperar: la sesión local se cierra aunque falle la red
+      if (refreshToken) logoutUser(refreshToken).catch(() => {});
       clearSession();
       setIsAuthenticated(false);
       setUserRole(null);
@@ -0,0 +1,99 @@
+/**
+ * useEventos.js
+ * Hook para recibir notificaciones en tiempo real desde el servidor
+ * mediante Server-Sent Events (GET /api/eventos)
+ */
+
+import { useEffect, useRef } from "react";
+import { getToken, getRefreshToken } from "../utils/sessionManager";
+import { refrescarSesion } from "../api/axiosConfig";
+
+const EVENTOS_URL = "http://localhost:5000/api/eventos";
+
+// Consulta periódica de respaldo: el canal SSE es por proceso del servidor,
+// así que los eventos publicados en otro worker no llegan por la conexión
+const INTERVALO_SINCRONIZACION_MS = 30000;
+
+/**
+ * Mantiene abierta una conexión SSE mientras `activo` sea verdadero.
+ * EventSource reconecta solo; `sincronizar` se llama en cada (re)conexión y
+ * cada 30 s para traer con los cursores de los endpoints de notificaciones
+ * lo que no llegó por el canal. Los eventos solo adelantan la vista: los
+ * cursores los avanza únicamente `sincronizar`.
+ * Si el servidor rechaza el token (expirado) la conexión se cierra; entonces
+ * se renueva la sesión y se vuelve a abrir con el token nuevo.
+ * @param {boolean} activo - Si la conexión debe estar abierta
+ * @param {Object} manejadores - Mapa nombre de evento -> función(datos)
+ * @param {Function} sincronizar - Consulta lo nuevo con el cursor "since"
+ */
+export const useEventos = (activo, manejadores, sincronizar) => {
+  // Referencias para no reabrir la conexión cuando cambian las funciones
+  const manejadoresRef = useRef(manejadores);
+  const sincronizarRef = useRef(sincronizar);
+  manejadoresRef.current = manejadores;
+  sincronizarRef.current = sincronizar;
+
+  useEffect(() => {
+    if (!activo || !getToken()) return;
+
+    let fuente = null;
+    let cerrado = false;
+    let sincronizando = false;
+
+    // Nunca dos consultas a la vez: ambas partirían del mismo cursor
+    const ejecutarSincronizacion = async () => {
+      if (sincronizando || !sincronizarRef.current) return;
+      sincronizando = true;
+      try {
+        await sincronizarRef.current();
+      } finally {
+        sincronizando = false;
+      }
+    };
+
+    const abrir = (token) => {
+      // EventSource no permite encabezados: el token viaja en la URL
+      fuente = new EventSource(
+        `${EVENTOS_URL}?token=${encodeURIComponent(token)}`
+      );
+
+      fuente.onopen = ejecutarSincronizacion;
+
+      fuente.onerror = () => {
+        // CLOSED: el servidor respondió con error (token vencido)
+        if (fuente.readyState !== EventSource.CLOSED || !getRefreshToken()) {
+          return;
+        }
+        refrescarSesion()
+          .then((nuevo) => {
+            if (!cerrado) abrir(nuevo);
+          })
+          .catch((error) =>
+            console.error("No se pudo renovar la sesión:", error)
+          );
+      };
+
+      Object.keys(manejadoresRef.current).forEach((evento) => {
+        fuente.addEventListener(evento, (e) => {
+          try {
+            manejadoresRef.current[evento]?.(JSON.parse(e.data));
+          } catch (error) {
+            console.error("Error al procesar evento:", error);
+          }
+        });
+      });
+    };
+
+    abrir(getToken());
+    const intervalo = setInterval(
+      ejecutarSincronizacion,
+      INTERVALO_SINCRONIZACION_MS
+    );
+
+    return () => {
+      cerrado = true;
+      clearInterval(intervalo);
+      fuente.close();
+    };
+  }, [activo]);
+};
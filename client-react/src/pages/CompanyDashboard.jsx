@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
 import { getCities } from "../api/cityApi";
@@ -6,6 +6,7 @@ import { eliminarVacante } from "../api/vacancyApi";
 import { getCompanyProfile, updateCompanyProfile } from "../api/companyApi";
 import { deleteAccount } from "../api/authApi";
 import { getNuevasPostulacionesEmpresa } from "../api/postApi";
+import { useEventos } from "../hooks/useEventos";
 import { useCompanyProfile } from "../hooks/useCompanyProfile";
 import CompanyProfileForm from "../components/profileComponents/CompanyProfileForm";
 import EditCompanyProfile from "../components/profileComponents/EditCompanyProfile";
@@ -36,6 +37,8 @@ const CompanyDashboard = () => {
     useState([]);
   const [notificacionesNoVistas, setNotificacionesNoVistas] = useState([]);
   const [showNotificationModal, setShowNotificationModal] = useState(false);
+  // Cursor de la última notificación recibida (para consultar solo las nuevas)
+  const notificacionesSince = useRef(null);
   const navigate = useNavigate();
 
   const { isAuthenticated, userRole, userId, userName, logout } = useAuth();
@@ -70,6 +73,7 @@ const CompanyDashboard = () => {
           // Verificar nuevas postulaciones
           try {
             const notificaciones = await getNuevasPostulacionesEmpresa();
+            notificacionesSince.current = notificaciones.since || null;
             if (
               notificaciones.success &&
               notificaciones.notificaciones &&
@@ -102,6 +106,60 @@ const CompanyDashboard = () => {
     initializeDashboard();
   }, [navigate, isAuthenticated, userRole, userId, profileComplete]);
 
+  // Agrega al inicio las notificaciones nuevas (sin duplicar las ya recibidas)
+  const agregarNotificaciones = (nuevas) => {
+    if (!nuevas.length) return;
+
+    const notificacionesVistas = JSON.parse(
+      localStorage.getItem("notificacionesEmpresaVistas") || "[]"
+    );
+    const noVistas = nuevas.filter(
+      (notif) => !notificacionesVistas.includes(notif.id)
+    );
+    const ids = new Set(nuevas.map((notif) => notif.id));
+
+    setNotificacionesPostulaciones((prev) => [
+      ...nuevas,
+      ...prev.filter((notif) => !ids.has(notif.id)),
+    ]);
+    setNotificacionesNoVistas((prev) => [
+      ...noVistas,
+      ...prev.filter((notif) => !ids.has(notif.id)),
+    ]);
+  };
+
+  // Trae lo llegado después del cursor; solo aquí avanza notificacionesSince.
+  // Llegan de la más antigua a la más reciente; se pide hasta vaciar
+  const sincronizarNotificaciones = async () => {
+    try {
+      let nuevas;
+      do {
+        const since = notificacionesSince.current;
+        nuevas = await getNuevasPostulacionesEmpresa(since);
+        if (!nuevas.success || !nuevas.notificaciones) break;
+        agregarNotificaciones(
+          since ? [...nuevas.notificaciones].reverse() : nuevas.notificaciones
+        );
+        notificacionesSince.current = nuevas.since || since;
+        // Si el cursor no avanzó, lo pendiente se recoge en la siguiente ronda
+      } while (nuevas.has_more && notificacionesSince.current !== since);
+    } catch (error) {
+      console.error("Error al verificar notificaciones:", error);
+    }
+  };
+
+  // Notificaciones en tiempo real. Un evento solo llega si se publicó en el
+  // mismo proceso del servidor, así que no avanza el cursor: la consulta
+  // periódica y la de cada reconexión recogen lo publicado en otros workers
+  useEventos(
+    isAuthenticated && userRole === "Empresa" && profileComplete,
+    {
+      nueva_postulacion: (notificacion) =>
+        agregarNotificaciones([notificacion]),
+    },
+    sincronizarNotificaciones
+  );
+
   const handleEditVacante = (vacante) => {
     setVacanteToEdit(vacante);
     setActiveView("publicar");
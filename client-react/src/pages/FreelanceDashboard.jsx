@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
 import { getCities } from "../api/cityApi";
@@ -7,9 +7,10 @@ import {
   updateFreelancerProfile,
 } from "../api/freelancerApi";
 import { deleteAccount } from "../api/authApi";
-import { getCambiosRecientes } from "../api/postApi";
+import { getCambiosRecientes, marcarCambiosVistos } from "../api/postApi";
 import { obtenerCalificacionFreelancer } from "../api/ratingApi";
 import { useFreelancerProfile } from "../hooks/useFreelancerProfile";
+import { useEventos } from "../hooks/useEventos";
 import FreelancerProfileForm from "../components/profileComponents/FreelancerProfileForm";
 import EditFreelancerProfile from "../components/profileComponents/EditFreelancerProfile";
 import FreelancerSidebar from "../components/dashboardComponents/FreelancerSidebar";
@@ -33,6 +34,10 @@ const FreelanceDashboard = () => {
   const [showDeleteModal, setShowDeleteModal] = useState(false);
   const [cambiosPostulaciones, setCambiosPostulaciones] = useState([]);
   const [cambiosNoVistos, setCambiosNoVistos] = useState([]);
+  // Cursor del último cambio cargado del servidor, para marcarlo como visto
+  const [cambiosHasta, setCambiosHasta] = useState(null);
+  // Quedan cambios no vistos sin cargar (se piden tras marcar estos)
+  const hayMasCambios = useRef(false);
   const [showNotificationModal, setShowNotificationModal] = useState(false);
   const [rating, setRating] = useState(0);
   const [totalRatings, setTotalRatings] = useState(0);
@@ -89,6 +94,8 @@ const FreelanceDashboard = () => {
             ) {
               // Guardar TODAS las notificaciones
               setCambiosPostulaciones(cambios.cambios);
+              setCambiosHasta(cambios.hasta);
+              hayMasCambios.current = !!cambios.has_more;
 
               // Obtener las notificaciones ya vistas de localStorage
               const notificacionesVistas = JSON.parse(
@@ -120,6 +127,45 @@ const FreelanceDashboard = () => {
     initializeDashboard();
   }, [navigate, isAuthenticated, userRole, userId, profileComplete]);
 
+  // Recarga los cambios no vistos (los más antiguos si hay más del límite)
+  const cargarCambios = async () => {
+    try {
+      const cambios = await getCambiosRecientes();
+      if (cambios.success && cambios.cambios?.length) {
+        const notificacionesVistas = JSON.parse(
+          localStorage.getItem("notificacionesVistas") || "[]"
+        );
+        setCambiosPostulaciones(cambios.cambios);
+        setCambiosNoVistos(
+          cambios.cambios.filter(
+            (cambio) => !notificacionesVistas.includes(cambio.id)
+          )
+        );
+        setCambiosHasta(cambios.hasta);
+        hayMasCambios.current = !!cambios.has_more;
+      }
+    } catch (error) {
+      console.error("Error al verificar cambios:", error);
+    }
+  };
+
+  // Cambios de estado en tiempo real. Un evento solo llega si se publicó en
+  // el mismo proceso del servidor, así que no avanza "hasta" (marcaría como
+  // vistos cambios de otros workers): la recarga periódica y la de cada
+  // reconexión traen la lista completa con su cursor
+  useEventos(
+    isAuthenticated && userRole === "FreeLancer" && profileComplete,
+    {
+      cambio_postulacion: (cambio) => {
+        const sinRepetir = (prev) =>
+          prev.filter((c) => c.id_cambio !== cambio.id_cambio);
+        setCambiosPostulaciones((prev) => [cambio, ...sinRepetir(prev)]);
+        setCambiosNoVistos((prev) => [cambio, ...sinRepetir(prev)]);
+      },
+    },
+    cargarCambios
+  );
+
   const handleSaveProfile = async (formDataToSend) => {
     try {
       const freelancerId = localStorage.getItem("freelancerId");
@@ -166,6 +212,16 @@ const FreelanceDashboard = () => {
       JSON.stringify(nuevasNotificacionesVistas)
     );
 
+    // Registrar en el servidor hasta dónde se leyó
+    if (cambiosHasta) {
+      marcarCambiosVistos(cambiosHasta)
+        // Siguiente tanda de cambios que no cupo en la primera carga
+        .then(() => hayMasCambios.current && cargarCambios())
+        .catch((error) =>
+          console.error("Error al marcar cambios como vistos:", error)
+        );
+    }
+
     setShowNotificationModal(false);
     // Limpiar solo las no vistas, pero mantener todas las notificaciones
     setCambiosNoVistos([]);
@@ -6,6 +6,7 @@
 // Claves de localStorage
 const KEYS = {
   TOKEN: "token",
+  REFRESH_TOKEN: "refreshToken",
   USER_ROLE: "userRole",
   USER_ID: "userId",
   USER_NAME: "userName",
@@ -20,6 +21,24 @@ export const getToken = () => {
   return localStorage.getItem(KEYS.TOKEN);
 };
 
+/**
+ * Obtiene el refresh token (canjeable en /api/auth/refresh)
+ * @returns {string|null} Refresh token o null si no existe
+ */
+export const getRefreshToken = () => {
+  return localStorage.getItem(KEYS.REFRESH_TOKEN);
+};
+
+/**
+ * Reemplaza el access token y el refresh token tras una renovación
+ * @param {string} token - Access token nuevo
+ * @param {string} refreshToken - Refresh token nuevo
+ */
+export const setTokens = (token, refreshToken) => {
+  localStorage.setItem(KEYS.TOKEN, token);
+  localStorage.setItem(KEYS.REFRESH_TOKEN, refreshToken);
+};
+
 /**
  * Obtiene el rol del usuario
  * @returns {string|null} Rol del usuario o null
@@ -64,12 +83,20 @@ export const setLastActivity = () => {
  * Guarda los datos de sesión del usuario
  * @param {Object} sessionData - Datos de sesión
  * @param {string} sessionData.token - Token JWT
+ * @param {string} sessionData.refreshToken - Refresh token de la sesión
  * @param {string} sessionData.userRole - Rol del usuario
  * @param {string} sessionData.userId - ID del usuario
  * @param {string} sessionData.userName - Nombre del usuario
  */
-export const setSessionData = ({ token, userRole, userId, userName }) => {
+export const setSessionData = ({
+  token,
+  refreshToken,
+  userRole,
+  userId,
+  userName,
+}) => {
   localStorage.setItem(KEYS.TOKEN, token);
+  if (refreshToken) localStorage.setItem(KEYS.REFRESH_TOKEN, refreshToken);
   localStorage.setItem(KEYS.USER_ROLE, userRole);
   localStorage.setItem(KEYS.USER_ID, userId);
   localStorage.setItem(KEYS.USER_NAME, userName);
@@ -81,6 +108,7 @@ export const setSessionData = ({ token, userRole, userId, userName }) => {
  */
 export const clearSession = () => {
   localStorage.removeItem(KEYS.TOKEN);
+  localStorage.removeItem(KEYS.REFRESH_TOKEN);
   localStorage.removeItem(KEYS.USER_ROLE);
   localStorage.removeItem(KEYS.USER_ID);
   localStorage.removeItem(KEYS.USER_NAME);
@@ -27,6 +27,7 @@ from routes.routes_auth.login import login_bp
 from routes.routes_auth.registro import registro_bp
 from routes.routes_auth.password_reset import password_reset_bp
 from routes.routes_auth.eliminar_cuenta import eliminar_cuenta_bp
+from routes.routes_auth.sesion import sesion_bp
 from routes.routes_perfil.ver_perfil import perfil_bp
 from routes.routes_perfil.perfil_freelancer import perfil_freelancer_bp
 from routes.routes_post.postulacion import postulacion_bp
@@ -40,24 +41,23 @@ from routes.routes_post.verificar_postulacion import verificar_postulacion_bp
 from routes.routes_vacancy.crear_vacante import crear_vacante_bp
 from routes.routes_vacancy.vacantes import vacantes_bp
 from routes.routes_vacancy.ver_vacante import ver_vacante_bp
+from routes.routes_vacancy.buscar_vacante import buscar_vacante_bp
+from routes.routes_vacancy.recomendar_vacante import recomendar_vacante_bp
 from routes.ciudades import ciudades_bp
 from routes.routes_empresa.perfil_empresa import perfil_empresa_bp
 from routes.archivos import archivos_bp
+from routes.eventos import eventos_bp
 from routes.routes_payment.payment import payment_bp
 from routes.routes_rating.calificacion import calificacion_bp
 
-# Hacer mail disponible para los blueprints
-password_reset_bp.mail = mail
-actualizar_estado_bp.mail = mail
-
 CORS(
     app,
     resources={
         r"/api/*": {
             "origins": ["http://localhost:5173", "http://localhost:5200"],
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
-            "expose_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "Idempotency-Key"],
+            "expose_headers": ["Content-Type", "Authorization", "Retry-After"],
             "supports_credentials": True,
             "allow_credentials": True,
         }
@@ -74,6 +74,13 @@ from models import (
     Postulacion,
     PasswordResetToken,
     Calificacion,
+    TarjetaVacante,
+    HistorialPostulacion,
+    MarcaLectura,
+    CorreoSaliente,
+    NotificacionPendiente,
+    Sesion,
+    TokenRefresco,
 )
 from models.modelo_token import TokenBalance, Transaccion
 
@@ -100,6 +107,7 @@ with app.app_context():
     app.register_blueprint(registro_bp)
     app.register_blueprint(password_reset_bp)
     app.register_blueprint(eliminar_cuenta_bp)
+    app.register_blueprint(sesion_bp)
 
     # Perfil
     app.register_blueprint(perfil_bp)
@@ -122,6 +130,8 @@ with app.app_context():
     app.register_blueprint(crear_vacante_bp)
     app.register_blueprint(vacantes_bp)
     app.register_blueprint(ver_vacante_bp)
+    app.register_blueprint(buscar_vacante_bp)
+    app.register_blueprint(recomendar_vacante_bp)
 
     # Empresa
     app.register_blueprint(perfil_empresa_bp)
@@ -135,6 +145,22 @@ with app.app_context():
     # Archivos estáticos
     app.register_blueprint(archivos_bp)
 
+    # Notificaciones en tiempo real (SSE)
+    app.register_blueprint(eventos_bp)
+
+    # Comandos de mantenimiento (flask <comando>)
+    from utils.comandos import registrar_comandos
+
+    registrar_comandos(app)
+
+    # Índices en memoria (búsqueda y recomendaciones): se construyen en
+    # segundo plano al arrancar
+    from utils.busqueda import indice_vacantes
+    from utils.recomendaciones import recomendador_vacantes
+
+    indice_vacantes.iniciar(app)
+    recomendador_vacantes.iniciar(app)
+
 
 ########## MANEJO DE ERRORES #############
 
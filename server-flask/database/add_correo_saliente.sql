@@ -0,0 +1,23 @@
+-- ============================================
+-- Bandeja de salida de correos (outbox)
+-- ============================================
+-- Las rutas insertan el correo en la misma transacción que el cambio que lo
+-- origina y el comando `flask enviar-correos` lo entrega en segundo plano,
+-- con reintentos y el resultado de cada envío.
+
+USE freebridge;
+
+CREATE TABLE IF NOT EXISTS CORREO_SALIENTE (
+    id_correo VARCHAR(36) PRIMARY KEY,
+    destinatario VARCHAR(150) NOT NULL,
+    remitente VARCHAR(150),
+    asunto VARCHAR(255) NOT NULL,
+    html TEXT NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'pendiente',
+    intentos INT NOT NULL DEFAULT 0,
+    proximo_intento DATETIME NOT NULL,
+    ultimo_error TEXT,
+    fecha_creacion DATETIME,
+    fecha_envio DATETIME,
+    INDEX idx_correo_estado_intento (estado, proximo_intento)
+);
@@ -0,0 +1,39 @@
+-- ============================================
+-- Historial de cambios de estado de postulaciones y marcas de lectura
+-- ============================================
+-- actualizar_estado_postulacion agrega una fila por cada cambio y
+-- GET /api/postulaciones/cambios-recientes devuelve solo las posteriores a
+-- la marca de lectura del usuario, con un recorrido por rango del índice.
+
+USE freebridge;
+
+CREATE TABLE IF NOT EXISTS HISTORIAL_POSTULACION (
+    id_hist VARCHAR(36) PRIMARY KEY,
+    id_post VARCHAR(36) NOT NULL,
+    id_free VARCHAR(36) NOT NULL,
+    id_vac VARCHAR(36) NOT NULL,
+    estado_anterior VARCHAR(20),
+    estado_nuevo VARCHAR(20) NOT NULL,
+    fecha_cambio DATETIME NOT NULL,
+    INDEX idx_historial_free_fecha (id_free, fecha_cambio, id_hist),
+    INDEX idx_historial_vacante (id_vac)
+);
+
+CREATE TABLE IF NOT EXISTS MARCA_LECTURA (
+    id_usu VARCHAR(36) NOT NULL,
+    canal VARCHAR(40) NOT NULL,
+    fecha_visto DATETIME NOT NULL,
+    id_visto VARCHAR(36) NOT NULL,
+    fecha_actualizacion DATETIME,
+    PRIMARY KEY (id_usu, canal),
+    FOREIGN KEY (id_usu) REFERENCES USUARIO(id_usu)
+);
+
+-- Las postulaciones ya resueltas no tienen fecha de cambio; se registran
+-- con su fecha de postulación para que sigan apareciendo una vez
+INSERT INTO HISTORIAL_POSTULACION
+    (id_hist, id_post, id_free, id_vac, estado_anterior, estado_nuevo, fecha_cambio)
+SELECT UUID(), id_post, id_free, id_vac, 'pendiente', estado_post,
+       COALESCE(fecha_post, NOW())
+FROM POSTULACION
+WHERE estado_post IN ('aceptada', 'rechazada');
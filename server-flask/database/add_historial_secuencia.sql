@@ -0,0 +1,55 @@
+-- ============================================
+-- Secuencia de cambios de estado por freelancer
+-- ============================================
+-- La marca de lectura (fecha_visto, id_visto) daba por vistos cambios
+-- escritos en el mismo segundo con un id_hist menor. Cada cambio toma ahora
+-- el siguiente número de FREELANCER.secuencia_cambios con la fila bloqueada
+-- hasta el commit (utils/historial.asignar_secuencias), y tanto
+-- cambios-recientes como la marca usan ese número.
+
+USE freebridge;
+
+ALTER TABLE FREELANCER
+    ADD COLUMN secuencia_cambios BIGINT NOT NULL DEFAULT 0;
+
+ALTER TABLE HISTORIAL_POSTULACION
+    ADD COLUMN secuencia BIGINT NULL;
+
+-- Numerar los cambios existentes por freelancer en el orden anterior
+UPDATE HISTORIAL_POSTULACION h
+JOIN (
+    SELECT id_hist,
+           ROW_NUMBER() OVER (
+               PARTITION BY id_free ORDER BY fecha_cambio, id_hist
+           ) AS n
+    FROM HISTORIAL_POSTULACION
+) o ON o.id_hist = h.id_hist
+SET h.secuencia = o.n;
+
+UPDATE FREELANCER f
+JOIN (
+    SELECT id_free, MAX(secuencia) AS ultima
+    FROM HISTORIAL_POSTULACION
+    GROUP BY id_free
+) s ON s.id_free = f.id_free
+SET f.secuencia_cambios = s.ultima;
+
+ALTER TABLE HISTORIAL_POSTULACION
+    MODIFY secuencia BIGINT NOT NULL;
+
+DROP INDEX idx_historial_free_fecha ON HISTORIAL_POSTULACION;
+CREATE INDEX idx_historial_free_secuencia
+    ON HISTORIAL_POSTULACION(id_free, secuencia);
+
+-- La marca pasa a ser la secuencia del último cambio visto
+ALTER TABLE MARCA_LECTURA
+    ADD COLUMN secuencia_vista BIGINT NOT NULL DEFAULT 0;
+
+UPDATE MARCA_LECTURA m
+JOIN HISTORIAL_POSTULACION h ON h.id_hist = m.id_visto
+SET m.secuencia_vista = h.secuencia
+WHERE m.canal = 'cambios_postulaciones';
+
+ALTER TABLE MARCA_LECTURA
+    DROP COLUMN fecha_visto,
+    DROP COLUMN id_visto;
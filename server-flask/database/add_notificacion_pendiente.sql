@@ -0,0 +1,19 @@
+-- ============================================
+-- Resumen (digest) de notificaciones por correo
+-- ============================================
+-- Con CORREOS_DIGEST activo, cada cambio de estado de una postulación se
+-- guarda aquí y `flask enviar-correos` envía un solo correo por
+-- destinatario con todos sus cambios cuando el más antiguo cumple
+-- CORREOS_DIGEST_VENTANA_SEGUNDOS.
+
+USE freebridge;
+
+CREATE TABLE IF NOT EXISTS NOTIFICACION_PENDIENTE (
+    id_notif VARCHAR(36) PRIMARY KEY,
+    id_usu VARCHAR(36) NOT NULL,
+    id_post VARCHAR(36) NOT NULL,
+    datos TEXT NOT NULL,
+    fecha_creacion DATETIME NOT NULL,
+    INDEX idx_notificacion_usu_fecha (id_usu, fecha_creacion),
+    FOREIGN KEY (id_usu) REFERENCES USUARIO(id_usu)
+);
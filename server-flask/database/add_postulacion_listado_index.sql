@@ -0,0 +1,9 @@
+-- ============================================
+-- Índice para el listado paginado de postulantes de la empresa
+-- ============================================
+-- GET /api/empresa/postulaciones?vacante=<id> recorre las postulaciones de
+-- una vacante por (fecha_post, id_post) con paginación por cursor.
+
+USE freebridge;
+
+CREATE INDEX idx_postulacion_vac_fecha ON POSTULACION (id_vac, fecha_post, id_post);
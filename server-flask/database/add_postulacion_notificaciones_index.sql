@@ -0,0 +1,12 @@
+-- ============================================
+-- Índice para el feed de notificaciones de empresas
+-- ============================================
+-- GET /api/empresa/notificaciones/nuevas-postulaciones busca postulaciones
+-- pendientes de las vacantes de la empresa posteriores a un cursor
+-- (fecha_post, id_post). Con este índice, una consulta sin novedades es
+-- un solo recorrido de índice por vacante.
+
+USE freebridge;
+
+CREATE INDEX idx_postulacion_vac_estado_fecha
+    ON POSTULACION(id_vac, estado_post, fecha_post);
@@ -0,0 +1,46 @@
+-- ============================================
+-- Secuencia de postulaciones por empresa
+-- ============================================
+-- El cursor (fecha_post, id_post) de las notificaciones de la empresa se
+-- saltaba postulaciones: fecha_post tiene precisión de segundos e id_post
+-- es aleatorio, y una transacción que confirma tarde puede quedar detrás
+-- de un cursor ya entregado. POST /api/postular/<id_vac> toma ahora el
+-- siguiente número de EMPRESA.secuencia_postulaciones con la fila bloqueada
+-- hasta el commit, así que las secuencias de una empresa se confirman en
+-- orden y el cursor es ese número.
+
+USE freebridge;
+
+ALTER TABLE EMPRESA
+    ADD COLUMN secuencia_postulaciones BIGINT NOT NULL DEFAULT 0;
+
+ALTER TABLE POSTULACION
+    ADD COLUMN secuencia BIGINT NULL;
+
+-- Numerar las postulaciones existentes por empresa en orden de llegada
+UPDATE POSTULACION p
+JOIN (
+    SELECT p2.id_post,
+           ROW_NUMBER() OVER (
+               PARTITION BY v.id_emp ORDER BY p2.fecha_post, p2.id_post
+           ) AS n
+    FROM POSTULACION p2
+    JOIN VACANTE v ON v.id_vac = p2.id_vac
+) o ON o.id_post = p.id_post
+SET p.secuencia = o.n;
+
+UPDATE EMPRESA e
+JOIN (
+    SELECT v.id_emp, MAX(p.secuencia) AS ultima
+    FROM POSTULACION p
+    JOIN VACANTE v ON v.id_vac = p.id_vac
+    GROUP BY v.id_emp
+) s ON s.id_emp = e.id_emp
+SET e.secuencia_postulaciones = s.ultima;
+
+ALTER TABLE POSTULACION
+    MODIFY secuencia BIGINT NOT NULL;
+
+DROP INDEX idx_postulacion_vac_estado_fecha ON POSTULACION;
+CREATE INDEX idx_postulacion_vac_estado_secuencia
+    ON POSTULACION(id_vac, estado_post, secuencia);
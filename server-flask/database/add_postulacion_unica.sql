@@ -0,0 +1,23 @@
+-- ============================================
+-- Postulación única por freelancer y vacante
+-- ============================================
+-- POST /api/postular/<id_vac> inserta con una sola sentencia condicional y
+-- reconoce el duplicado por esta restricción, en lugar de consultar antes.
+-- clave_idempotencia guarda el encabezado Idempotency-Key de la petición.
+
+USE freebridge;
+
+-- Conservar solo la postulación más antigua de cada par duplicado
+DELETE p FROM POSTULACION p
+JOIN POSTULACION q
+  ON q.id_free = p.id_free
+ AND q.id_vac = p.id_vac
+ AND (q.fecha_post < p.fecha_post
+      OR (q.fecha_post = p.fecha_post AND q.id_post < p.id_post));
+
+ALTER TABLE POSTULACION
+    ADD COLUMN clave_idempotencia VARCHAR(64) NULL,
+    ADD CONSTRAINT uq_postulacion_free_vac UNIQUE (id_free, id_vac);
+
+-- Si se borraron duplicados, recalcular con: flask recalcular-contadores
+-- y flask reconstruir-tarjetas
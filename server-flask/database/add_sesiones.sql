@@ -0,0 +1,32 @@
+-- ============================================
+-- Sesiones y refresh tokens
+-- ============================================
+-- login crea una SESION; los access tokens (cortos) llevan su id y los
+-- refresh tokens rotan dentro de ella. De cada refresh token solo se guarda
+-- el SHA-256 del secreto. Cada proceso mantiene un filtro de Bloom con las
+-- sesiones revocadas, sincronizado por idx_sesion_revocada.
+
+USE freebridge;
+
+CREATE TABLE IF NOT EXISTS SESION (
+    id_sesion VARCHAR(36) PRIMARY KEY,
+    id_usu VARCHAR(36) NOT NULL,
+    version_token INT NOT NULL DEFAULT 0,
+    fecha_creacion DATETIME NOT NULL,
+    revocada_en DATETIME NULL,
+    motivo_revocacion VARCHAR(40) NULL,
+    FOREIGN KEY (id_usu) REFERENCES USUARIO(id_usu),
+    INDEX idx_sesion_revocada (revocada_en),
+    INDEX idx_sesion_usu (id_usu)
+);
+
+CREATE TABLE IF NOT EXISTS TOKEN_REFRESCO (
+    id_token VARCHAR(36) PRIMARY KEY,
+    id_sesion VARCHAR(36) NOT NULL,
+    hash_secreto VARCHAR(64) NOT NULL,
+    fecha_creacion DATETIME NOT NULL,
+    expira DATETIME NOT NULL,
+    usado_en DATETIME NULL,
+    FOREIGN KEY (id_sesion) REFERENCES SESION(id_sesion),
+    INDEX ix_TOKEN_REFRESCO_id_sesion (id_sesion)
+);
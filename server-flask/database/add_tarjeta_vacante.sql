@@ -0,0 +1,38 @@
+-- ============================================
+-- Modelo de lectura TARJETA_VACANTE para el feed de vacantes
+-- ============================================
+-- GET /api/vacantes lee una fila por vacante con la tarjeta ya serializada
+-- y las columnas de la empresa copiadas, así que ni el listado ni el conteo
+-- de facetas necesitan joins. Las rutas de escritura la mantienen dentro de
+-- su propia transacción.
+--
+-- Después de crear la tabla hay que llenarla una vez con:
+--     flask --app app reconstruir-tarjetas
+
+USE freebridge;
+
+CREATE TABLE IF NOT EXISTS TARJETA_VACANTE (
+    id_vac VARCHAR(36) PRIMARY KEY,
+    id_emp VARCHAR(36) NOT NULL,
+    estado_vac VARCHAR(20) NOT NULL,
+    fecha_publicacion DATETIME NOT NULL,
+    salario DECIMAL(10, 2),
+    duracion_proyecto VARCHAR(50),
+    tamaño_emp ENUM('Pequeña', 'Mediana', 'Grande'),
+    id_ciud_emp VARCHAR(36),
+    nomb_ciud_emp VARCHAR(30),
+    total_postulaciones INT NOT NULL DEFAULT 0,
+    datos TEXT NOT NULL,
+    fecha_actualizacion DATETIME,
+    FOREIGN KEY (id_vac) REFERENCES VACANTE(id_vac),
+    INDEX idx_tarjeta_feed (estado_vac, fecha_publicacion, id_vac),
+    INDEX idx_tarjeta_facetas (
+        estado_vac, fecha_publicacion, duracion_proyecto,
+        tamaño_emp, id_ciud_emp, salario
+    ),
+    INDEX idx_tarjeta_empresa (id_emp)
+);
+
+-- Los índices de facetas sobre VACANTE y EMPRESA ya no se usan
+DROP INDEX idx_vacante_facetas ON VACANTE;
+DROP INDEX idx_empresa_facetas ON EMPRESA;
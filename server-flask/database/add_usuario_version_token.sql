@@ -0,0 +1,12 @@
+-- ============================================
+-- Versión de los JWT por usuario
+-- ============================================
+-- Los tokens llevan el claim token_version. Restablecer la contraseña o
+-- cambiar el estado de la cuenta incrementa version_token y los tokens
+-- emitidos antes dejan de ser válidos. Los tokens sin el claim cuentan como
+-- versión 0.
+
+USE freebridge;
+
+ALTER TABLE USUARIO
+    ADD COLUMN version_token INT NOT NULL DEFAULT 0;
@@ -0,0 +1,30 @@
+-- ============================================
+-- Contadores de postulaciones en VACANTE
+-- ============================================
+-- Las rutas de postulación los mantienen con UPDATE relativos dentro de su
+-- transacción. Este script agrega las columnas y las llena una vez; luego
+-- se pueden recalcular en cualquier momento con:
+--     flask --app app recalcular-contadores
+
+USE freebridge;
+
+ALTER TABLE VACANTE
+    ADD COLUMN total_postulaciones INT NOT NULL DEFAULT 0,
+    ADD COLUMN postulaciones_pendientes INT NOT NULL DEFAULT 0,
+    ADD COLUMN postulaciones_aceptadas INT NOT NULL DEFAULT 0,
+    ADD COLUMN postulaciones_rechazadas INT NOT NULL DEFAULT 0;
+
+UPDATE VACANTE v
+JOIN (
+    SELECT id_vac,
+           COUNT(*) AS total,
+           SUM(LOWER(estado_post) = 'pendiente') AS pendientes,
+           SUM(LOWER(estado_post) = 'aceptada') AS aceptadas,
+           SUM(LOWER(estado_post) = 'rechazada') AS rechazadas
+    FROM POSTULACION
+    GROUP BY id_vac
+) p ON p.id_vac = v.id_vac
+SET v.total_postulaciones = p.total,
+    v.postulaciones_pendientes = p.pendientes,
+    v.postulaciones_aceptadas = p.aceptadas,
+    v.postulaciones_rechazadas = p.rechazadas;
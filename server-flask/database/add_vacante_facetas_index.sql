@@ -0,0 +1,13 @@
+-- ============================================
+-- Índices para los filtros y facetas del feed de vacantes
+-- ============================================
+-- GET /api/vacantes calcula los conteos por faceta con una sola consulta
+-- agregada. El índice de VACANTE la cubre por completo (no lee filas) y el
+-- de EMPRESA atiende los filtros por tamaño y ciudad.
+
+USE freebridge;
+
+CREATE INDEX idx_vacante_facetas
+    ON VACANTE(estado_vac, fecha_publicacion, id_emp, duracion_proyecto, salario);
+
+CREATE INDEX idx_empresa_facetas ON EMPRESA(tamaño, id_ciud);
@@ -0,0 +1,9 @@
+-- ============================================
+-- Índice para el feed paginado de vacantes
+-- ============================================
+-- GET /api/vacantes recorre las vacantes por (estado, fecha, id) usando
+-- paginación por cursor, este índice compuesto evita el ordenamiento en memoria.
+
+USE freebridge;
+
+CREATE INDEX idx_vacante_feed ON VACANTE(estado_vac, fecha_publicacion, id_vac);
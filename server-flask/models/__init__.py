@@ -7,3 +7,9 @@ from .modelo_vacante import Vacante
 from .modelo_postulacion import Postulacion
 from .modelo_password_reset import PasswordResetToken
 from .modelo_calificacion import Calificacion
+from .modelo_tarjeta_vacante import TarjetaVacante
+from .modelo_historial_postulacion import HistorialPostulacion
+from .modelo_marca_lectura import MarcaLectura
+from .modelo_correo_saliente import CorreoSaliente
+from .modelo_notificacion_pendiente import NotificacionPendiente
+from .modelo_sesion import Sesion, TokenRefresco
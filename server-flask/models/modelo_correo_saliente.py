@@ -0,0 +1,32 @@
+from utils.db import db
+from datetime import datetime
+
+
+class CorreoSaliente(db.Model):
+    """
+    Bandeja de salida de correos. Las rutas insertan la fila en la misma
+    transacción que el cambio que la origina; el comando enviar-correos la
+    entrega y registra el resultado.
+    """
+
+    __tablename__ = "CORREO_SALIENTE"
+    __table_args__ = (
+        # El worker busca las pendientes cuyo próximo intento ya venció
+        db.Index("idx_correo_estado_intento", "estado", "proximo_intento"),
+    )
+
+    id_correo = db.Column(db.String(36), primary_key=True)
+    destinatario = db.Column(db.String(150), nullable=False)
+    remitente = db.Column(db.String(150))
+    asunto = db.Column(db.String(255), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    # pendiente -> enviando -> enviado | fallido (agotó los reintentos)
+    estado = db.Column(db.String(20), nullable=False, default="pendiente")
+    intentos = db.Column(db.Integer, nullable=False, default=0)
+    proximo_intento = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    ultimo_error = db.Column(db.Text)
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_envio = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<CorreoSaliente {self.id_correo} {self.estado}>"
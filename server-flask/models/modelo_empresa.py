@@ -11,6 +11,10 @@ class Empresa(db.Model):
     tamaño = db.Column(db.Enum("Pequeña", "Mediana", "Grande"), nullable=False)
     desc_emp = db.Column(db.String(250), nullable=False)
     logo = db.Column(db.String(255))  # Ruta del logo de la empresa
+    # Última secuencia asignada a una postulación a sus vacantes (ver postular)
+    secuencia_postulaciones = db.Column(
+        db.BigInteger, default=0, server_default="0", nullable=False
+    )
 
     # Relaciones
     vacantes = db.relationship(
@@ -13,6 +13,11 @@ class Freelancer(db.Model):
     avatar = db.Column(
         db.String(255)
     )  # Ruta del avatar o nombre del avatar por defecto
+    # Última secuencia asignada a un cambio de estado de sus postulaciones
+    # (utils/historial.asignar_secuencias)
+    secuencia_cambios = db.Column(
+        db.BigInteger, default=0, server_default="0", nullable=False
+    )
 
     # Relaciones
     postulaciones = db.relationship(
@@ -0,0 +1,32 @@
+from utils.db import db
+from utils.paginacion import ahora_al_segundo
+
+
+class HistorialPostulacion(db.Model):
+    """
+    Registro de solo inserción de los cambios de estado de las postulaciones.
+    Alimenta las notificaciones del freelancer (cambios-recientes).
+    """
+
+    __tablename__ = "HISTORIAL_POSTULACION"
+    __table_args__ = (
+        # Cambios de un freelancer posteriores a su marca de lectura
+        db.Index("idx_historial_free_secuencia", "id_free", "secuencia"),
+        db.Index("idx_historial_vacante", "id_vac"),
+    )
+
+    id_hist = db.Column(db.String(36), primary_key=True)
+    # Sin llaves foráneas: es un registro de solo inserción que no bloquea
+    # el borrado de postulaciones; se limpia junto con la vacante o la cuenta
+    id_post = db.Column(db.String(36), nullable=False)
+    id_free = db.Column(db.String(36), nullable=False)
+    id_vac = db.Column(db.String(36), nullable=False)
+    estado_anterior = db.Column(db.String(20))
+    estado_nuevo = db.Column(db.String(20), nullable=False)
+    fecha_cambio = db.Column(db.DateTime, default=ahora_al_segundo, nullable=False)
+    # Orden de los cambios del freelancer, en orden de confirmación; es la
+    # posición que guarda su marca de lectura
+    secuencia = db.Column(db.BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f"<HistorialPostulacion {self.id_post} -> {self.estado_nuevo}>"
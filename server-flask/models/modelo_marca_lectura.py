@@ -0,0 +1,21 @@
+from utils.db import db
+from datetime import datetime
+
+
+class MarcaLectura(db.Model):
+    """
+    Hasta dónde leyó un usuario un feed de notificaciones: la secuencia del
+    último elemento que marcó como visto.
+    """
+
+    __tablename__ = "MARCA_LECTURA"
+
+    id_usu = db.Column(db.String(36), db.ForeignKey("USUARIO.id_usu"), primary_key=True)
+    canal = db.Column(db.String(40), primary_key=True)
+    secuencia_vista = db.Column(db.BigInteger, nullable=False)
+    fecha_actualizacion = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<MarcaLectura {self.id_usu} {self.canal}>"
@@ -0,0 +1,25 @@
+from utils.db import db
+from datetime import datetime
+
+
+class NotificacionPendiente(db.Model):
+    """
+    Cambio de estado de una postulación que espera a salir en el resumen
+    por correo (digest) de su destinatario. `datos` guarda en JSON lo que
+    muestra el correo, para no depender de que la vacante siga existiendo.
+    """
+
+    __tablename__ = "NOTIFICACION_PENDIENTE"
+    __table_args__ = (
+        # Destinatarios cuyo cambio más antiguo ya cumplió la ventana
+        db.Index("idx_notificacion_usu_fecha", "id_usu", "fecha_creacion"),
+    )
+
+    id_notif = db.Column(db.String(36), primary_key=True)
+    id_usu = db.Column(db.String(36), db.ForeignKey("USUARIO.id_usu"), nullable=False)
+    id_post = db.Column(db.String(36), nullable=False)
+    datos = db.Column(db.Text, nullable=False)
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<NotificacionPendiente {self.id_usu} {self.id_post}>"
@@ -1,17 +1,37 @@
 from utils.db import db
-from datetime import datetime
+from utils.paginacion import ahora_al_segundo
 
 
 class Postulacion(db.Model):
     __tablename__ = "POSTULACION"
+    __table_args__ = (
+        # Feed de notificaciones de la empresa: pendientes nuevas por vacante
+        db.Index(
+            "idx_postulacion_vac_estado_secuencia",
+            "id_vac",
+            "estado_post",
+            "secuencia",
+        ),
+        # Listado de postulantes por vacante, paginado por (fecha, id)
+        db.Index("idx_postulacion_vac_fecha", "id_vac", "fecha_post", "id_post"),
+        # Un freelancer se postula una sola vez a cada vacante
+        db.UniqueConstraint("id_free", "id_vac", name="uq_postulacion_free_vac"),
+    )
 
     id_post = db.Column(db.String(36), primary_key=True)
     id_free = db.Column(
         db.String(36), db.ForeignKey("FREELANCER.id_free"), nullable=False
     )
     id_vac = db.Column(db.String(36), db.ForeignKey("VACANTE.id_vac"), nullable=False)
-    fecha_post = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_post = db.Column(db.DateTime, default=ahora_al_segundo)
     estado_post = db.Column(db.String(20), default="pendiente")
+    # Idempotency-Key con que se creó; un reintento con la misma clave
+    # recibe la misma respuesta en lugar de un 409
+    clave_idempotencia = db.Column(db.String(64))
+    # Orden de llegada dentro de la empresa, en orden de confirmación: se toma
+    # de EMPRESA.secuencia_postulaciones con la fila bloqueada hasta el commit.
+    # Es el cursor de las notificaciones de la empresa
+    secuencia = db.Column(db.BigInteger, nullable=False)
 
     def __repr__(self):
         return f"<Postulacion {self.id_post}>"
@@ -0,0 +1,52 @@
+from utils.db import db
+from datetime import datetime
+
+
+class Sesion(db.Model):
+    """
+    Sesión iniciada con login. Los access tokens llevan su id (claim "sid")
+    y los refresh tokens rotan dentro de ella; revocarla invalida ambos.
+    """
+
+    __tablename__ = "SESION"
+    __table_args__ = (
+        # Sincronización del índice de revocaciones (utils/revocacion.py)
+        db.Index("idx_sesion_revocada", "revocada_en"),
+        db.Index("idx_sesion_usu", "id_usu"),
+    )
+
+    id_sesion = db.Column(db.String(36), primary_key=True)
+    id_usu = db.Column(db.String(36), db.ForeignKey("USUARIO.id_usu"), nullable=False)
+    # version_token del usuario al iniciar la sesión
+    version_token = db.Column(db.Integer, nullable=False, default=0)
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    revocada_en = db.Column(db.DateTime)
+    motivo_revocacion = db.Column(db.String(40))
+
+    refrescos = db.relationship(
+        "TokenRefresco", backref=db.backref("sesion", lazy=True), lazy=True
+    )
+
+    def __repr__(self):
+        return f"<Sesion {self.id_sesion} usuario={self.id_usu}>"
+
+
+class TokenRefresco(db.Model):
+    """
+    Refresh token de una sesión. Solo se guarda el SHA-256 del secreto; cada
+    uso lo marca como usado y emite el siguiente.
+    """
+
+    __tablename__ = "TOKEN_REFRESCO"
+
+    id_token = db.Column(db.String(36), primary_key=True)
+    id_sesion = db.Column(
+        db.String(36), db.ForeignKey("SESION.id_sesion"), nullable=False, index=True
+    )
+    hash_secreto = db.Column(db.String(64), nullable=False)
+    fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expira = db.Column(db.DateTime, nullable=False)
+    usado_en = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<TokenRefresco {self.id_token} sesion={self.id_sesion}>"
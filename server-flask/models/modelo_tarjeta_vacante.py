@@ -0,0 +1,45 @@
+from utils.db import db
+from datetime import datetime
+
+
+class TarjetaVacante(db.Model):
+    """
+    Modelo de lectura desnormalizado: una fila por vacante con la tarjeta ya
+    serializada (vacante + empresa + ciudad + número de postulaciones) y las
+    columnas necesarias para filtrar y paginar el feed sin joins.
+    Se mantiene desde las rutas de escritura (ver utils/tarjetas.py).
+    """
+
+    __tablename__ = "TARJETA_VACANTE"
+    __table_args__ = (
+        db.Index("idx_tarjeta_feed", "estado_vac", "fecha_publicacion", "id_vac"),
+        # Índice cubriente para el conteo agregado de facetas
+        db.Index(
+            "idx_tarjeta_facetas",
+            "estado_vac",
+            "fecha_publicacion",
+            "duracion_proyecto",
+            "tamaño_emp",
+            "id_ciud_emp",
+            "salario",
+        ),
+        db.Index("idx_tarjeta_empresa", "id_emp"),
+    )
+
+    id_vac = db.Column(db.String(36), db.ForeignKey("VACANTE.id_vac"), primary_key=True)
+    id_emp = db.Column(db.String(36), nullable=False)
+    estado_vac = db.Column(db.String(20), nullable=False)
+    fecha_publicacion = db.Column(db.DateTime, nullable=False)
+    salario = db.Column(db.Numeric(10, 2))
+    duracion_proyecto = db.Column(db.String(50))
+    tamaño_emp = db.Column(db.String(20))
+    id_ciud_emp = db.Column(db.String(36))
+    nomb_ciud_emp = db.Column(db.String(30))
+    total_postulaciones = db.Column(db.Integer, default=0, nullable=False)
+    datos = db.Column(db.Text, nullable=False)  # JSON de la tarjeta
+    fecha_actualizacion = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<TarjetaVacante {self.id_vac}>"
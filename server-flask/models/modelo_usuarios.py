@@ -12,6 +12,8 @@ class Usuario(db.Model):
     estado = db.Column(
         db.Enum("Activo", "Inactivo", "Bloqueado", "Eliminado"), default="Activo"
     )
+    # Versión de los JWT del usuario: al incrementarla se revocan los emitidos
+    version_token = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # Relaciones
     empresa = db.relationship(
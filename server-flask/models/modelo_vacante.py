@@ -4,6 +4,10 @@ from datetime import datetime
 
 class Vacante(db.Model):
     __tablename__ = "VACANTE"
+    __table_args__ = (
+        # Soporta el feed paginado por cursor (estado, fecha, id)
+        db.Index("idx_vacante_feed", "estado_vac", "fecha_publicacion", "id_vac"),
+    )
 
     id_vac = db.Column(db.String(36), primary_key=True)
     id_emp = db.Column(db.String(36), db.ForeignKey("EMPRESA.id_emp"), nullable=False)
@@ -15,6 +19,20 @@ class Vacante(db.Model):
     fecha_publicacion = db.Column(db.DateTime, default=datetime.utcnow)
     estado_vac = db.Column(db.String(20), default="abierta")
 
+    # Contadores de postulaciones, mantenidos por utils/contadores.py
+    total_postulaciones = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
+    postulaciones_pendientes = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
+    postulaciones_aceptadas = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
+    postulaciones_rechazadas = db.Column(
+        db.Integer, default=0, server_default="0", nullable=False
+    )
+
     # Relaciones
     postulaciones = db.relationship(
         "Postulacion",
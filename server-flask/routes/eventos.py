@@ -0,0 +1,48 @@
+from flask import Blueprint, request, jsonify, current_app
+from utils.db import db
+from utils.auth import usuario_desde_token
+from utils.eventos import centro_eventos, flujo_sse
+
+eventos_bp = Blueprint("eventos", __name__)
+
+
+@eventos_bp.route("/api/eventos", methods=["GET"])
+def eventos():
+    """
+    Canal SSE de notificaciones del usuario autenticado.
+    EventSource no permite encabezados, así que el token también se acepta
+    en la URL (?token=). El token se vuelve a validar en cada latido: al
+    expirar o revocarse la sesión el canal se cierra.
+    """
+    token = request.headers.get("Authorization") or request.args.get("token")
+    if not token:
+        return jsonify({"error": "Token faltante"}), 401
+
+    usuario, error = usuario_desde_token(token)
+    if error:
+        return jsonify({"error": error}), 401
+    id_usu = usuario.id_usu
+
+    # La conexión puede durar horas: se libera la sesión de base de datos
+    # antes de empezar a transmitir
+    db.session.close()
+
+    app = current_app._get_current_object()
+
+    def vigente():
+        # El generador corre fuera de la petición: necesita su propio contexto
+        with app.app_context():
+            usuario, error = usuario_desde_token(token)
+            return error is None and usuario.id_usu == id_usu
+
+    suscripcion = centro_eventos.suscribir(id_usu)
+    respuesta = current_app.response_class(
+        flujo_sse(
+            suscripcion, current_app.config["EVENTOS_LATIDO_SEGUNDOS"], vigente=vigente
+        ),
+        mimetype="text/event-stream",
+    )
+    respuesta.headers["Cache-Control"] = "no-cache"
+    # Evita que nginx acumule el stream en su búfer
+    respuesta.headers["X-Accel-Buffering"] = "no"
+    return respuesta
@@ -1,11 +1,18 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, g
 from models.modelo_usuarios import Usuario
-from models.modelo_freelancer import Freelancer
-from models.modelo_empresa import Empresa
 from models.modelo_postulacion import Postulacion
 from models.modelo_vacante import Vacante
+from models.modelo_historial_postulacion import HistorialPostulacion
+from models.modelo_marca_lectura import MarcaLectura
+from models.modelo_notificacion_pendiente import NotificacionPendiente
+from models.modelo_sesion import Sesion, TokenRefresco
 from utils.db import db
 from utils.auth import token_required
+from utils.tarjetas import refrescar_tarjetas, eliminar_tarjetas
+from utils.contadores import recalcular_contadores
+from utils.cache import invalidar_al_confirmar
+from utils.busqueda import eliminar_al_confirmar
+from utils.recomendaciones import eliminar_recomendacion_al_confirmar
 import os
 
 eliminar_cuenta_bp = Blueprint("eliminar_cuenta", __name__)
@@ -24,10 +31,23 @@ def eliminar_cuenta(current_user):
 
         # Si es FreeLancer
         if user_role == "FreeLancer":
-            freelancer = Freelancer.query.filter_by(id_usu=user_id).first()
+            freelancer = g.freelancer
             if freelancer:
                 # Eliminar postulaciones del freelancer
+                ids_vacantes = [
+                    fila[0]
+                    for fila in db.session.query(Postulacion.id_vac).filter_by(
+                        id_free=freelancer.id_free
+                    )
+                ]
                 Postulacion.query.filter_by(id_free=freelancer.id_free).delete()
+                recalcular_contadores(ids_vacantes)
+                refrescar_tarjetas(ids_vacantes)
+                invalidar_al_confirmar(
+                    "vacantes",
+                    f"freelancer:{freelancer.id_free}",
+                    *[f"postulaciones:{id_vac}" for id_vac in ids_vacantes],
+                )
 
                 # Eliminar archivos físicos (hoja de vida y avatar)
                 if freelancer.hoja_vida and os.path.exists(freelancer.hoja_vida):
@@ -46,20 +66,33 @@ def eliminar_cuenta(current_user):
                     except:
                         pass
 
+                # Eliminar su historial de cambios de estado
+                HistorialPostulacion.query.filter_by(
+                    id_free=freelancer.id_free
+                ).delete()
+
                 # Eliminar registro de freelancer
                 db.session.delete(freelancer)
 
         # Si es Empresa
         elif user_role == "Empresa":
-            empresa = Empresa.query.filter_by(id_usu=user_id).first()
+            empresa = g.empresa
             if empresa:
                 # Obtener todas las vacantes de la empresa
                 vacantes = Vacante.query.filter_by(id_emp=empresa.id_emp).all()
 
+                eliminar_tarjetas([v.id_vac for v in vacantes])
+                invalidar_al_confirmar(
+                    "vacantes", *[f"vacante:{v.id_vac}" for v in vacantes]
+                )
+
                 for vacante in vacantes:
                     # Eliminar postulaciones de cada vacante
                     Postulacion.query.filter_by(id_vac=vacante.id_vac).delete()
+                    HistorialPostulacion.query.filter_by(id_vac=vacante.id_vac).delete()
                     # Eliminar la vacante
+                    eliminar_al_confirmar(vacante.id_vac)
+                    eliminar_recomendacion_al_confirmar(vacante.id_vac)
                     db.session.delete(vacante)
 
                 # Eliminar logo si existe
@@ -76,7 +109,16 @@ def eliminar_cuenta(current_user):
                 # Eliminar registro de empresa
                 db.session.delete(empresa)
 
-        # Finalmente eliminar el usuario
+        # Finalmente eliminar el usuario, sus marcas de lectura, los
+        # correos de resumen que tenía pendientes y sus sesiones
+        MarcaLectura.query.filter_by(id_usu=user_id).delete()
+        NotificacionPendiente.query.filter_by(id_usu=user_id).delete()
+        TokenRefresco.query.filter(
+            TokenRefresco.id_sesion.in_(
+                db.select(Sesion.id_sesion).where(Sesion.id_usu == user_id)
+            )
+        ).delete(synchronize_session=False)
+        Sesion.query.filter_by(id_usu=user_id).delete()
         db.session.delete(current_user)
         db.session.commit()
 
@@ -1,13 +1,17 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
 from models.modelo_usuarios import Usuario
-from werkzeug.security import check_password_hash
-import jwt
-from datetime import datetime, timedelta
+from utils.db import db
+from utils.hashing import generar_hash, verificar_hash, necesita_rehash, HashOcupado
+from utils.sesiones import iniciar_sesion
+from utils.limites import limitar, campo_json
+import logging
 
+logger = logging.getLogger(__name__)
 login_bp = Blueprint("login", __name__)
 
 
 @login_bp.route("/api/login", methods=["POST", "OPTIONS"])
+@limitar("login", cuenta=campo_json("correo"))
 def login():
     """Inicio de sesión - Devuelve JWT token"""
     if request.method == "OPTIONS":
@@ -34,23 +38,27 @@ def login():
         if not usuario:
             return jsonify({"error": "Usuario no encontrado"}), 401
 
-        if not check_password_hash(usuario.contraseña, contraseña):
-            return jsonify({"error": "Contraseña incorrecta"}), 401  # Generar JWT token
-        token = jwt.encode(
-            {
-                "user_id": usuario.id_usu,
-                "rol": usuario.rol,
-                "exp": datetime.utcnow() + timedelta(hours=24),
-            },
-            current_app.config["SECRET_KEY"],
-            algorithm="HS256",
-        )
+        if not verificar_hash(usuario.contraseña, contraseña):
+            return jsonify({"error": "Contraseña incorrecta"}), 401
+
+        # Hash con parámetros viejos: se rehace con la contraseña ya verificada
+        if necesita_rehash(usuario.contraseña):
+            try:
+                usuario.contraseña = generar_hash(contraseña)
+            except Exception as e:
+                logger.warning(
+                    f"No se pudo actualizar el hash de {usuario.id_usu}: {e}"
+                )
+
+        # Access token corto + refresh token de una sesión nueva
+        tokens = iniciar_sesion(usuario)
+        db.session.commit()
 
         return (
             jsonify(
                 {
                     "mensaje": "Inicio de sesión exitoso",
-                    "token": token,
+                    **tokens,
                     "usuario": {
                         "id": usuario.id_usu,
                         "nombre": usuario.nombre,
@@ -62,5 +70,9 @@ def login():
             200,
         )
 
+    except HashOcupado as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -9,18 +9,22 @@ from flask import Blueprint, request, jsonify
 from models.modelo_usuarios import Usuario
 from models.modelo_password_reset import PasswordResetToken
 from utils.db import db
-from werkzeug.security import generate_password_hash
+from utils.correos import encolar_mensaje
+from utils.principales import revocar_tokens
+from utils.hashing import generar_hash, HashOcupado
+from utils.limites import limitar, campo_json
 from flask_mail import Message
+import logging
 import uuid
 from datetime import datetime
 
-password_reset_bp = Blueprint("password_reset", __name__)
+logger = logging.getLogger(__name__)
 
-# La instancia de mail se inyectará desde app.py
-mail = None
+password_reset_bp = Blueprint("password_reset", __name__)
 
 
 @password_reset_bp.route("/api/auth/forgot-password", methods=["POST"])
+@limitar("recuperar", cuenta=campo_json("email"))
 def forgot_password():
     """
     Solicita recuperación de contraseña
@@ -60,94 +64,88 @@ def forgot_password():
         )
 
         db.session.add(password_reset)
-        db.session.commit()
 
         # Construir enlace de recuperación
         reset_link = f"http://localhost:5173/reset-password?token={reset_token}"
 
-        # Enviar correo electrónico
-        try:
-            msg = Message(
-                subject="Recuperación de Contraseña - FreeBridge",
-                recipients=[email],
-                sender="noreply@freebridge.com",
-            )
+        # El correo se encola en la bandeja de salida junto con el token
+        msg = Message(
+            subject="Recuperación de Contraseña - FreeBridge",
+            recipients=[email],
+            sender="noreply@freebridge.com",
+        )
 
-            msg.html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: Arial, sans-serif;
-                        line-height: 1.6;
-                        color: #333;
-                    }}
-                    .container {{
-                        max-width: 600px;
-                        margin: 0 auto;
-                        padding: 20px;
-                        background-color: #f4f4f4;
-                    }}
-                    .content {{
-                        background-color: white;
-                        padding: 30px;
-                        border-radius: 10px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    }}
-                    .header {{
-                        color: #16685a;
-                        text-align: center;
-                        margin-bottom: 20px;
-                    }}
-                    .button {{
-                        display: inline-block;
-                        padding: 12px 30px;
-                        background: linear-gradient(135deg, #16a085 0%, #16685a 100%);
-                        color: white;
-                        text-decoration: none;
-                        border-radius: 5px;
-                        margin: 20px 0;
-                    }}
-                    .footer {{
-                        text-align: center;
-                        margin-top: 20px;
-                        color: #666;
-                        font-size: 12px;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="content">
-                        <h2 class="header">Recuperación de Contraseña</h2>
-                        <p>Hola,</p>
-                        <p>Recibimos una solicitud para restablecer la contraseña de tu cuenta en FreeBridge.</p>
-                        <p>Haz clic en el siguiente botón para crear una nueva contraseña:</p>
-                        <div style="text-align: center;">
-                            <a href="{reset_link}" class="button">Restablecer Contraseña</a>
-                        </div>
-                        <p><strong>Este enlace expirará en 1 hora.</strong></p>
-                        <p>Si no solicitaste este cambio, puedes ignorar este correo de forma segura.</p>
-                        <p>Saludos,<br>El equipo de FreeBridge</p>
-                    </div>
-                    <div class="footer">
-                        <p>Si tienes problemas con el botón, copia y pega este enlace en tu navegador:</p>
-                        <p>{reset_link}</p>
+        msg.html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{
+                    font-family: Arial, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                }}
+                .container {{
+                    max-width: 600px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    background-color: #f4f4f4;
+                }}
+                .content {{
+                    background-color: white;
+                    padding: 30px;
+                    border-radius: 10px;
+                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+                }}
+                .header {{
+                    color: #16685a;
+                    text-align: center;
+                    margin-bottom: 20px;
+                }}
+                .button {{
+                    display: inline-block;
+                    padding: 12px 30px;
+                    background: linear-gradient(135deg, #16a085 0%, #16685a 100%);
+                    color: white;
+                    text-decoration: none;
+                    border-radius: 5px;
+                    margin: 20px 0;
+                }}
+                .footer {{
+                    text-align: center;
+                    margin-top: 20px;
+                    color: #666;
+                    font-size: 12px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="content">
+                    <h2 class="header">Recuperación de Contraseña</h2>
+                    <p>Hola,</p>
+                    <p>Recibimos una solicitud para restablecer la contraseña de tu cuenta en FreeBridge.</p>
+                    <p>Haz clic en el siguiente botón para crear una nueva contraseña:</p>
+                    <div style="text-align: center;">
+                        <a href="{reset_link}" class="button">Restablecer Contraseña</a>
                     </div>
+                    <p><strong>Este enlace expirará en 1 hora.</strong></p>
+                    <p>Si no solicitaste este cambio, puedes ignorar este correo de forma segura.</p>
+                    <p>Saludos,<br>El equipo de FreeBridge</p>
                 </div>
-            </body>
-            </html>
-            """
-
-            password_reset_bp.mail.send(msg)
-            print(f"✅ Correo enviado a {email}")
-            print(f"🔗 Token: {reset_token}")
-            print(f"🔗 Link: {reset_link}")
+                <div class="footer">
+                    <p>Si tienes problemas con el botón, copia y pega este enlace en tu navegador:</p>
+                    <p>{reset_link}</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
 
-        except Exception as e:
-            print(f"❌ Error al enviar correo: {str(e)}")
-            # Aún así retornamos éxito para no revelar info
+        encolar_mensaje(msg)
+        db.session.commit()
+        # Sin token ni enlace: quien lea los logs podría usarlos
+        logger.info(f"Correo de recuperación encolado (solicitud {reset_id})")
 
         return (
             jsonify(
@@ -157,11 +155,13 @@ def forgot_password():
         )
 
     except Exception as e:
-        print(f"Error en forgot_password: {str(e)}")
+        db.session.rollback()
+        logger.error(f"Error en forgot_password: {str(e)}")
         return jsonify({"error": "Error al procesar la solicitud"}), 500
 
 
 @password_reset_bp.route("/api/auth/reset-password", methods=["POST"])
+@limitar("recuperar")
 def reset_password():
     """
     Restablece la contraseña usando el token válido
@@ -196,19 +196,23 @@ def reset_password():
         if not usuario:
             return jsonify({"error": "Usuario no encontrado"}), 404
 
-        # Actualizar contraseña
-        usuario.contraseña = generate_password_hash(new_password)
+        # Actualizar contraseña y revocar las sesiones abiertas
+        usuario.contraseña = generar_hash(new_password)
+        revocar_tokens(usuario)
 
         # Marcar token como usado
         password_reset.mark_as_used()
 
         db.session.commit()
 
-        print(f"✅ Contraseña actualizada para {usuario.correo}")
+        logger.info(f"Contraseña restablecida (solicitud {password_reset.id_reset})")
 
         return jsonify({"message": "Contraseña restablecida exitosamente"}), 200
 
+    except HashOcupado as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
-        print(f"Error en reset_password: {str(e)}")
+        logger.error(f"Error en reset_password: {str(e)}")
         db.session.rollback()
         return jsonify({"error": "Error al restablecer la contraseña"}), 500
@@ -1,13 +1,15 @@
 from flask import Blueprint, request, jsonify
 from utils.db import db
 from models.modelo_usuarios import Usuario
-from werkzeug.security import generate_password_hash
+from utils.hashing import generar_hash, HashOcupado
+from utils.limites import limitar
 import uuid
 
 registro_bp = Blueprint("registro", __name__)
 
 
 @registro_bp.route("/api/registro", methods=["POST", "OPTIONS"])
+@limitar("registro")
 def registro():
     if request.method == "OPTIONS":
         return "", 200
@@ -35,7 +37,7 @@ def registro():
             id_usu=str(uuid.uuid4())[:10],
             nombre=data["nombre"],
             correo=data["correo"],
-            contraseña=generate_password_hash(data["contraseña"]),
+            contraseña=generar_hash(data["contraseña"]),
             rol=data.get("rol", "FreeLancer"),
             estado="Activo",
         )
@@ -58,6 +60,9 @@ def registro():
             201,
         )
 
+    except HashOcupado as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         db.session.rollback()
         print("Error in registration:", str(e))  # Debug print
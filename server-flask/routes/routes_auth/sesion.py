@@ -0,0 +1,48 @@
+"""
+Blueprint de sesiones
+- POST /api/auth/refresh: canjea un refresh token por un par nuevo
+- POST /api/auth/logout: revoca la sesión del refresh token
+"""
+
+from flask import Blueprint, request, jsonify
+from utils.db import db
+from utils.sesiones import rotar, cerrar_sesion, RefrescoInvalido
+from utils.limites import limitar
+
+sesion_bp = Blueprint("sesion", __name__)
+
+
+@sesion_bp.route("/api/auth/refresh", methods=["POST"])
+@limitar("refresco")
+def refrescar():
+    """Devuelve un access token y un refresh token nuevos"""
+    try:
+        data = request.get_json(silent=True) or {}
+        tokens = rotar(data.get("refresh_token"))
+        db.session.commit()
+        return jsonify(tokens), 200
+
+    except RefrescoInvalido as e:
+        # Una revocación por reutilización debe quedar guardada
+        db.session.commit()
+        return jsonify({"error": str(e)}), 401
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+@sesion_bp.route("/api/auth/logout", methods=["POST"])
+def logout():
+    """Cierra la sesión: sus access y refresh tokens dejan de valer"""
+    try:
+        data = request.get_json(silent=True) or {}
+        cerrar_sesion(data.get("refresh_token"))
+        db.session.commit()
+        return jsonify({"mensaje": "Sesión cerrada"}), 200
+
+    except RefrescoInvalido as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 401
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
-from models import Empresa
+from models import Empresa, Vacante
 from utils.db import db
+from utils.tarjetas import refrescar_tarjetas_empresa
+from utils.cache import invalidar_al_confirmar
 from werkzeug.utils import secure_filename
 import uuid
 import os
@@ -115,6 +117,18 @@ def actualizar_perfil_empresa(id_emp):
                 # Guardar solo el nombre del archivo, no la ruta completa
                 empresa.logo = unique_filename
 
+        # Tamaño, ciudad y logo aparecen en las tarjetas de sus vacantes, y
+        # los datos de la empresa en el detalle cacheado de cada una
+        refrescar_tarjetas_empresa(empresa.id_emp)
+        ids_vacantes = [
+            fila[0]
+            for fila in db.session.query(Vacante.id_vac).filter_by(
+                id_emp=empresa.id_emp
+            )
+        ]
+        invalidar_al_confirmar(
+            "vacantes", *[f"vacante:{id_vac}" for id_vac in ids_vacantes]
+        )
         db.session.commit()
 
         return (
@@ -1,9 +1,8 @@
-from flask import Blueprint, request, jsonify
-from utils.auth import token_required
+from flask import Blueprint, request, jsonify, g
+from utils.auth import token_required, empresa_required
 from utils.db import db
 from utils.config import Config
 from models.modelo_token import TokenBalance, Transaccion
-from models.modelo_empresa import Empresa
 import stripe
 import uuid
 from decimal import Decimal
@@ -21,16 +20,11 @@ def get_config():
 
 
 @payment_bp.route("/token-balance", methods=["GET"])
-@token_required
+@empresa_required("Solo empresas pueden consultar tokens")
 def get_token_balance(current_user):
     """Obtener balance de tokens de la empresa"""
     try:
-        if current_user.rol != "Empresa":
-            return jsonify({"error": "Solo empresas pueden consultar tokens"}), 403
-
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "Perfil de empresa no encontrado"}), 404
+        empresa = g.empresa
 
         # Buscar o crear balance de tokens
         balance = TokenBalance.query.filter_by(id_emp=empresa.id_emp).first()
@@ -62,22 +56,17 @@ def get_token_balance(current_user):
 
 
 @payment_bp.route("/create-payment-intent", methods=["POST"])
-@token_required
+@empresa_required("Solo empresas pueden comprar tokens")
 def create_payment_intent(current_user):
     """Crear un Payment Intent de Stripe para comprar tokens"""
     try:
-        if current_user.rol != "Empresa":
-            return jsonify({"error": "Solo empresas pueden comprar tokens"}), 403
-
         data = request.get_json()
         cantidad_tokens = data.get("cantidad_tokens", 1)
 
         if cantidad_tokens < 1 or cantidad_tokens > 100:
             return jsonify({"error": "Cantidad de tokens inválida (1-100)"}), 400
 
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "Perfil de empresa no encontrado"}), 404
+        empresa = g.empresa
 
         # Calcular monto en COP (pesos colombianos)
         monto_usd = Decimal(str(Config.TOKEN_PRICE_USD)) * cantidad_tokens
@@ -258,16 +247,11 @@ def handle_failed_payment(payment_intent):
 
 
 @payment_bp.route("/transaction-history", methods=["GET"])
-@token_required
+@empresa_required("Solo empresas pueden consultar historial")
 def get_transaction_history(current_user):
     """Obtener historial de transacciones de la empresa"""
     try:
-        if current_user.rol != "Empresa":
-            return jsonify({"error": "Solo empresas pueden consultar historial"}), 403
-
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "Perfil de empresa no encontrado"}), 404
+        empresa = g.empresa
 
         transacciones = (
             Transaccion.query.filter_by(id_emp=empresa.id_emp)
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from models import Freelancer
 from utils.db import db
+from utils.cache import invalidar_al_confirmar
 from werkzeug.utils import secure_filename
 import uuid
 import os
@@ -174,6 +175,7 @@ def actualizar_perfil_freelancer(id_free):
             # Si se seleccionó un avatar por defecto
             freelancer.avatar = request.form.get("avatar_default")
 
+        invalidar_al_confirmar(f"freelancer:{freelancer.id_free}")
         db.session.commit()
 
         return (
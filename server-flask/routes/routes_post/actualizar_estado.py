@@ -2,26 +2,30 @@
 Blueprint para actualizar el estado de las postulaciones
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, g
 from utils.db import db
-from utils.auth import token_required
+from utils.auth import empresa_required
+from utils.cache import invalidar_al_confirmar
+from utils.contadores import cambiar_estado_contadores, cambiar_estados_contadores
+from utils.correos import encolar_mensaje
+from utils.digest import agregar_a_digest
+from utils.historial import registrar_cambio_estado, asignar_secuencias
+from utils.eventos import publicar_al_confirmar
 from models.modelo_postulacion import Postulacion
 from models.modelo_freelancer import Freelancer
 from models.modelo_vacante import Vacante
+from models.modelo_usuarios import Usuario
 from flask_mail import Message
 
 actualizar_estado_bp = Blueprint("actualizar_estado", __name__)
 
-# mail se asignará desde app.py
-mail = None
-
 
 @actualizar_estado_bp.route("/api/postulacion/estado/<id_post>", methods=["PUT"])
-@token_required
+@empresa_required("Solo las empresas pueden actualizar postulaciones")
 def actualizar_estado_postulacion(current_user, id_post):
     """
     Actualiza el estado de una postulación (aceptada/rechazada)
-    y envía notificación por email al freelancer
+    y encola la notificación por email al freelancer
     """
     try:
         data = request.get_json()
@@ -39,57 +43,180 @@ def actualizar_estado_postulacion(current_user, id_post):
                 400,
             )
 
-        # Buscar la postulación
-        postulacion = Postulacion.query.filter_by(id_post=id_post).first()
-        if not postulacion:
+        # Buscar la postulación entre las vacantes de la empresa, con el
+        # freelancer y la vacante para las notificaciones
+        fila = (
+            db.session.query(Postulacion, Freelancer, Vacante)
+            .join(Vacante, Postulacion.id_vac == Vacante.id_vac)
+            .join(Freelancer, Postulacion.id_free == Freelancer.id_free)
+            .filter(
+                Postulacion.id_post == id_post,
+                Vacante.id_emp == g.empresa.id_emp,
+            )
+            .first()
+        )
+        if not fila:
             return (
                 jsonify({"success": False, "error": "Postulación no encontrada"}),
                 404,
             )
+        postulacion, freelancer, vacante = fila
 
-        # Obtener información del freelancer y la vacante
-        freelancer = Freelancer.query.filter_by(id_free=postulacion.id_free).first()
-        vacante = Vacante.query.filter_by(id_vac=postulacion.id_vac).first()
+        # Actualizar estado. Como en el lote, primero la secuencia del
+        # freelancer y después los contadores de la vacante
+        cambio = registrar_cambio_estado(
+            postulacion, postulacion.estado_post, nuevo_estado
+        )
+        if cambio is not None:
+            asignar_secuencias([cambio])
+        cambiar_estado_contadores(
+            postulacion.id_vac, postulacion.estado_post, nuevo_estado
+        )
+        postulacion.estado_post = nuevo_estado
+        invalidar_al_confirmar(f"postulaciones:{postulacion.id_vac}")
+
+        if cambio is not None:
+            publicar_cambio(freelancer.id_usu, vacante, cambio)
+            notificar_por_correo(freelancer.usuario, vacante, postulacion, nuevo_estado)
+        db.session.commit()
 
-        if not freelancer or not vacante:
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "message": f"Postulación {nuevo_estado} exitosamente",
+                    "postulacion": {
+                        "id": postulacion.id_post,
+                        "estado": postulacion.estado_post,
+                    },
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@actualizar_estado_bp.route("/api/postulaciones/estado", methods=["PUT"])
+@empresa_required("Solo las empresas pueden actualizar postulaciones")
+def actualizar_estados_postulaciones(current_user):
+    """
+    Actualiza el estado de varias postulaciones de la empresa en una sola
+    transacción. Recibe {"postulaciones": [{"id_post": ..., "estado": ...}]};
+    los emails a los freelancers se encolan en la misma transacción.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get("postulaciones")
+        if not isinstance(items, list) or not items:
             return (
                 jsonify(
                     {
                         "success": False,
-                        "error": "No se pudo obtener información completa",
+                        "error": "postulaciones debe ser una lista no vacía",
                     }
                 ),
-                404,
+                400,
             )
 
-        # Actualizar estado
-        postulacion.estado_post = nuevo_estado
-        db.session.commit()
+        maximo = current_app.config["POSTULACIONES_LOTE_MAXIMO"]
+        if len(items) > maximo:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"Máximo {maximo} postulaciones por petición",
+                    }
+                ),
+                400,
+            )
+
+        # id_post -> estado (si se repite, gana el último)
+        estados = {}
+        for item in items:
+            if not isinstance(item, dict) or not item.get("id_post"):
+                return (
+                    jsonify(
+                        {"success": False, "error": "Cada elemento requiere id_post"}
+                    ),
+                    400,
+                )
+            if item.get("estado") not in ["aceptada", "rechazada"]:
+                return (
+                    jsonify(
+                        {
+                            "success": False,
+                            "error": "Estado inválido. Debe ser 'aceptada' o 'rechazada'",
+                        }
+                    ),
+                    400,
+                )
+            estados[str(item["id_post"])] = item["estado"]
+
+        # Una sola consulta: postulaciones de vacantes de esta empresa, con
+        # el freelancer, su usuario y la vacante para las notificaciones
+        filas = (
+            db.session.query(Postulacion, Freelancer, Usuario, Vacante)
+            .join(Vacante, Postulacion.id_vac == Vacante.id_vac)
+            .join(Freelancer, Postulacion.id_free == Freelancer.id_free)
+            .join(Usuario, Freelancer.id_usu == Usuario.id_usu)
+            .filter(
+                Postulacion.id_post.in_(list(estados)),
+                Vacante.id_emp == g.empresa.id_emp,
+            )
+            .all()
+        )
+
+        # Todo o nada: si alguna no existe o no es de la empresa, no se aplica
+        encontradas = {postulacion.id_post for postulacion, _, _, _ in filas}
+        faltantes = [id_post for id_post in estados if id_post not in encontradas]
+        if faltantes:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "Postulaciones no encontradas",
+                        "no_encontradas": faltantes,
+                    }
+                ),
+                404,
+            )
 
-        # Enviar email al freelancer
-        try:
-            print(f"Intentando enviar email a: {freelancer.usuario.correo}")
-            print(f"Estado de la postulación: {nuevo_estado}")
-            enviar_email_notificacion(
-                freelancer=freelancer, vacante=vacante, estado=nuevo_estado
+        transiciones = []
+        cambios = []
+        resultado = []
+        for postulacion, freelancer, usuario, vacante in filas:
+            nuevo_estado = estados[postulacion.id_post]
+            cambio = registrar_cambio_estado(
+                postulacion, postulacion.estado_post, nuevo_estado
             )
-            print("✓ Email enviado exitosamente")
-        except Exception as email_error:
-            print(f"✗ Error al enviar email: {str(email_error)}")
-            import traceback
+            resultado.append({"id": postulacion.id_post, "estado": nuevo_estado})
+            if cambio is None:
+                continue
+            transiciones.append(
+                (postulacion.id_vac, postulacion.estado_post, nuevo_estado)
+            )
+            postulacion.estado_post = nuevo_estado
+            cambios.append(cambio)
+            publicar_cambio(usuario.id_usu, vacante, cambio)
+            notificar_por_correo(usuario, vacante, postulacion, nuevo_estado)
 
-            traceback.print_exc()
-            # No fallar si el email no se puede enviar
+        asignar_secuencias(cambios)
+        cambiar_estados_contadores(transiciones)
+        invalidar_al_confirmar(
+            *{f"postulaciones:{id_vac}" for id_vac, _, _ in transiciones}
+        )
+        db.session.commit()
 
         return (
             jsonify(
                 {
                     "success": True,
-                    "message": f"Postulación {nuevo_estado} exitosamente",
-                    "postulacion": {
-                        "id": postulacion.id_post,
-                        "estado": postulacion.estado_post,
-                    },
+                    "actualizadas": len(transiciones),
+                    "sin_cambios": len(resultado) - len(transiciones),
+                    "postulaciones": resultado,
                 }
             ),
             200,
@@ -100,17 +227,39 @@ def actualizar_estado_postulacion(current_user, id_post):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-def enviar_email_notificacion(freelancer, vacante, estado):
+def publicar_cambio(id_usu, vacante, cambio):
+    """Aviso en tiempo real al freelancer, con la forma de cambios-recientes"""
+    publicar_al_confirmar(
+        id_usu,
+        "cambio_postulacion",
+        {
+            "id": cambio.id_post,
+            "id_cambio": cambio.id_hist,
+            "estado": cambio.estado_nuevo,
+            "vacante": {
+                "nombre": vacante.nomb_vacante,
+                "descripcion": vacante.descripcion,
+            },
+            "fecha": cambio.fecha_cambio.isoformat(),
+        },
+    )
+
+
+def notificar_por_correo(usuario, vacante, postulacion, estado):
     """
-    Envía email de notificación al freelancer sobre el estado de su postulación
+    Encola el email del cambio en la misma transacción: al resumen del
+    freelancer si CORREOS_DIGEST está activo, o como correo individual
     """
-    from flask import current_app
+    if current_app.config["CORREOS_DIGEST"]:
+        agregar_a_digest(usuario, vacante, postulacion, estado)
+    else:
+        encolar_mensaje(construir_email_notificacion(usuario, vacante, estado))
 
-    usuario = freelancer.usuario
-    print(f"Preparando email para: {usuario.correo}")
-    print(f"Estado: {estado}")
-    print(f"Mail object: {actualizar_estado_bp.mail}")
 
+def construir_email_notificacion(usuario, vacante, estado):
+    """
+    Arma el email de notificación al freelancer sobre el estado de su postulación
+    """
     if estado == "aceptada":
         asunto = f"¡Felicidades! Tu postulación fue aceptada - {vacante.nomb_vacante}"
         html_body = f"""
@@ -235,12 +384,4 @@ def enviar_email_notificacion(freelancer, vacante, estado):
         </html>
         """
 
-    print(f"Creando mensaje de email...")
-    print(f"Asunto: {asunto}")
-    print(f"Destinatario: {usuario.correo}")
-
-    msg = Message(subject=asunto, recipients=[usuario.correo], html=html_body)
-
-    print("Enviando email...")
-    actualizar_estado_bp.mail.send(msg)
-    print("Email enviado correctamente")
+    return Message(subject=asunto, recipients=[usuario.correo], html=html_body)
@@ -3,11 +3,13 @@ Blueprint para cancelar/eliminar postulaciones
 """
 
 import logging
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, g
 from utils.db import db
+from utils.tarjetas import contar_en_tarjeta
+from utils.cache import invalidar_al_confirmar
+from utils.contadores import descontar_postulacion
 from utils.auth import token_required
 from models.modelo_postulacion import Postulacion
-from models.modelo_freelancer import Freelancer
 
 logger = logging.getLogger(__name__)
 cancelar_postulacion_bp = Blueprint("cancelar_postulacion", __name__)
@@ -24,7 +26,7 @@ def cancelar_postulacion(current_user, id_post):
     """
     try:
         # Verificar que el usuario es freelancer
-        freelancer = Freelancer.query.filter_by(id_usu=current_user.id_usu).first()
+        freelancer = g.freelancer
         if not freelancer:
             return (
                 jsonify(
@@ -70,6 +72,9 @@ def cancelar_postulacion(current_user, id_post):
 
         # Eliminar la postulación
         db.session.delete(postulacion)
+        descontar_postulacion(postulacion.id_vac, postulacion.estado_post)
+        contar_en_tarjeta(postulacion.id_vac, -1)
+        invalidar_al_confirmar("vacantes", f"postulaciones:{postulacion.id_vac}")
         db.session.commit()
 
         return (
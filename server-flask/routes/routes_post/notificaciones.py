@@ -2,13 +2,18 @@
 Blueprint para notificaciones de cambios en postulaciones
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from utils.db import db
 from utils.auth import token_required
-from models.modelo_postulacion import Postulacion
+from utils.paginacion import decodificar_secuencia, obtener_limite
+from utils.historial import (
+    CANAL_CAMBIOS_POSTULACIONES,
+    obtener_marca,
+    guardar_marca,
+)
+from models.modelo_historial_postulacion import HistorialPostulacion
 from models.modelo_freelancer import Freelancer
 from models.modelo_vacante import Vacante
-from datetime import datetime, timedelta
 
 notificaciones_bp = Blueprint("notificaciones", __name__)
 
@@ -17,45 +22,105 @@ notificaciones_bp = Blueprint("notificaciones", __name__)
 @token_required
 def obtener_cambios_recientes(current_user):
     """
-    Obtiene postulaciones que cambiaron de estado recientemente (últimas 24 horas)
-    para mostrar notificación al freelancer
+    Obtiene los cambios de estado de las postulaciones del freelancer que aún
+    no ha marcado como vistos (más recientes primero). Si hay más de `limite`
+    se devuelven los más antiguos y "has_more" es verdadero: "hasta" nunca
+    cubre cambios que no se entregaron.
     """
     try:
-        # Obtener el freelancer del usuario actual
-        freelancer = Freelancer.query.filter_by(id_usu=current_user.id_usu).first()
-
-        if not freelancer:
-            return jsonify({"success": True, "cambios": []}), 200
-
-        # Buscar postulaciones aceptadas o rechazadas en las últimas 24 horas
-        # Como no tenemos campo de fecha de actualización, mostraremos todas las aceptadas/rechazadas
-        postulaciones_actualizadas = Postulacion.query.filter(
-            Postulacion.id_free == freelancer.id_free,
-            Postulacion.estado_post.in_(["aceptada", "rechazada"]),
-        ).all()
-
-        cambios = []
-        for post in postulaciones_actualizadas:
-            vacante = Vacante.query.filter_by(id_vac=post.id_vac).first()
-            if vacante:
-                cambios.append(
-                    {
-                        "id": post.id_post,
-                        "estado": post.estado_post,
-                        "vacante": {
-                            "nombre": vacante.nomb_vacante,
-                            "descripcion": vacante.descripcion,
-                        },
-                        "fecha": (
-                            post.fecha_post.isoformat() if post.fecha_post else None
-                        ),
-                    }
-                )
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["NOTIFICACIONES_LIMITE_POR_DEFECTO"],
+                current_app.config["NOTIFICACIONES_LIMITE_MAXIMO"],
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        # Recorrido por rango del índice (id_free, secuencia)
+        consulta = (
+            db.session.query(
+                HistorialPostulacion.id_hist,
+                HistorialPostulacion.id_post,
+                HistorialPostulacion.estado_nuevo,
+                HistorialPostulacion.fecha_cambio,
+                HistorialPostulacion.secuencia,
+                Vacante.nomb_vacante,
+                Vacante.descripcion,
+            )
+            .join(Freelancer, HistorialPostulacion.id_free == Freelancer.id_free)
+            .join(Vacante, HistorialPostulacion.id_vac == Vacante.id_vac)
+            .filter(Freelancer.id_usu == current_user.id_usu)
+        )
+
+        marca = obtener_marca(current_user.id_usu, CANAL_CAMBIOS_POSTULACIONES)
+        if marca is not None:
+            consulta = consulta.filter(HistorialPostulacion.secuencia > marca)
+
+        # Desde la marca hacia adelante, para que "hasta" sea el último entregado
+        filas = (
+            consulta.order_by(HistorialPostulacion.secuencia.asc())
+            .limit(limite + 1)
+            .all()
+        )
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+        ultimo = filas[-1] if filas else None
+        filas.reverse()
+
+        cambios = [
+            {
+                "id": fila.id_post,
+                "id_cambio": fila.id_hist,
+                "estado": fila.estado_nuevo,
+                "vacante": {
+                    "nombre": fila.nomb_vacante,
+                    "descripcion": fila.descripcion,
+                },
+                "fecha": fila.fecha_cambio.isoformat(),
+            }
+            for fila in filas
+        ]
 
         return (
-            jsonify({"success": True, "cambios": cambios, "total": len(cambios)}),
+            jsonify(
+                {
+                    "success": True,
+                    "cambios": cambios,
+                    "total": len(cambios),
+                    # Se envía a /vistos para marcar hasta aquí como leído
+                    "hasta": str(ultimo.secuencia) if ultimo else None,
+                    "has_more": hay_mas,
+                }
+            ),
             200,
         )
 
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
+
+
+@notificaciones_bp.route(
+    "/api/postulaciones/cambios-recientes/vistos", methods=["POST"]
+)
+@token_required
+def marcar_cambios_vistos(current_user):
+    """Marca como vistos los cambios hasta el cursor "hasta" de cambios-recientes"""
+    try:
+        data = request.get_json(silent=True) or {}
+        if not data.get("hasta"):
+            return jsonify({"success": False, "error": "hasta es requerido"}), 400
+
+        try:
+            secuencia = decodificar_secuencia(str(data["hasta"]))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        guardar_marca(current_user.id_usu, CANAL_CAMBIOS_POSTULACIONES, secuencia)
+        db.session.commit()
+
+        return jsonify({"success": True}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -2,12 +2,15 @@
 Blueprint para notificaciones de nuevas postulaciones para empresas
 """
 
-from flask import Blueprint, jsonify
-from utils.auth import token_required
+from flask import Blueprint, request, jsonify, current_app, g
+from utils.db import db
+from utils.auth import empresa_required
+from utils.paginacion import decodificar_secuencia, obtener_limite
 from models.modelo_empresa import Empresa
 from models.modelo_postulacion import Postulacion
 from models.modelo_vacante import Vacante
 from models.modelo_freelancer import Freelancer
+from models.modelo_usuarios import Usuario
 
 notificaciones_empresa_bp = Blueprint("notificaciones_empresa", __name__)
 
@@ -15,82 +18,129 @@ notificaciones_empresa_bp = Blueprint("notificaciones_empresa", __name__)
 @notificaciones_empresa_bp.route(
     "/api/empresa/notificaciones/nuevas-postulaciones", methods=["GET"]
 )
-@token_required
+@empresa_required("Solo las empresas pueden ver estas notificaciones")
 def nuevas_postulaciones(current_user):
     """
-    Obtiene las postulaciones pendientes más recientes para las vacantes de la empresa
+    Obtiene las postulaciones pendientes más recientes para las vacantes de la empresa.
+    Con ?since=<cursor> devuelve, de la más antigua a la más reciente, las
+    llegadas después de ese cursor; si "has_more" es verdadero quedan más y
+    el cliente vuelve a consultar con el "since" de la respuesta. El cursor
+    es la secuencia de la postulación en la empresa (Postulacion.secuencia),
+    que se confirma en orden, así que ninguna queda detrás de él.
     """
     try:
-        # Verificar que el usuario es empresa
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
-        if not empresa:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Solo las empresas pueden ver estas notificaciones",
-                    }
-                ),
-                403,
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["NOTIFICACIONES_LIMITE_POR_DEFECTO"],
+                current_app.config["NOTIFICACIONES_LIMITE_MAXIMO"],
             )
+            since = request.args.get("since")
+            posicion = decodificar_secuencia(since) if since else None
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
 
-        # Obtener todas las vacantes de la empresa
-        vacantes = Vacante.query.filter_by(id_emp=empresa.id_emp).all()
-        vacantes_ids = [v.id_vac for v in vacantes]
-
-        # Obtener postulaciones pendientes para estas vacantes
-        postulaciones_pendientes = (
-            Postulacion.query.filter(
-                Postulacion.id_vac.in_(vacantes_ids),
+        # Una sola consulta con todo lo que muestra la notificación
+        consulta = (
+            db.session.query(
+                Postulacion.id_post,
+                Postulacion.fecha_post,
+                Postulacion.secuencia,
+                Vacante.id_vac,
+                Vacante.nomb_vacante,
+                Freelancer.id_free,
+                Usuario.nombre,
+                Usuario.correo,
+            )
+            .join(Vacante, Postulacion.id_vac == Vacante.id_vac)
+            .join(Freelancer, Postulacion.id_free == Freelancer.id_free)
+            .outerjoin(Usuario, Freelancer.id_usu == Usuario.id_usu)
+            .filter(
+                Vacante.id_emp == g.empresa.id_emp,
                 Postulacion.estado_post == "pendiente",
             )
-            .order_by(Postulacion.fecha_post.desc())
-            .all()
         )
 
-        # Formatear las notificaciones
-        notificaciones = []
-        for p in postulaciones_pendientes:
-            # Obtener información del freelancer
-            freelancer = Freelancer.query.filter_by(id_free=p.id_free).first()
+        # Solo lo que llegó después del cursor, en orden de llegada para que
+        # el cursor avance sin saltarse postulaciones si hay más que `limite`
+        if posicion is not None:
+            consulta = consulta.filter(Postulacion.secuencia > posicion).order_by(
+                Postulacion.secuencia.asc()
+            )
+        else:
+            consulta = consulta.order_by(Postulacion.secuencia.desc())
+
+        filas = consulta.limit(limite + 1).all()
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
 
-            # Obtener información de la vacante
-            vacante = Vacante.query.filter_by(id_vac=p.id_vac).first()
+        notificaciones = [
+            {
+                "id": id_post,
+                "fecha": fecha_post.isoformat() if fecha_post else None,
+                "vacante": {"id": id_vac, "nombre": nomb_vacante},
+                "freelancer": {
+                    "id": id_free,
+                    "nombre": nombre or "N/A",
+                    "email": correo or "N/A",
+                },
+            }
+            for (
+                id_post,
+                fecha_post,
+                _,
+                id_vac,
+                nomb_vacante,
+                id_free,
+                nombre,
+                correo,
+            ) in filas
+        ]
 
-            notificaciones.append(
-                {
-                    "id": p.id_post,
-                    "fecha": p.fecha_post.isoformat() if p.fecha_post else None,
-                    "vacante": {
-                        "id": vacante.id_vac if vacante else None,
-                        "nombre": vacante.nomb_vacante if vacante else "Vacante",
-                    },
-                    "freelancer": {
-                        "id": freelancer.id_free if freelancer else None,
-                        "nombre": (
-                            freelancer.usuario.nombre
-                            if freelancer and freelancer.usuario
-                            else "N/A"
-                        ),
-                        "email": (
-                            freelancer.usuario.correo
-                            if freelancer and freelancer.usuario
-                            else "N/A"
-                        ),
-                    },
-                }
+        if posicion is not None:
+            # La última postulación entregada (o el mismo cursor si no hubo)
+            siguiente = filas[-1].secuencia if filas else posicion
+        else:
+            # Carga inicial: la secuencia de la empresa. Las anteriores que no
+            # caben en `limite` se omiten, como antes; todas las posteriores
+            # llegan con since aunque la empresa aún no tenga postulaciones
+            siguiente = (
+                db.session.query(Empresa.secuencia_postulaciones)
+                .filter(Empresa.id_emp == g.empresa.id_emp)
+                .scalar()
+            ) or 0
+
+        respuesta = {
+            "success": True,
+            "notificaciones": notificaciones,
+            "total": len(notificaciones),
+            "since": str(siguiente),
+            # Solo con since: quedan postulaciones posteriores al cursor
+            "has_more": posicion is not None and hay_mas,
+        }
+
+        # Insignias de pendientes por vacante (desde los contadores de VACANTE),
+        # solo en la carga inicial; las consultas con since no las recalculan
+        if posicion is None:
+            vacantes = (
+                db.session.query(
+                    Vacante.id_vac,
+                    Vacante.nomb_vacante,
+                    Vacante.postulaciones_pendientes,
+                )
+                .filter(
+                    Vacante.id_emp == g.empresa.id_emp,
+                    Vacante.postulaciones_pendientes > 0,
+                )
+                .all()
             )
+            respuesta["pendientes_por_vacante"] = [
+                {"id": id_vac, "nombre": nombre, "pendientes": pendientes}
+                for id_vac, nombre, pendientes in vacantes
+            ]
+            respuesta["total_pendientes"] = sum(v[2] for v in vacantes)
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "notificaciones": notificaciones,
-                    "total": len(notificaciones),
-                }
-            ),
-            200,
-        )
+        return jsonify(respuesta), 200
 
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1,61 +1,161 @@
-from flask import Blueprint, jsonify
-from utils.auth import token_required
+from flask import Blueprint, jsonify, request, g
+from sqlalchemy.exc import IntegrityError
+from utils.auth import freelancer_required
+from utils.limites import limitar
 from models.modelo_vacante import Vacante
-from models.modelo_freelancer import Freelancer
+from models.modelo_empresa import Empresa
 from models.modelo_postulacion import Postulacion
 from utils.db import db
+from utils.tarjetas import contar_en_tarjeta
+from utils.cache import invalidar_al_confirmar
+from utils.contadores import contar_postulacion
+from utils.eventos import publicar_al_confirmar
+from utils.paginacion import ahora_al_segundo
 import uuid
 
 postulacion_bp = Blueprint("postulacion", __name__, url_prefix="/api")
 
 
+def _respuesta_postulacion(id_post, estado):
+    return (
+        jsonify(
+            {
+                "mensaje": "Postulación enviada exitosamente",
+                "postulacion": {"id": id_post, "estado": estado},
+            }
+        ),
+        201,
+    )
+
+
 @postulacion_bp.route("/postular/<id_vac>", methods=["POST"])
-@token_required
+@freelancer_required("Solo freelancers pueden postularse")
+@limitar("escritura", cuenta=lambda: g.usuario.id_usu)
 def postular(current_user, id_vac):
-    """Postularse a una vacante (solo freelancers)"""
+    """
+    Postularse a una vacante (solo freelancers).
+
+    Sin lecturas previas: la postulación se crea con un INSERT ... SELECT que
+    solo inserta si la vacante existe y está abierta; el duplicado lo detecta
+    la restricción uq_postulacion_free_vac, así que dos clics simultáneos no
+    pueden crear dos postulaciones. Si la petición trae Idempotency-Key y
+    coincide con la de la postulación existente, se repite la respuesta
+    original en lugar del 409.
+
+    En la misma transacción van los UPDATE del contador de la vacante, de la
+    secuencia de la empresa y de la tarjeta, y un SELECT del nombre de la
+    vacante y del usuario de la empresa para el aviso en tiempo real.
+    """
     try:
-        if current_user.rol != "FreeLancer":
-            return jsonify({"error": "Solo freelancers pueden postularse"}), 403
+        id_free = g.freelancer.id_free
+        clave = request.headers.get("Idempotency-Key") or None
+        if clave and len(clave) > 64:
+            return jsonify({"error": "Idempotency-Key demasiado larga"}), 400
 
-        freelancer = Freelancer.query.filter_by(id_usu=current_user.id_usu).first()
-        if not freelancer:
-            return jsonify({"error": "Perfil de freelancer no encontrado"}), 404
+        id_post = str(uuid.uuid4())[:10]
+        fecha_post = ahora_al_segundo()
 
-        vacante = Vacante.query.get(id_vac)
-        if not vacante:
-            return jsonify({"error": "Vacante no encontrada"}), 404
+        # El contador va primero: bloquea la vacante en exclusiva antes de que
+        # las lecturas de abajo la bloqueen en compartido (dos postulaciones
+        # simultáneas se trabarían al querer ascender ese bloqueo). Si la
+        # postulación no se crea, el rollback lo deshace
+        contar_postulacion(id_vac, "pendiente")
 
-        # Verificar si ya se postuló
-        postulacion_existente = Postulacion.query.filter_by(
-            id_free=freelancer.id_free, id_vac=id_vac
-        ).first()
+        # Siguiente secuencia de la empresa. La fila queda bloqueada hasta el
+        # commit, así que las postulaciones de una empresa se confirman en
+        # orden de secuencia y el cursor de sus notificaciones no salta ninguna
+        db.session.execute(
+            db.update(Empresa)
+            .where(
+                Empresa.id_emp
+                == db.select(Vacante.id_emp)
+                .where(Vacante.id_vac == id_vac)
+                .scalar_subquery()
+            )
+            .values(secuencia_postulaciones=Empresa.secuencia_postulaciones + 1)
+            .execution_options(synchronize_session=False)
+        )
+        origen = (
+            db.select(
+                db.literal(id_post),
+                db.literal(id_free),
+                Vacante.id_vac,
+                db.literal("pendiente"),
+                db.literal(fecha_post, db.DateTime),
+                db.literal(clave, db.String),
+                Empresa.secuencia_postulaciones,
+            )
+            .join(Empresa, Vacante.id_emp == Empresa.id_emp)
+            .where(Vacante.id_vac == id_vac, Vacante.estado_vac == "abierta")
+        )
 
-        if postulacion_existente:
+        try:
+            resultado = db.session.execute(
+                db.insert(Postulacion).from_select(
+                    [
+                        "id_post",
+                        "id_free",
+                        "id_vac",
+                        "estado_post",
+                        "fecha_post",
+                        "clave_idempotencia",
+                        "secuencia",
+                    ],
+                    origen,
+                )
+            )
+        except IntegrityError:
+            db.session.rollback()
+            existente = (
+                db.session.query(
+                    Postulacion.id_post,
+                    Postulacion.estado_post,
+                    Postulacion.clave_idempotencia,
+                )
+                .filter_by(id_free=id_free, id_vac=id_vac)
+                .first()
+            )
+            if existente is None:
+                raise
+            if clave and existente.clave_idempotencia == clave:
+                return _respuesta_postulacion(existente.id_post, existente.estado_post)
             return jsonify({"error": "Ya te has postulado a esta vacante"}), 409
 
-        # Crear nueva postulación
-        nueva_postulacion = Postulacion(
-            id_post=str(uuid.uuid4())[:10],
-            id_free=freelancer.id_free,
-            id_vac=id_vac,
-            estado_post="pendiente",
-        )
+        if resultado.rowcount == 0:
+            db.session.rollback()
+            # Solo en el caso de error se consulta cuál de los dos fue
+            if db.session.get(Vacante, id_vac) is None:
+                return jsonify({"error": "Vacante no encontrada"}), 404
+            return jsonify({"error": "La vacante no está abierta"}), 409
 
-        db.session.add(nueva_postulacion)
-        db.session.commit()
+        contar_en_tarjeta(id_vac, 1)
+        invalidar_al_confirmar("vacantes", f"postulaciones:{id_vac}")
 
-        return (
-            jsonify(
+        # Aviso en tiempo real a la empresa, con la forma de sus notificaciones
+        aviso = (
+            db.session.query(Vacante.nomb_vacante, Empresa.id_usu)
+            .join(Empresa, Vacante.id_emp == Empresa.id_emp)
+            .filter(Vacante.id_vac == id_vac)
+            .first()
+        )
+        if aviso is not None:
+            publicar_al_confirmar(
+                aviso.id_usu,
+                "nueva_postulacion",
                 {
-                    "mensaje": "Postulación enviada exitosamente",
-                    "postulacion": {
-                        "id": nueva_postulacion.id_post,
-                        "estado": nueva_postulacion.estado_post,
+                    "id": id_post,
+                    "fecha": fecha_post.isoformat(),
+                    "vacante": {"id": id_vac, "nombre": aviso.nomb_vacante},
+                    "freelancer": {
+                        "id": id_free,
+                        "nombre": current_user.nombre or "N/A",
+                        "email": current_user.correo or "N/A",
                     },
-                }
-            ),
-            201,
-        )
+                },
+            )
+        db.session.commit()
+
+        return _respuesta_postulacion(id_post, "pendiente")
 
     except Exception as e:
         db.session.rollback()
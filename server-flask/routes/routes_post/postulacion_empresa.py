@@ -1,74 +1,230 @@
-from flask import Blueprint, jsonify
-from utils.auth import token_required
-from models.modelo_empresa import Empresa
+from flask import Blueprint, request, jsonify, current_app, g
+from datetime import date, datetime, timedelta
+from utils.db import db
+from utils.auth import empresa_required
 from models.modelo_postulacion import Postulacion
 from models.modelo_vacante import Vacante
+from models.modelo_freelancer import Freelancer
+from models.modelo_usuarios import Usuario
+from utils.serializadores import (
+    serializar_postulacion_empresa,
+    serializar_resumen_postulacion_empresa,
+    promedios_calificacion,
+    columnas_postulacion_empresa,
+    plan_postulacion_freelancer,
+)
+from utils.paginacion import codificar_cursor, decodificar_cursor, obtener_limite
+from utils.ranking import ranking_postulaciones
 
 postulacion_empresa_bp = Blueprint("postulacion_empresa", __name__, url_prefix="/api")
 
 
 @postulacion_empresa_bp.route("/empresa/postulaciones", methods=["GET"])
-@token_required
+@empresa_required("Solo para empresas")
 def postulaciones_empresa(current_user):
-    """Ver todas las postulaciones a las vacantes de la empresa autenticada"""
+    """
+    Postulaciones a las vacantes de la empresa autenticada, paginadas por
+    cursor. Filtros: ?vacante=<id_vac>, ?estado=, ?desde= y ?hasta= (fechas
+    ISO de postulación); ?orden=recientes (por defecto) o antiguas.
+    La experiencia llega recortada; el texto completo está en el detalle.
+    """
     try:
-        if current_user.rol != "Empresa":
-            return jsonify({"error": "Solo para empresas"}), 403
+        empresa = g.empresa
 
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "Perfil de empresa no encontrado"}), 404
+        orden = request.args.get("orden", "recientes")
+        if orden not in ("recientes", "antiguas"):
+            return jsonify({"error": "orden debe ser 'recientes' o 'antiguas'"}), 400
 
-        # Obtener todas las postulaciones a las vacantes de esta empresa
-        postulaciones = (
-            Postulacion.query.join(Vacante)
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["POSTULACIONES_LIMITE_POR_DEFECTO"],
+                current_app.config["POSTULACIONES_LIMITE_MAXIMO"],
+            )
+            cursor = request.args.get("cursor")
+            posicion = decodificar_cursor(cursor) if cursor else None
+            desde = _leer_fecha(request.args.get("desde"), "desde")
+            hasta = _leer_fecha(request.args.get("hasta"), "hasta")
+            # Una fecha sin hora incluye todo ese día: límite exclusivo al siguiente
+            hasta_exclusivo = hasta is not None and _solo_fecha(request.args["hasta"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Solo las columnas que muestra el listado, en una consulta
+        consulta = (
+            db.session.query(*columnas_postulacion_empresa())
+            .join(Vacante, Postulacion.id_vac == Vacante.id_vac)
+            .join(Freelancer, Postulacion.id_free == Freelancer.id_free)
+            .outerjoin(Usuario, Freelancer.id_usu == Usuario.id_usu)
             .filter(Vacante.id_emp == empresa.id_emp)
-            .all()
         )
 
-        resultado = []
-        for p in postulaciones:
-            freelancer = p.freelancer
-            vacante = p.vacante
-
-            # Construir URL de hoja de vida si existe
-            hoja_vida_url = None
-            if freelancer and freelancer.hoja_vida:
-                # Extraer solo el nombre del archivo de la ruta almacenada
-                import os
-
-                filename = os.path.basename(freelancer.hoja_vida)
-                hoja_vida_url = f"/api/uploads/hojas_vida/{filename}"
-
-            postulacion_data = {
-                "id": p.id_post,
-                "estado": p.estado_post,
-                "fecha": p.fecha_post.isoformat() if p.fecha_post else None,
-                "nombre": (
-                    freelancer.usuario.nombre
-                    if freelancer and freelancer.usuario
-                    else "Sin nombre"
-                ),
-                "puesto": freelancer.profesion if freelancer else "No especificado",
-                "rating": 0,  # Por ahora sin rating
-                "avatar": freelancer.avatar if freelancer else None,
-                "experiencia": freelancer.experiencia if freelancer else "",
-                "hoja_vida": hoja_vida_url,
-                "freelancer": {
-                    "id": freelancer.id_free if freelancer else None,
-                },
-                "vacante": (
-                    {
-                        "id": vacante.id_vac if vacante else None,
-                        "nombre": vacante.nomb_vacante if vacante else "Sin nombre",
-                    }
-                    if vacante
-                    else None
-                ),
-            }
-            resultado.append(postulacion_data)
-
-        return jsonify(resultado), 200
+        if request.args.get("vacante"):
+            consulta = consulta.filter(Postulacion.id_vac == request.args["vacante"])
+        if request.args.get("estado"):
+            consulta = consulta.filter(
+                Postulacion.estado_post == request.args["estado"].lower()
+            )
+        if desde:
+            consulta = consulta.filter(Postulacion.fecha_post >= desde)
+        if hasta and hasta_exclusivo:
+            consulta = consulta.filter(
+                Postulacion.fecha_post < hasta + timedelta(days=1)
+            )
+        elif hasta:
+            consulta = consulta.filter(Postulacion.fecha_post <= hasta)
+
+        # Paginación por cursor: continuar justo después de la última fila entregada
+        descendente = orden == "recientes"
+        if posicion:
+            fecha, id_post = posicion
+            if descendente:
+                consulta = consulta.filter(
+                    db.or_(
+                        Postulacion.fecha_post < fecha,
+                        db.and_(
+                            Postulacion.fecha_post == fecha,
+                            Postulacion.id_post < id_post,
+                        ),
+                    )
+                )
+            else:
+                consulta = consulta.filter(
+                    db.or_(
+                        Postulacion.fecha_post > fecha,
+                        db.and_(
+                            Postulacion.fecha_post == fecha,
+                            Postulacion.id_post > id_post,
+                        ),
+                    )
+                )
+
+        if descendente:
+            consulta = consulta.order_by(
+                Postulacion.fecha_post.desc(), Postulacion.id_post.desc()
+            )
+        else:
+            consulta = consulta.order_by(
+                Postulacion.fecha_post.asc(), Postulacion.id_post.asc()
+            )
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        filas = consulta.limit(limite + 1).all()
+
+        siguiente_cursor = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            ultima = filas[-1]
+            siguiente_cursor = codificar_cursor(ultima.fecha_post, ultima.id_post)
+
+        # Promedio de calificaciones de los freelancers de la página
+        ratings = promedios_calificacion(fila.id_free for fila in filas)
+
+        return (
+            jsonify(
+                {
+                    "postulaciones": [
+                        serializar_resumen_postulacion_empresa(
+                            fila, ratings.get(fila.id_free, 0)
+                        )
+                        for fila in filas
+                    ],
+                    "next_cursor": siguiente_cursor,
+                    "limit": limite,
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@postulacion_empresa_bp.route("/empresa/postulaciones/<id_post>", methods=["GET"])
+@empresa_required("Solo para empresas")
+def detalle_postulacion_empresa(current_user, id_post):
+    """Postulación completa (con la experiencia entera) para la empresa"""
+    try:
+        postulacion = (
+            Postulacion.query.join(Vacante)
+            .options(*plan_postulacion_freelancer())
+            .filter(
+                Postulacion.id_post == id_post,
+                Vacante.id_emp == g.empresa.id_emp,
+            )
+            .first()
+        )
+        if not postulacion:
+            return jsonify({"error": "Postulación no encontrada"}), 404
+
+        rating = promedios_calificacion([postulacion.id_free]).get(
+            postulacion.id_free, 0
+        )
+        return jsonify(serializar_postulacion_empresa(postulacion, rating)), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def _leer_fecha(valor, nombre):
+    """Fecha ISO de un parámetro de la URL (o None). Lanza ValueError"""
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        raise ValueError(f"El parámetro {nombre} debe ser una fecha ISO")
+
+
+def _solo_fecha(valor):
+    """True si el valor es una fecha sin hora (AAAA-MM-DD)"""
+    try:
+        date.fromisoformat(valor)
+        return True
+    except ValueError:
+        return False
+
+
+@postulacion_empresa_bp.route(
+    "/empresa/vacantes/<id_vac>/postulaciones/ranking", methods=["GET"]
+)
+@empresa_required("Solo para empresas")
+def ranking_postulaciones_vacante(current_user, id_vac):
+    """Postulantes de una vacante ordenados por afinidad y calificaciones"""
+    try:
+        empresa = g.empresa
+
+        vacante = Vacante.query.get(id_vac)
+        if not vacante:
+            return jsonify({"error": "Vacante no encontrada"}), 404
+        if vacante.id_emp != empresa.id_emp:
+            return jsonify({"error": "No autorizado para ver esta vacante"}), 403
+
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["VACANTES_LIMITE_POR_DEFECTO"],
+                current_app.config["VACANTES_LIMITE_MAXIMO"],
+            )
+            desde = int(request.args.get("offset", 0))
+        except ValueError:
+            return jsonify({"error": "limit y offset deben ser enteros"}), 400
+        desde = max(desde, 0)
+
+        ranking = ranking_postulaciones(vacante)
+
+        return (
+            jsonify(
+                {
+                    "vacante": {"id": vacante.id_vac, "nombre": vacante.nomb_vacante},
+                    "postulaciones": ranking[desde : desde + limite],
+                    "total": len(ranking),
+                    "limit": limite,
+                    "offset": desde,
+                }
+            ),
+            200,
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
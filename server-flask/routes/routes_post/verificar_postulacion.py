@@ -1,7 +1,7 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, current_app, g
 from utils.auth import token_required
-from models.modelo_freelancer import Freelancer
 from models.modelo_postulacion import Postulacion
+from utils.db import db
 
 verificar_postulacion_bp = Blueprint(
     "verificar_postulacion", __name__, url_prefix="/api"
@@ -16,7 +16,7 @@ def verificar_postulacion(current_user, id_vac):
         if current_user.rol != "FreeLancer":
             return jsonify({"postulado": False}), 200
 
-        freelancer = Freelancer.query.filter_by(id_usu=current_user.id_usu).first()
+        freelancer = g.freelancer
         if not freelancer:
             return jsonify({"postulado": False}), 200
 
@@ -37,3 +37,47 @@ def verificar_postulacion(current_user, id_vac):
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@verificar_postulacion_bp.route("/verificar-postulaciones", methods=["GET"])
+@token_required
+def verificar_postulaciones(current_user):
+    """
+    Verificar de una vez si el freelancer se postuló a varias vacantes
+    (?vacantes=id1,id2,...), con una sola consulta IN. Devuelve
+    {"postulaciones": {id_vac: {"postulado", "estado"}}} con todas las
+    vacantes pedidas.
+    """
+    try:
+        ids = list(
+            dict.fromkeys(
+                i.strip() for i in request.args.get("vacantes", "").split(",")
+            )
+        )
+        ids = [i for i in ids if i]
+        maximo = current_app.config["VERIFICAR_POSTULACIONES_MAXIMO"]
+        if len(ids) > maximo:
+            return (
+                jsonify({"error": f"Máximo {maximo} vacantes por consulta"}),
+                400,
+            )
+
+        resultado = {i: {"postulado": False, "estado": None} for i in ids}
+        if not ids or current_user.rol != "FreeLancer" or not g.freelancer:
+            return jsonify({"postulaciones": resultado}), 200
+
+        filas = (
+            db.session.query(Postulacion.id_vac, Postulacion.estado_post)
+            .filter(
+                Postulacion.id_free == g.freelancer.id_free,
+                Postulacion.id_vac.in_(ids),
+            )
+            .all()
+        )
+        for id_vac, estado in filas:
+            resultado[id_vac] = {"postulado": True, "estado": estado}
+
+        return jsonify({"postulaciones": resultado}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,29 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from utils.db import db
-from utils.auth import token_required
+from utils.auth import token_required, empresa_required
 from models.modelo_calificacion import Calificacion
 from models.modelo_postulacion import Postulacion
 from models.modelo_freelancer import Freelancer
+from utils.serializadores import plan_freelancer_usuario
+from utils.streaming import respuesta_objeto
+from utils.cache import invalidar_al_confirmar
 import uuid
 
 calificacion_bp = Blueprint("calificacion", __name__, url_prefix="/api")
 
 
 @calificacion_bp.route("/calificar-freelancer", methods=["POST"])
-@token_required
+@empresa_required("Solo empresas pueden calificar freelancers")
 def calificar_freelancer(usuario_actual):
     """Permite a una empresa calificar a un freelancer después de un proceso cerrado"""
     try:
-        # Verificar que sea empresa
-        if usuario_actual.rol != "Empresa":
-            return jsonify({"error": "Solo empresas pueden calificar freelancers"}), 403
-
-        from models.modelo_empresa import Empresa
-
-        # Obtener el registro de empresa asociado al usuario
-        empresa = Empresa.query.filter_by(id_usu=usuario_actual.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "No se encontró el perfil de empresa"}), 404
+        empresa = g.empresa
 
         data = request.get_json()
         id_post = data.get("id_post")
@@ -84,6 +78,7 @@ def calificar_freelancer(usuario_actual):
         )
 
         db.session.add(nueva_calificacion)
+        invalidar_al_confirmar(f"freelancer:{postulacion.id_free}")
         db.session.commit()
 
         return (
@@ -174,48 +169,36 @@ def verificar_puede_calificar(usuario_actual, id_post):
 
 
 @calificacion_bp.route("/freelancers-trabajados", methods=["GET"])
-@token_required
+@empresa_required("Solo empresas pueden acceder")
 def obtener_freelancers_trabajados(usuario_actual):
     """Obtiene la lista de freelancers que han trabajado con la empresa (postulaciones aceptadas)"""
     try:
         print(f"=== Inicio: obtener_freelancers_trabajados ===")
         print(f"Usuario: {usuario_actual.id_usu}, Rol: {usuario_actual.rol}")
 
-        if usuario_actual.rol != "Empresa":
-            return jsonify({"error": "Solo empresas pueden acceder"}), 403
-
         from models.modelo_vacante import Vacante
         from models.modelo_freelancer import Freelancer
-        from models.modelo_empresa import Empresa
 
-        # Obtener empresa
-        empresa = Empresa.query.filter_by(id_usu=usuario_actual.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "Perfil de empresa no encontrado"}), 404
+        empresa = g.empresa
 
         print(f"Empresa ID: {empresa.id_emp}")
 
-        # Consulta simple
+        # Solo postulaciones aceptadas; se recorren en streaming
         postulaciones = (
             db.session.query(Postulacion, Freelancer, Vacante, Calificacion)
             .join(Vacante, Postulacion.id_vac == Vacante.id_vac)
             .join(Freelancer, Postulacion.id_free == Freelancer.id_free)
             .outerjoin(Calificacion, Postulacion.id_post == Calificacion.id_post)
-            .filter(Vacante.id_emp == empresa.id_emp)
-            .all()
+            .options(*plan_freelancer_usuario())
+            .filter(
+                Vacante.id_emp == empresa.id_emp,
+                db.func.lower(Postulacion.estado_post) == "aceptada",
+            )
         )
 
-        print(f"Total postulaciones: {len(postulaciones)}")
-
-        freelancers_list = []
-        for p, f, v, c in postulaciones:
-            print(f"Postulación {p.id_post}: estado='{p.estado_post}'")
-
-            # Solo incluir si está aceptada
-            if not p.estado_post or p.estado_post.lower() != "aceptada":
-                continue
-
-            item = {
+        def serializar(fila):
+            p, f, v, c = fila
+            return {
                 "id_post": p.id_post,
                 "id_free": f.id_free,
                 "nombre_freelancer": f.usuario.nombre if f.usuario else "Sin nombre",
@@ -230,19 +213,9 @@ def obtener_freelancers_trabajados(usuario_actual):
                 "calificacion": c.to_dict() if c else None,
                 "puede_calificar": c is None,
             }
-            freelancers_list.append(item)
-
-        print(f"Freelancers aceptados: {len(freelancers_list)}")
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "freelancers": freelancers_list,
-                    "total": len(freelancers_list),
-                }
-            ),
-            200,
+        return respuesta_objeto(
+            {"success": True}, "freelancers", postulaciones, serializar
         )
 
     except Exception as e:
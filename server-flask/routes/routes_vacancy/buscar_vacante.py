@@ -0,0 +1,54 @@
+from flask import Blueprint, request, jsonify, current_app
+from models.modelo_vacante import Vacante
+from utils.busqueda import indice_vacantes, IndiceNoDisponible
+from utils.paginacion import obtener_limite
+from utils.serializadores import serializar_vacante, plan_vacante_empresa
+
+buscar_vacante_bp = Blueprint("buscar_vacante", __name__, url_prefix="/api")
+
+
+@buscar_vacante_bp.route("/vacantes/buscar", methods=["GET"])
+def buscar_vacantes():
+    """Búsqueda de texto libre sobre nombre, descripción y requisitos"""
+    try:
+        consulta = request.args.get("q", "").strip()
+        if not consulta:
+            return jsonify({"error": "El parámetro q es requerido"}), 400
+
+        estado = request.args.get("estado", "abierta")
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["VACANTES_LIMITE_POR_DEFECTO"],
+                current_app.config["VACANTES_LIMITE_MAXIMO"],
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        resultados = indice_vacantes.buscar(consulta, estado=estado, limite=limite)
+        if not resultados:
+            return jsonify({"vacantes": [], "total": 0}), 200
+
+        # Cargar las vacantes encontradas en una sola consulta y respetar el ranking
+        ids = [id_vac for id_vac, _ in resultados]
+        vacantes = {
+            v.id_vac: v
+            for v in Vacante.query.options(*plan_vacante_empresa())
+            .filter(Vacante.id_vac.in_(ids))
+            .all()
+        }
+
+        resultado = []
+        for id_vac, puntaje in resultados:
+            vacante = vacantes.get(id_vac)
+            if vacante:
+                item = serializar_vacante(vacante)
+                item["puntaje"] = round(puntaje, 4)
+                resultado.append(item)
+
+        return jsonify({"vacantes": resultado, "total": len(resultado)}), 200
+
+    except IndiceNoDisponible as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,27 +1,26 @@
-from flask import Blueprint, request, jsonify
-from utils.auth import token_required
+from flask import Blueprint, request, jsonify, g
+from utils.auth import empresa_required
+from utils.limites import limitar
 from utils.db import db
 from models.modelo_vacante import Vacante
-from models.modelo_empresa import Empresa
 from models.modelo_token import TokenBalance, Transaccion
+from utils.busqueda import indexar_al_confirmar
+from utils.recomendaciones import indexar_recomendacion_al_confirmar
+from utils.cache import invalidar_al_confirmar
+from utils.tarjetas import refrescar_tarjeta
 import uuid
 
 crear_vacante_bp = Blueprint("crear_vacante", __name__, url_prefix="/api")
 
 
 @crear_vacante_bp.route("/crear-vacantes", methods=["POST"])
-@token_required
+@empresa_required("Solo empresas pueden crear vacantes")
+@limitar("escritura", cuenta=lambda: g.usuario.id_usu)
 def crear_vacante(current_user):
     """Crear una nueva vacante (requiere 1 token)"""
     try:
-        if current_user.rol != "Empresa":
-            return jsonify({"error": "Solo empresas pueden crear vacantes"}), 403
-
         data = request.get_json()
-
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
-        if not empresa:
-            return jsonify({"error": "Perfil de empresa no encontrado"}), 404
+        empresa = g.empresa
 
         # Verificar balance de tokens
         balance = TokenBalance.query.filter_by(id_emp=empresa.id_emp).first()
@@ -67,6 +66,10 @@ def crear_vacante(current_user):
 
         db.session.add(nueva_vacante)
         db.session.add(transaccion)
+        refrescar_tarjeta(nueva_vacante.id_vac)
+        indexar_al_confirmar(nueva_vacante)
+        indexar_recomendacion_al_confirmar(nueva_vacante)
+        invalidar_al_confirmar("vacantes")
         db.session.commit()
 
         return (
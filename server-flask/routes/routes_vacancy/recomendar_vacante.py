@@ -0,0 +1,66 @@
+from flask import Blueprint, request, jsonify, current_app, g
+from models.modelo_vacante import Vacante
+from models.modelo_postulacion import Postulacion
+from utils.db import db
+from utils.auth import freelancer_required
+from utils.recomendaciones import recomendador_vacantes
+from utils.busqueda import IndiceNoDisponible
+from utils.paginacion import obtener_limite
+from utils.serializadores import serializar_vacante, plan_vacante_empresa
+
+recomendar_vacante_bp = Blueprint("recomendar_vacante", __name__, url_prefix="/api")
+
+
+@recomendar_vacante_bp.route("/vacantes/recomendadas", methods=["GET"])
+@freelancer_required("Solo para freelancers")
+def vacantes_recomendadas(current_user):
+    """Vacantes abiertas más afines al perfil del freelancer autenticado"""
+    try:
+        freelancer = g.freelancer
+
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["VACANTES_LIMITE_POR_DEFECTO"],
+                current_app.config["VACANTES_LIMITE_MAXIMO"],
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # No se recomiendan vacantes a las que ya se postuló
+        postuladas = [
+            fila[0]
+            for fila in db.session.query(Postulacion.id_vac).filter_by(
+                id_free=freelancer.id_free
+            )
+        ]
+
+        resultados = recomendador_vacantes.recomendar(
+            freelancer, limite=limite, excluir=postuladas
+        )
+        if not resultados:
+            return jsonify({"vacantes": [], "total": 0}), 200
+
+        # Cargar las vacantes recomendadas en una sola consulta y respetar el orden
+        ids = [id_vac for id_vac, _ in resultados]
+        vacantes = {
+            v.id_vac: v
+            for v in Vacante.query.options(*plan_vacante_empresa())
+            .filter(Vacante.id_vac.in_(ids))
+            .all()
+        }
+
+        resultado = []
+        for id_vac, similitud in resultados:
+            vacante = vacantes.get(id_vac)
+            if vacante:
+                item = serializar_vacante(vacante)
+                item["similitud"] = round(similitud, 4)
+                resultado.append(item)
+
+        return jsonify({"vacantes": resultado, "total": len(resultado)}), 200
+
+    except IndiceNoDisponible as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
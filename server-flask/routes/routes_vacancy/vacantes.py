@@ -1,45 +1,116 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, g
 from models.modelo_vacante import Vacante
+from models.modelo_tarjeta_vacante import TarjetaVacante
+from models.modelo_historial_postulacion import HistorialPostulacion
 from utils.db import db
 from utils.auth import token_required
+from utils.paginacion import codificar_cursor, decodificar_cursor, obtener_limite
+from utils.serializadores import serializar_vacante, serializar_contadores
+from utils.tarjetas import refrescar_tarjeta, eliminar_tarjetas
+from utils.busqueda import (
+    indexar_al_confirmar,
+    cambiar_estado_al_confirmar,
+    eliminar_al_confirmar,
+)
+from utils.recomendaciones import (
+    indexar_recomendacion_al_confirmar,
+    cambiar_estado_recomendacion_al_confirmar,
+    eliminar_recomendacion_al_confirmar,
+)
+from utils.cache import respuesta_cacheada, invalidar_al_confirmar
+from utils.facetas import leer_filtros, aplicar_filtros, contar_facetas
+from utils.streaming import respuesta_lista
+import json
 
 vacantes_bp = Blueprint("vacantes", __name__, url_prefix="/api")
 
 
 @vacantes_bp.route("/vacantes", methods=["GET"])
+@respuesta_cacheada(lambda: ["vacantes"])
 def listar_vacantes():
-    """Listar todas las vacantes disponibles"""
+    """
+    Listar vacantes disponibles, paginadas por cursor (más recientes primero).
+    Admite filtros por salario, duración, fecha de publicación, tamaño y
+    ciudad de la empresa; la primera página incluye los conteos por faceta.
+    """
     try:
         estado = request.args.get("estado", "abierta")
-        vacantes = Vacante.query.filter_by(estado_vac=estado).all()
-
-        resultado = [
-            {
-                "id": v.id_vac,
-                "nombre": v.nomb_vacante,
-                "descripcion": v.descripcion,
-                "requisitos": v.requisitos,
-                "salario": float(v.salario) if v.salario else None,
-                "duracion_proyecto": v.duracion_proyecto,
-                "fecha_publicacion": (
-                    v.fecha_publicacion.isoformat() if v.fecha_publicacion else None
-                ),
-                "estado": v.estado_vac,
-                "empresa": (
-                    {"id": v.empresa.id_emp, "nombre": v.empresa.usuario.nombre}
-                    if v.empresa
-                    else None
-                ),
-            }
-            for v in vacantes
-        ]
-
-        return jsonify(resultado), 200
+
+        try:
+            limite = obtener_limite(
+                request.args.get("limit"),
+                current_app.config["VACANTES_LIMITE_POR_DEFECTO"],
+                current_app.config["VACANTES_LIMITE_MAXIMO"],
+            )
+            cursor = request.args.get("cursor")
+            posicion = decodificar_cursor(cursor) if cursor else None
+            filtros = leer_filtros(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Se lee del modelo de lectura: la tarjeta ya viene serializada
+        consulta = aplicar_filtros(
+            db.session.query(
+                TarjetaVacante.id_vac,
+                TarjetaVacante.fecha_publicacion,
+                TarjetaVacante.datos,
+                TarjetaVacante.total_postulaciones,
+            ),
+            estado,
+            filtros,
+        )
+
+        # Paginación por cursor: continuar justo después de la última fila entregada
+        if posicion:
+            fecha, id_vac = posicion
+            consulta = consulta.filter(
+                db.or_(
+                    TarjetaVacante.fecha_publicacion < fecha,
+                    db.and_(
+                        TarjetaVacante.fecha_publicacion == fecha,
+                        TarjetaVacante.id_vac < id_vac,
+                    ),
+                )
+            )
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        tarjetas = (
+            consulta.order_by(
+                TarjetaVacante.fecha_publicacion.desc(), TarjetaVacante.id_vac.desc()
+            )
+            .limit(limite + 1)
+            .all()
+        )
+
+        siguiente_cursor = None
+        if len(tarjetas) > limite:
+            tarjetas = tarjetas[:limite]
+            ultima = tarjetas[-1]
+            siguiente_cursor = codificar_cursor(ultima.fecha_publicacion, ultima.id_vac)
+
+        respuesta = {
+            "vacantes": [_leer_tarjeta(t) for t in tarjetas],
+            "next_cursor": siguiente_cursor,
+            "limit": limite,
+        }
+
+        # Los conteos por faceta solo se envían con la primera página
+        if not posicion:
+            respuesta["facetas"] = contar_facetas(estado, filtros)
+
+        return jsonify(respuesta), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _leer_tarjeta(tarjeta):
+    # El total se mantiene en su columna (postular/cancelar no reescriben el JSON)
+    datos = json.loads(tarjeta.datos)
+    datos["total_postulaciones"] = tarjeta.total_postulaciones or 0
+    return datos
+
+
 @vacantes_bp.route("/vacantes/empresa/<string:empresa_id>", methods=["GET"])
 @token_required
 def listar_vacantes_empresa(current_user, empresa_id):
@@ -49,34 +120,19 @@ def listar_vacantes_empresa(current_user, empresa_id):
         if current_user.rol != "Empresa" or current_user.id_usu != empresa_id:
             return jsonify({"error": "No autorizado"}), 403
 
-        # Obtener el id_emp del usuario
-        from models.modelo_empresa import Empresa
-
-        empresa = Empresa.query.filter_by(id_usu=empresa_id).first()
-
+        empresa = g.empresa
         if not empresa:
             return jsonify({"error": "Perfil de empresa no encontrado"}), 404
 
-        # Buscar vacantes usando id_emp
-        vacantes = Vacante.query.filter_by(id_emp=empresa.id_emp).all()
-
-        resultado = [
-            {
-                "id": v.id_vac,
-                "nombre": v.nomb_vacante,
-                "descripcion": v.descripcion,
-                "requisitos": v.requisitos,
-                "salario": float(v.salario) if v.salario else None,
-                "duracion_proyecto": v.duracion_proyecto,
-                "fecha_publicacion": (
-                    v.fecha_publicacion.isoformat() if v.fecha_publicacion else None
-                ),
-                "estado": v.estado_vac,
-            }
-            for v in vacantes
-        ]
-
-        return jsonify(resultado), 200
+        # Buscar vacantes usando id_emp, en streaming
+        vacantes = Vacante.query.filter_by(id_emp=empresa.id_emp)
+
+        def serializar(v):
+            item = serializar_vacante(v, incluir_empresa=False)
+            item["postulaciones"] = serializar_contadores(v)
+            return item
+
+        return respuesta_lista(vacantes, serializar)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -93,9 +149,7 @@ def cambiar_estado_vacante(current_user, vacante_id):
             return jsonify({"error": "Vacante no encontrada"}), 404
 
         # Verificar que el usuario sea la empresa dueña de la vacante
-        from models.modelo_empresa import Empresa
-
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
+        empresa = g.empresa
 
         if not empresa or vacante.id_emp != empresa.id_emp:
             return jsonify({"error": "No autorizado para modificar esta vacante"}), 403
@@ -107,6 +161,10 @@ def cambiar_estado_vacante(current_user, vacante_id):
             return jsonify({"error": "Estado inválido. Use 'abierta' o 'cerrada'"}), 400
 
         vacante.estado_vac = nuevo_estado
+        refrescar_tarjeta(vacante.id_vac)
+        cambiar_estado_al_confirmar(vacante.id_vac, nuevo_estado)
+        cambiar_estado_recomendacion_al_confirmar(vacante.id_vac, nuevo_estado)
+        invalidar_al_confirmar("vacantes", f"vacante:{vacante.id_vac}")
         db.session.commit()
 
         return (
@@ -139,9 +197,7 @@ def actualizar_vacante(current_user, vacante_id):
             return jsonify({"error": "Vacante no encontrada"}), 404
 
         # Verificar que el usuario sea la empresa dueña de la vacante
-        from models.modelo_empresa import Empresa
-
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
+        empresa = g.empresa
 
         if not empresa or vacante.id_emp != empresa.id_emp:
             return jsonify({"error": "No autorizado para modificar esta vacante"}), 403
@@ -162,6 +218,10 @@ def actualizar_vacante(current_user, vacante_id):
         if "estado" in data:
             vacante.estado_vac = data["estado"]
 
+        refrescar_tarjeta(vacante.id_vac)
+        indexar_al_confirmar(vacante)
+        indexar_recomendacion_al_confirmar(vacante)
+        invalidar_al_confirmar("vacantes", f"vacante:{vacante.id_vac}")
         db.session.commit()
 
         return (
@@ -198,9 +258,7 @@ def eliminar_vacante(current_user, vacante_id):
             return jsonify({"error": "Vacante no encontrada"}), 404
 
         # Verificar que el usuario sea la empresa dueña de la vacante
-        from models.modelo_empresa import Empresa
-
-        empresa = Empresa.query.filter_by(id_usu=current_user.id_usu).first()
+        empresa = g.empresa
 
         if not empresa or vacante.id_emp != empresa.id_emp:
             return jsonify({"error": "No autorizado para eliminar esta vacante"}), 403
@@ -209,9 +267,14 @@ def eliminar_vacante(current_user, vacante_id):
         from models.modelo_postulacion import Postulacion
 
         Postulacion.query.filter_by(id_vac=vacante_id).delete()
+        HistorialPostulacion.query.filter_by(id_vac=vacante_id).delete()
+        eliminar_tarjetas([vacante_id])
 
         # Luego eliminar la vacante
         db.session.delete(vacante)
+        eliminar_al_confirmar(vacante_id)
+        eliminar_recomendacion_al_confirmar(vacante_id)
+        invalidar_al_confirmar("vacantes", f"vacante:{vacante_id}")
         db.session.commit()
 
         return jsonify({"mensaje": "Vacante eliminada exitosamente"}), 200
@@ -1,42 +1,26 @@
 from flask import Blueprint, jsonify
 from models.modelo_vacante import Vacante
+from utils.serializadores import serializar_vacante_detalle, plan_vacante_empresa
+from utils.cache import respuesta_cacheada
 
 ver_vacante_bp = Blueprint("ver_vacante", __name__, url_prefix="/api")
 
 
 @ver_vacante_bp.route("/mis-vacantes/<id_vac>", methods=["GET"])
+@respuesta_cacheada(lambda id_vac: [f"vacante:{id_vac}"])
 def detalle_vacante(id_vac):
     """Ver detalle de una vacante específica"""
     try:
-        vacante = Vacante.query.get(id_vac)
+        vacante = (
+            Vacante.query.options(*plan_vacante_empresa())
+            .filter_by(id_vac=id_vac)
+            .first()
+        )
 
         if not vacante:
             return jsonify({"error": "Vacante no encontrada"}), 404
 
-        resultado = {
-            "id": vacante.id_vac,
-            "nombre": vacante.nomb_vacante,
-            "descripcion": vacante.descripcion,
-            "requisitos": vacante.requisitos,
-            "salario": float(vacante.salario) if vacante.salario else None,
-            "fecha_publicacion": (
-                vacante.fecha_publicacion.isoformat()
-                if vacante.fecha_publicacion
-                else None
-            ),
-            "estado": vacante.estado_vac,
-            "empresa": (
-                {
-                    "id": vacante.empresa.id_emp,
-                    "nombre": vacante.empresa.usuario.nombre,
-                    "tamaño": vacante.empresa.tamaño,
-                }
-                if vacante.empresa
-                else None
-            ),
-        }
-
-        return jsonify(resultado), 200
+        return jsonify(serializar_vacante_detalle(vacante)), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
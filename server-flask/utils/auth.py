@@ -1,9 +1,74 @@
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, g
 import jwt
+from sqlalchemy.orm import joinedload
 from models.modelo_usuarios import Usuario
+from utils.principales import cache_principales, copiar, restaurar
+from utils.revocacion import indice_revocaciones
 from functools import wraps
 
 
+def _cargar_usuario(id_usu):
+    """Usuario y su perfil (empresa o freelancer) en una sola consulta"""
+    generacion = cache_principales.generacion(id_usu)
+    usuario = (
+        Usuario.query.options(
+            joinedload(Usuario.empresa), joinedload(Usuario.freelancer)
+        )
+        .filter_by(id_usu=id_usu)
+        .first()
+    )
+    if usuario is not None:
+        cache_principales.guardar(
+            id_usu,
+            copiar(usuario),
+            generacion,
+            current_app.config["PRINCIPALES_TTL_SEGUNDOS"],
+            current_app.config["PRINCIPALES_MAX_ENTRADAS"],
+        )
+    return usuario
+
+
+def usuario_desde_token(token):
+    """
+    Valida un JWT y devuelve (usuario, None) o (None, mensaje de error).
+    El usuario sale de utils.principales si está en caché (sin consultas).
+    """
+    try:
+        # Remover 'Bearer ' si está presente
+        if token.startswith("Bearer "):
+            token = token[7:]
+
+        data = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+        id_usu = data["user_id"]
+        version = data.get("token_version", 0)
+
+        # Sesión cerrada o revocada (sin SQL salvo que el filtro la marque)
+        sid = data.get("sid")
+        if sid and indice_revocaciones.revocada(current_app._get_current_object(), sid):
+            return None, "Sesión revocada"
+
+        copia = cache_principales.obtener(id_usu)
+        if copia is not None and version <= dict(copia[0])["version_token"]:
+            current_user = restaurar(copia)
+        else:
+            # Sin caché, o token emitido tras una revocación que este proceso
+            # aún no conoce
+            current_user = _cargar_usuario(id_usu)
+
+        if not current_user:
+            return None, "Usuario no encontrado"
+
+        if version != current_user.version_token:
+            return None, "Token revocado"
+
+    except jwt.ExpiredSignatureError:
+        return None, "Token expirado"
+    except jwt.InvalidTokenError:
+        return None, "Token inválido"
+
+    return current_user, None
+
+
 def token_required(f):
     """Decorador para proteger rutas que requieren autenticación"""
 
@@ -14,24 +79,51 @@ def token_required(f):
         if not token:
             return jsonify({"error": "Token faltante"}), 401
 
-        try:
-            # Remover 'Bearer ' si está presente
-            if token.startswith("Bearer "):
-                token = token[7:]
+        current_user, error = usuario_desde_token(token)
+        if error:
+            return jsonify({"error": error}), 401
 
-            data = jwt.decode(
-                token, current_app.config["SECRET_KEY"], algorithms=["HS256"]
-            )
-            current_user = Usuario.query.get(data["user_id"])
-
-            if not current_user:
-                return jsonify({"error": "Usuario no encontrado"}), 401
-
-        except jwt.ExpiredSignatureError:
-            return jsonify({"error": "Token expirado"}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({"error": "Token inválido"}), 401
+        # Contexto del actor para el resto de la petición
+        g.usuario = current_user
+        g.empresa = current_user.empresa
+        g.freelancer = current_user.freelancer
 
         return f(current_user, *args, **kwargs)
 
     return decorated
+
+
+def _rol_requerido(rol, perfil, mensaje, mensaje_perfil):
+    def decorador(f):
+        @wraps(f)
+        @token_required
+        def decorated(current_user, *args, **kwargs):
+            if current_user.rol != rol:
+                return jsonify({"error": mensaje}), 403
+            if getattr(g, perfil) is None:
+                return jsonify({"error": mensaje_perfil}), 404
+            return f(current_user, *args, **kwargs)
+
+        return decorated
+
+    return decorador
+
+
+def empresa_required(mensaje="Solo empresas pueden realizar esta acción"):
+    """
+    Como token_required, pero exige rol Empresa con perfil; la ruta lo lee
+    de g.empresa sin volver a consultarlo
+    """
+    return _rol_requerido(
+        "Empresa", "empresa", mensaje, "Perfil de empresa no encontrado"
+    )
+
+
+def freelancer_required(mensaje="Solo freelancers pueden realizar esta acción"):
+    """
+    Como token_required, pero exige rol FreeLancer con perfil; la ruta lo lee
+    de g.freelancer sin volver a consultarlo
+    """
+    return _rol_requerido(
+        "FreeLancer", "freelancer", mensaje, "Perfil de freelancer no encontrado"
+    )
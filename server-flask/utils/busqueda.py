@@ -0,0 +1,383 @@
+"""
+Índice invertido en memoria para la búsqueda de vacantes.
+
+Indexa nombre, descripción y requisitos de cada vacante con plegado de
+acentos, eliminación de palabras vacías y un stemmer ligero para español.
+Los resultados se ordenan por relevancia (BM25 con pesos por campo) y el
+puntaje se acumula con NumPy para responder en milisegundos aun con
+términos muy frecuentes.
+
+El índice se mantiene incrementalmente desde las rutas que crean, actualizan
+o eliminan vacantes. Como cada proceso tiene su propia copia, un hilo en
+segundo plano lo reconstruye desde la base de datos al arrancar y luego cada
+BUSQUEDA_RESINCRONIZAR_SEGUNDOS para recoger cambios hechos por otros
+workers. Mientras tanto las búsquedas usan el índice anterior; los cambios
+que llegan durante la reconstrucción se anotan y se repiten sobre el índice
+nuevo antes de reemplazarlo.
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from flask import current_app
+from utils.db import db, al_confirmar
+
+logger = logging.getLogger(__name__)
+
+# Espera entre intentos si una reconstrucción falla sin intervalo configurado
+_REINTENTO_SEGUNDOS = 30
+
+_PALABRA = re.compile(r"[a-z0-9ñ]+")
+
+# Palabras vacías más frecuentes del español (ya sin acentos)
+PALABRAS_VACIAS = frozenset("""
+    a al algo algunas algunos ante antes como con contra cual cuando de del
+    desde donde durante e el ella ellas ellos en entre era es esa ese eso esta
+    estas este esto estos fue ha hasta hay la las le les lo los mas me mi muy
+    ni no nos o otra otras otro otros para pero poco por porque que quien se
+    sea ser si sin sobre su sus tambien te tiene todo todos tu un una uno unos
+    y ya
+    """.split())
+
+# Sufijos flexivos y derivativos, del más largo al más corto
+_SUFIJOS = sorted(
+    """
+    amientos imientos amiento imiento aciones uciones adoras adores ancias
+    encias idades logias mente acion ucion adora ador ancia encia idad logia
+    ismos istas ismo ista ables ibles able ible anza ivas ivos iva ivo ando
+    iendo ados idos adas idas ado ido ada ida ar er ir es os as s a o e
+    """.split(),
+    key=len,
+    reverse=True,
+)
+
+# Peso de cada campo al calcular la frecuencia de un término
+PESOS_CAMPOS = {"nomb_vacante": 3, "requisitos": 2, "descripcion": 1}
+
+# Parámetros BM25
+_K1 = 1.2
+_B = 0.75
+
+
+_SIN_ACENTOS = str.maketrans("áàäâéèëêíìïîóòöôúùüû", "aaaaeeeeiiiioooouuuu")
+
+
+def plegar(texto):
+    """Minúsculas y sin acentos (la ñ se conserva)"""
+    return (texto or "").lower().translate(_SIN_ACENTOS)
+
+
+@lru_cache(maxsize=100_000)
+def raiz(palabra):
+    """Stemmer ligero: elimina el sufijo más largo dejando al menos 3 letras"""
+    for sufijo in _SUFIJOS:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= 3:
+            return palabra[: -len(sufijo)]
+    return palabra
+
+
+def tokenizar(texto):
+    """Texto libre -> lista de raíces indexables"""
+    return [
+        raiz(p)
+        for p in _PALABRA.findall(plegar(texto))
+        if p not in PALABRAS_VACIAS and len(p) > 1
+    ]
+
+
+def terminos_vacante(nomb_vacante, descripcion, requisitos):
+    """Frecuencias ponderadas por campo de los términos de una vacante"""
+    frecuencias = Counter()
+    for campo, texto in (
+        ("nomb_vacante", nomb_vacante),
+        ("descripcion", descripcion),
+        ("requisitos", requisitos),
+    ):
+        peso = PESOS_CAMPOS[campo]
+        for termino in tokenizar(texto):
+            frecuencias[termino] += peso
+    return frecuencias
+
+
+class IndiceNoDisponible(Exception):
+    """El índice aún no termina su primera construcción"""
+
+
+def _peso_bm25(frecuencia, longitud, longitud_media):
+    """Componente de frecuencia de BM25, normalizada por longitud del documento"""
+    normalizacion = _K1 * (1 - _B + _B * longitud / longitud_media)
+    return frecuencia * (_K1 + 1) / (frecuencia + normalizacion)
+
+
+class IndiceVacantes:
+    """
+    Índice invertido término -> {posición: peso BM25}.
+
+    Cada vacante ocupa una posición fija (slot) mientras está indexada. El
+    peso de cada término se calcula al indexar, con la longitud media
+    vigente, de modo que una consulta solo suma idf * peso sobre arreglos
+    NumPy. La longitud media se recalcula en cada reconstrucción completa.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._lock_reconstruccion = threading.Lock()
+        self._postings = {}  # termino -> {slot: peso}
+        self._arreglos = {}  # termino -> (slots, pesos) como arreglos NumPy
+        self._slots = {}  # id_vac -> slot
+        self._ids = []  # slot -> id_vac (None si está libre)
+        self._terminos = []  # slot -> terminos de la vacante
+        self._libres = []
+        self._estados = np.zeros(1024, dtype=np.int16)  # slot -> código de estado
+        self._codigos_estado = {}
+        self._longitud_media = 1.0
+        self._construido_en = None
+        self._listo = threading.Event()
+        self._diario = None  # operaciones durante una reconstrucción
+        self._lock_inicio = threading.Lock()
+        self._pid = None
+
+    # ---------- mantenimiento ----------
+
+    def _codigo_estado(self, estado):
+        # El código 0 queda reservado para slots libres
+        return self._codigos_estado.setdefault(estado, len(self._codigos_estado) + 1)
+
+    def _quitar(self, id_vac):
+        slot = self._slots.pop(id_vac, None)
+        if slot is None:
+            return
+        for termino in self._terminos[slot]:
+            posting = self._postings.get(termino)
+            if posting is not None:
+                posting.pop(slot, None)
+                self._arreglos.pop(termino, None)
+                if not posting:
+                    del self._postings[termino]
+        self._ids[slot] = None
+        self._terminos[slot] = ()
+        self._estados[slot] = 0
+        self._libres.append(slot)
+
+    def _agregar(self, id_vac, estado, terminos):
+        if self._libres:
+            slot = self._libres.pop()
+            self._ids[slot] = id_vac
+            self._terminos[slot] = tuple(terminos)
+        else:
+            slot = len(self._ids)
+            self._ids.append(id_vac)
+            self._terminos.append(tuple(terminos))
+            if slot >= len(self._estados):
+                self._estados = np.concatenate(
+                    [self._estados, np.zeros(len(self._estados), dtype=np.int16)]
+                )
+        self._slots[id_vac] = slot
+        self._estados[slot] = self._codigo_estado(estado)
+
+        longitud = sum(terminos.values())
+        for termino, frecuencia in terminos.items():
+            self._postings.setdefault(termino, {})[slot] = _peso_bm25(
+                frecuencia, longitud, self._longitud_media
+            )
+            self._arreglos.pop(termino, None)
+
+    def _reemplazar(self, id_vac, estado, terminos):
+        self._quitar(id_vac)
+        self._agregar(id_vac, estado, terminos)
+
+    def _cambiar_estado(self, id_vac, estado):
+        slot = self._slots.get(id_vac)
+        if slot is not None:
+            self._estados[slot] = self._codigo_estado(estado)
+
+    def _aplicar(self, operacion, *args):
+        """Aplica una operación y la anota si hay una reconstrucción en curso"""
+        with self._lock:
+            getattr(self, operacion)(*args)
+            if self._diario is not None:
+                self._diario.append((operacion, args))
+
+    def indexar(self, id_vac, estado, nomb_vacante, descripcion, requisitos):
+        """Agrega o reemplaza una vacante en el índice"""
+        terminos = terminos_vacante(nomb_vacante, descripcion, requisitos)
+        self._aplicar("_reemplazar", id_vac, estado, terminos)
+
+    def cambiar_estado(self, id_vac, estado):
+        self._aplicar("_cambiar_estado", id_vac, estado)
+
+    def eliminar(self, id_vac):
+        self._aplicar("_quitar", id_vac)
+
+    def reconstruir(self):
+        """Reconstruye el índice completo desde la tabla VACANTE"""
+        with self._lock_reconstruccion:
+            with self._lock:
+                self._diario = []
+            try:
+                self._reconstruir()
+            finally:
+                with self._lock:
+                    self._diario = None
+
+    def _reconstruir(self):
+        from models.modelo_vacante import Vacante
+
+        filas = db.session.query(
+            Vacante.id_vac,
+            Vacante.estado_vac,
+            Vacante.nomb_vacante,
+            Vacante.descripcion,
+            Vacante.requisitos,
+        ).yield_per(1000)
+
+        documentos = [
+            (id_vac, estado, terminos_vacante(nombre, descripcion, requisitos))
+            for id_vac, estado, nombre, descripcion, requisitos in filas
+        ]
+
+        # Se construye aparte y se reemplaza de una vez para no bloquear búsquedas
+        nuevo = IndiceVacantes()
+        if documentos:
+            longitud_total = sum(sum(t.values()) for _, _, t in documentos)
+            nuevo._longitud_media = longitud_total / len(documentos) or 1.0
+        for id_vac, estado, terminos in documentos:
+            nuevo._agregar(id_vac, estado, terminos)
+
+        with self._lock:
+            # Cambios confirmados mientras se leía la tabla
+            for operacion, args in self._diario:
+                getattr(nuevo, operacion)(*args)
+            for atributo in (
+                "_postings",
+                "_arreglos",
+                "_slots",
+                "_ids",
+                "_terminos",
+                "_libres",
+                "_estados",
+                "_codigos_estado",
+                "_longitud_media",
+            ):
+                setattr(self, atributo, getattr(nuevo, atributo))
+            self._construido_en = time.monotonic()
+        self._listo.set()
+
+    def _mantener(self, app):
+        intervalo = app.config["BUSQUEDA_RESINCRONIZAR_SEGUNDOS"]
+        # Tras un fork el índice del padre ya sirve: se espera al siguiente turno
+        if self._construido_en is not None:
+            if not intervalo:
+                return
+            time.sleep(intervalo)
+        while True:
+            try:
+                with app.app_context():
+                    self.reconstruir()
+                    db.session.remove()
+                if not intervalo:
+                    return
+            except Exception as e:
+                logger.error(f"Error al reconstruir el índice de búsqueda: {str(e)}")
+            time.sleep(intervalo or _REINTENTO_SEGUNDOS)
+
+    def iniciar(self, app):
+        """Construye el índice y lo mantiene al día en un hilo de este proceso"""
+        with self._lock_inicio:
+            # Tras un fork (gunicorn) el hilo del padre no existe en el hijo
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(
+                target=self._mantener,
+                args=(app,),
+                name="indice-busqueda",
+                daemon=True,
+            ).start()
+
+    def _asegurar_actualizado(self):
+        app = current_app._get_current_object()
+        if self._pid != os.getpid():
+            self.iniciar(app)
+        if self._construido_en is None and not self._listo.wait(
+            app.config["INDICES_ESPERA_SEGUNDOS"]
+        ):
+            raise IndiceNoDisponible("El índice de búsqueda se está construyendo")
+
+    def _arreglo(self, termino):
+        """Posting de un término como arreglos (slots, pesos), cacheado"""
+        arreglo = self._arreglos.get(termino)
+        if arreglo is None:
+            posting = self._postings[termino]
+            arreglo = (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float64, count=len(posting)),
+            )
+            self._arreglos[termino] = arreglo
+        return arreglo
+
+    # ---------- consulta ----------
+
+    def buscar(self, consulta, estado="abierta", limite=20):
+        """Devuelve [(id_vac, puntaje)] ordenado por relevancia"""
+        self._asegurar_actualizado()
+        terminos = set(tokenizar(consulta))
+        if not terminos:
+            return []
+
+        with self._lock:
+            total_docs = len(self._slots)
+            terminos = [t for t in terminos if t in self._postings]
+            if not terminos:
+                return []
+
+            puntajes = np.zeros(len(self._ids), dtype=np.float64)
+            for termino in terminos:
+                slots, pesos = self._arreglo(termino)
+                df = len(slots)
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                puntajes[slots] += idf * pesos
+
+            if estado:
+                codigo = self._codigos_estado.get(estado)
+                puntajes[self._estados[: len(puntajes)] != codigo] = 0.0
+
+            candidatos = np.flatnonzero(puntajes)
+            if len(candidatos) > limite:
+                mejores = np.argpartition(puntajes[candidatos], -limite)[-limite:]
+                candidatos = candidatos[mejores]
+            candidatos = candidatos[np.argsort(-puntajes[candidatos], kind="stable")]
+
+            return [(self._ids[slot], float(puntajes[slot])) for slot in candidatos]
+
+
+indice_vacantes = IndiceVacantes()
+
+
+# ---------- integración con las rutas de escritura ----------
+# Los cambios se aplican al índice solo cuando la transacción se confirma.
+
+
+def indexar_al_confirmar(vacante):
+    datos = (
+        vacante.id_vac,
+        vacante.estado_vac,
+        vacante.nomb_vacante,
+        vacante.descripcion,
+        vacante.requisitos,
+    )
+    al_confirmar(lambda: indice_vacantes.indexar(*datos))
+
+
+def cambiar_estado_al_confirmar(id_vac, estado):
+    al_confirmar(lambda: indice_vacantes.cambiar_estado(id_vac, estado))
+
+
+def eliminar_al_confirmar(id_vac):
+    al_confirmar(lambda: indice_vacantes.eliminar(id_vac))
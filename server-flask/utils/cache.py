@@ -0,0 +1,145 @@
+"""
+Caché de respuestas para endpoints públicos de solo lectura.
+
+Las respuestas se guardan por ruta + parámetros de la URL junto con un
+ETag fuerte (hash del cuerpo). Una petición con If-None-Match que coincide
+recibe 304 sin tocar la base de datos.
+
+Cada entrada se asocia a etiquetas ("vacantes", "vacante:<id>"). Las rutas
+de escritura invalidan sus etiquetas con invalidar_al_confirmar, que solo
+actúa si la transacción se confirma. La caché vive en cada proceso, por lo
+que las entradas además expiran tras CACHE_RESPUESTAS_TTL_SEGUNDOS para
+acotar lo que puede quedar desactualizado en otros workers.
+
+Además de respuestas, guarda resultados ya calculados que dependen de las
+mismas etiquetas (ver utils/ranking.py).
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, current_app
+from utils.db import al_confirmar
+
+
+class CacheRespuestas:
+    """LRU de respuestas serializadas con invalidación por etiquetas"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # clave -> (etag, cuerpo, etiquetas, expira)
+        self._por_etiqueta = {}  # etiqueta -> {claves}
+        self._generaciones = {}  # etiqueta -> contador de invalidaciones
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            if entrada[3] < time.monotonic():
+                self._quitar(clave)
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada
+
+    def generaciones(self, etiquetas):
+        with self._lock:
+            return tuple(self._generaciones.get(e, 0) for e in etiquetas)
+
+    def guardar(self, clave, etag, cuerpo, etiquetas, generaciones, ttl, maximo):
+        with self._lock:
+            # Si alguna etiqueta se invalidó mientras se generaba la respuesta,
+            # el cuerpo puede estar desactualizado y no se guarda
+            if generaciones != tuple(self._generaciones.get(e, 0) for e in etiquetas):
+                return
+            self._quitar(clave)
+            self._entradas[clave] = (etag, cuerpo, etiquetas, time.monotonic() + ttl)
+            for etiqueta in etiquetas:
+                self._por_etiqueta.setdefault(etiqueta, set()).add(clave)
+            while len(self._entradas) > maximo:
+                self._quitar(next(iter(self._entradas)))
+
+    def invalidar(self, *etiquetas):
+        with self._lock:
+            for etiqueta in etiquetas:
+                self._generaciones[etiqueta] = self._generaciones.get(etiqueta, 0) + 1
+                for clave in list(self._por_etiqueta.pop(etiqueta, ())):
+                    self._quitar(clave)
+
+    def _quitar(self, clave):
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return
+        for etiqueta in entrada[2]:
+            claves = self._por_etiqueta.get(etiqueta)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._por_etiqueta[etiqueta]
+
+
+cache_respuestas = CacheRespuestas()
+
+
+def _respuesta(etag, cuerpo):
+    if request.if_none_match.contains_weak(etag):
+        respuesta = current_app.response_class(status=304)
+    else:
+        respuesta = current_app.response_class(
+            cuerpo, status=200, mimetype="application/json"
+        )
+    respuesta.set_etag(etag)
+    # El navegador puede guardar la respuesta pero debe revalidarla siempre
+    respuesta.headers["Cache-Control"] = "public, no-cache"
+    return respuesta
+
+
+def respuesta_cacheada(etiquetas):
+    """
+    Decorador para endpoints GET públicos. `etiquetas` recibe los argumentos
+    de la vista y devuelve la lista de etiquetas de la respuesta.
+    Solo se cachean respuestas 200.
+    """
+
+    def decorador(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            clave = (
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+            )
+
+            entrada = cache_respuestas.obtener(clave)
+            if entrada is not None:
+                return _respuesta(entrada[0], entrada[1])
+
+            etiquetas_respuesta = tuple(etiquetas(*args, **kwargs))
+            generaciones = cache_respuestas.generaciones(etiquetas_respuesta)
+
+            respuesta = current_app.make_response(f(*args, **kwargs))
+            if respuesta.status_code != 200:
+                return respuesta
+
+            cuerpo = respuesta.get_data()
+            etag = hashlib.sha256(cuerpo).hexdigest()
+            cache_respuestas.guardar(
+                clave,
+                etag,
+                cuerpo,
+                etiquetas_respuesta,
+                generaciones,
+                current_app.config["CACHE_RESPUESTAS_TTL_SEGUNDOS"],
+                current_app.config["CACHE_RESPUESTAS_MAX_ENTRADAS"],
+            )
+            return _respuesta(etag, cuerpo)
+
+        return decorated
+
+    return decorador
+
+
+def invalidar_al_confirmar(*etiquetas):
+    """Invalida las etiquetas cuando la transacción actual se confirme"""
+    al_confirmar(lambda: cache_respuestas.invalidar(*etiquetas))
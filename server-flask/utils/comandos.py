@@ -0,0 +1,121 @@
+"""
+Comandos de mantenimiento (flask <comando>)
+Ejecutar desde server-flask con FLASK_APP=app.py
+"""
+
+import math
+import time
+import click
+
+
+def registrar_comandos(app):
+    @app.cli.command("reconstruir-tarjetas")
+    def reconstruir_tarjetas_cmd():
+        """Recalcula todas las filas de TARJETA_VACANTE"""
+        from utils.tarjetas import reconstruir_tarjetas
+
+        total = reconstruir_tarjetas()
+        click.echo(f"✅ {total} tarjetas de vacante reconstruidas")
+
+    @app.cli.command("recalcular-contadores")
+    def recalcular_contadores_cmd():
+        """Recalcula los contadores de postulaciones de todas las vacantes"""
+        from utils.db import db
+        from utils.contadores import recalcular_contadores
+
+        total = recalcular_contadores()
+        db.session.commit()
+        click.echo(f"✅ Contadores recalculados en {total} vacantes")
+
+    @app.cli.command("enviar-correos")
+    @click.option("--hilos", type=int, help="Conexiones SMTP simultáneas")
+    @click.option("--lote", type=int, help="Correos reclamados por vuelta")
+    @click.option("--una-vez", is_flag=True, help="Drenar lo pendiente y salir")
+    def enviar_correos_cmd(hilos, lote, una_vez):
+        """
+        Envía los correos de la bandeja de salida (CORREO_SALIENTE), armando
+        antes los resúmenes de NOTIFICACION_PENDIENTE cuya ventana se cumplió
+        """
+        from flask import current_app
+        from utils.correos import crear_pool, procesar_correos
+        from utils.smtp import obtener_pool
+        from utils.digest import despachar_digests
+
+        hilos = hilos or current_app.config["CORREOS_HILOS"]
+        lote = lote or current_app.config["CORREOS_LOTE"]
+        intervalo = current_app.config["CORREOS_INTERVALO_SEGUNDOS"]
+
+        try:
+            with crear_pool(hilos) as pool:
+                while True:
+                    resumenes, cambios = despachar_digests()
+                    if resumenes:
+                        click.echo(f"🗞️  {resumenes} resúmenes con {cambios} cambios")
+                    enviados, fallidos = procesar_correos(pool, hilos, lote)
+                    if enviados or fallidos:
+                        click.echo(f"📧 {enviados} enviados, {fallidos} fallidos")
+                    elif una_vez:
+                        break
+                    else:
+                        time.sleep(intervalo)
+        finally:
+            obtener_pool(current_app).cerrar()
+
+    @app.cli.command("medir-hash")
+    @click.option(
+        "--metodo",
+        "metodos",
+        multiple=True,
+        help="Política a medir (repetible); por defecto HASH_METODO",
+    )
+    @click.option("--logins", default=200, help="Verificaciones por política")
+    @click.option("--hilos", default=16, help="Peticiones simultáneas simuladas")
+    def medir_hash_cmd(metodos, logins, hilos):
+        """
+        Mide logins por segundo (check_password_hash) con el pool de procesos
+        configurado y en el hilo de la petición, para cada política
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from flask import current_app
+        from werkzeug.security import check_password_hash, generate_password_hash
+        from utils.hashing import EjecutorHash
+
+        config = current_app.config
+        procesos = config["HASH_PROCESOS"]
+        for metodo in metodos or [config["HASH_METODO"]]:
+            hash_guardado = generate_password_hash("contraseña-de-prueba", metodo)
+            for nombre, ejecutor in (
+                ("en hilo", EjecutorHash(0, 1, 0)),
+                (f"{procesos} procesos", EjecutorHash(procesos, hilos, 60)),
+            ):
+                if nombre != "en hilo" and not procesos:
+                    continue
+                # Calentar el pool para no medir el arranque de los procesos
+                ejecutor.ejecutar(
+                    check_password_hash, hash_guardado, "contraseña-de-prueba"
+                )
+                duraciones = []
+
+                def login(_):
+                    inicio = time.perf_counter()
+                    ejecutor.ejecutar(
+                        check_password_hash, hash_guardado, "contraseña-de-prueba"
+                    )
+                    duraciones.append(time.perf_counter() - inicio)
+
+                inicio = time.perf_counter()
+                with ThreadPoolExecutor(hilos) as pool:
+                    list(pool.map(login, range(logins)))
+                total = time.perf_counter() - inicio
+                ejecutor.cerrar()
+
+                duraciones.sort()
+                # Rango más cercano: válido también con menos de 20 muestras
+                p95 = duraciones[
+                    min(len(duraciones) - 1, math.ceil(0.95 * len(duraciones)) - 1)
+                ]
+                click.echo(
+                    f"{metodo:<24} {nombre:<12} {logins / total:8.1f} logins/s  "
+                    f"p50 {duraciones[len(duraciones) // 2] * 1000:7.1f} ms  "
+                    f"p95 {p95 * 1000:7.1f} ms"
+                )
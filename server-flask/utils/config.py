@@ -28,6 +28,96 @@ class Config:
     # Clave secreta para JWT
     SECRET_KEY = os.environ.get("SECRET_KEY", "tu_clave_secreta_temporal")
 
+    # Paginación del feed público de vacantes
+    VACANTES_LIMITE_POR_DEFECTO = int(os.environ.get("VACANTES_LIMITE_POR_DEFECTO", 20))
+    VACANTES_LIMITE_MAXIMO = int(os.environ.get("VACANTES_LIMITE_MAXIMO", 100))
+
+    # Paginación del listado de postulantes de la empresa
+    POSTULACIONES_LIMITE_POR_DEFECTO = int(
+        os.environ.get("POSTULACIONES_LIMITE_POR_DEFECTO", 20)
+    )
+    POSTULACIONES_LIMITE_MAXIMO = int(
+        os.environ.get("POSTULACIONES_LIMITE_MAXIMO", 100)
+    )
+
+    # Canal SSE: cada cuántos segundos se envía un latido a conexiones inactivas
+    EVENTOS_LATIDO_SEGUNDOS = int(os.environ.get("EVENTOS_LATIDO_SEGUNDOS", 25))
+
+    # Notificaciones de nuevas postulaciones para empresas
+    NOTIFICACIONES_LIMITE_POR_DEFECTO = int(
+        os.environ.get("NOTIFICACIONES_LIMITE_POR_DEFECTO", 50)
+    )
+    NOTIFICACIONES_LIMITE_MAXIMO = int(
+        os.environ.get("NOTIFICACIONES_LIMITE_MAXIMO", 200)
+    )
+
+    # Búsqueda de vacantes: cada cuánto se reconstruye (en segundo plano) el
+    # índice en memoria para recoger cambios hechos por otros procesos (0 = nunca)
+    BUSQUEDA_RESINCRONIZAR_SEGUNDOS = int(
+        os.environ.get("BUSQUEDA_RESINCRONIZAR_SEGUNDOS", 300)
+    )
+
+    # Recomendaciones: cada cuánto se reconstruye la matriz TF-IDF (0 = nunca)
+    RECOMENDACIONES_RESINCRONIZAR_SEGUNDOS = int(
+        os.environ.get("RECOMENDACIONES_RESINCRONIZAR_SEGUNDOS", 900)
+    )
+
+    # Cuánto espera una consulta a que termine la primera construcción de un
+    # índice en memoria antes de responder 503
+    INDICES_ESPERA_SEGUNDOS = float(os.environ.get("INDICES_ESPERA_SEGUNDOS", 2))
+
+    # Caché de respuestas públicas (por proceso)
+    CACHE_RESPUESTAS_TTL_SEGUNDOS = int(
+        os.environ.get("CACHE_RESPUESTAS_TTL_SEGUNDOS", 60)
+    )
+    CACHE_RESPUESTAS_MAX_ENTRADAS = int(
+        os.environ.get("CACHE_RESPUESTAS_MAX_ENTRADAS", 1024)
+    )
+
+    # Hash de contraseñas (utils/hashing.py): política y pool de procesos
+    HASH_METODO = os.environ.get("HASH_METODO", "scrypt:32768:8:1")
+    HASH_PROCESOS = int(os.environ.get("HASH_PROCESOS", 2))
+    HASH_PENDIENTES_MAXIMO = int(os.environ.get("HASH_PENDIENTES_MAXIMO", 32))
+    HASH_ESPERA_SEGUNDOS = float(os.environ.get("HASH_ESPERA_SEGUNDOS", 5))
+
+    # Sesiones: access token corto + refresh token rotativo
+    ACCESO_TOKEN_MINUTOS = int(os.environ.get("ACCESO_TOKEN_MINUTOS", 15))
+    REFRESCO_TOKEN_DIAS = int(os.environ.get("REFRESCO_TOKEN_DIAS", 30))
+    REFRESCO_GRACIA_SEGUNDOS = int(os.environ.get("REFRESCO_GRACIA_SEGUNDOS", 30))
+
+    # Índice de sesiones revocadas (filtro de Bloom por proceso)
+    REVOCACION_SYNC_SEGUNDOS = int(os.environ.get("REVOCACION_SYNC_SEGUNDOS", 5))
+    REVOCACION_BLOOM_BITS = int(os.environ.get("REVOCACION_BLOOM_BITS", 1 << 20))
+    REVOCACION_BLOOM_HASHES = int(os.environ.get("REVOCACION_BLOOM_HASHES", 7))
+
+    # Límite de solicitudes (token bucket, utils/limites.py): "capacidad/segundos"
+    LIMITES_ACTIVOS = os.environ.get("LIMITES_ACTIVOS", "True") == "True"
+    LIMITES_MAX_CLAVES = int(os.environ.get("LIMITES_MAX_CLAVES", 100000))
+    # Vacío = cubetas por proceso; "redis://..." = compartidas entre workers
+    LIMITES_REDIS_URL = os.environ.get("LIMITES_REDIS_URL", "")
+    # Proxies delante de Flask que agregan X-Forwarded-For (0 = ninguno)
+    LIMITES_PROXIES_CONFIABLES = int(os.environ.get("LIMITES_PROXIES_CONFIABLES", 0))
+    LIMITE_LOGIN_IP = os.environ.get("LIMITE_LOGIN_IP", "20/60")
+    LIMITE_LOGIN_CUENTA = os.environ.get("LIMITE_LOGIN_CUENTA", "5/60")
+    LIMITE_REGISTRO_IP = os.environ.get("LIMITE_REGISTRO_IP", "10/3600")
+    LIMITE_RECUPERAR_IP = os.environ.get("LIMITE_RECUPERAR_IP", "10/900")
+    LIMITE_RECUPERAR_CUENTA = os.environ.get("LIMITE_RECUPERAR_CUENTA", "3/3600")
+    LIMITE_REFRESCO_IP = os.environ.get("LIMITE_REFRESCO_IP", "60/60")
+    LIMITE_ESCRITURA_IP = os.environ.get("LIMITE_ESCRITURA_IP", "120/60")
+    LIMITE_ESCRITURA_CUENTA = os.environ.get("LIMITE_ESCRITURA_CUENTA", "30/60")
+
+    # Caché de usuarios autenticados (por proceso)
+    PRINCIPALES_TTL_SEGUNDOS = int(os.environ.get("PRINCIPALES_TTL_SEGUNDOS", 30))
+    PRINCIPALES_MAX_ENTRADAS = int(os.environ.get("PRINCIPALES_MAX_ENTRADAS", 10000))
+
+    # Máximo de postulaciones por petición en el cambio de estado masivo
+    POSTULACIONES_LOTE_MAXIMO = int(os.environ.get("POSTULACIONES_LOTE_MAXIMO", 500))
+
+    # Máximo de vacantes por consulta en la verificación de postulaciones en lote
+    VERIFICAR_POSTULACIONES_MAXIMO = int(
+        os.environ.get("VERIFICAR_POSTULACIONES_MAXIMO", 100)
+    )
+
     # Configuración de Flask-Mail (Mailtrap para desarrollo)
     MAIL_SERVER = os.environ.get("MAIL_SERVER", "sandbox.smtp.mailtrap.io")
     MAIL_PORT = int(os.environ.get("MAIL_PORT", 2525))
@@ -41,6 +131,39 @@ class Config:
     MAIL_MAX_EMAILS = None
     MAIL_ASCII_ATTACHMENTS = False
 
+    # Worker de la bandeja de salida de correos (flask enviar-correos)
+    CORREOS_HILOS = int(os.environ.get("CORREOS_HILOS", 4))
+    CORREOS_LOTE = int(os.environ.get("CORREOS_LOTE", 100))
+    CORREOS_INTERVALO_SEGUNDOS = int(os.environ.get("CORREOS_INTERVALO_SEGUNDOS", 5))
+    CORREOS_MAX_INTENTOS = int(os.environ.get("CORREOS_MAX_INTENTOS", 5))
+    CORREOS_REINTENTO_BASE_SEGUNDOS = int(
+        os.environ.get("CORREOS_REINTENTO_BASE_SEGUNDOS", 30)
+    )
+    CORREOS_REINTENTO_MAXIMO_SEGUNDOS = int(
+        os.environ.get("CORREOS_REINTENTO_MAXIMO_SEGUNDOS", 3600)
+    )
+    # Si un worker muere con correos reclamados, otro los retoma tras este plazo
+    CORREOS_BLOQUEO_SEGUNDOS = int(os.environ.get("CORREOS_BLOQUEO_SEGUNDOS", 300))
+
+    # Resumen de cambios de estado por destinatario: un correo con todos los
+    # cambios acumulados cuando el más antiguo cumple la ventana
+    CORREOS_DIGEST = os.environ.get("CORREOS_DIGEST", "True") == "True"
+    CORREOS_DIGEST_VENTANA_SEGUNDOS = int(
+        os.environ.get("CORREOS_DIGEST_VENTANA_SEGUNDOS", 600)
+    )
+
+    # Conexiones SMTP persistentes del worker de correos (utils/smtp.py)
+    SMTP_POOL_TAMANO = int(os.environ.get("SMTP_POOL_TAMANO", 4))
+    SMTP_TIMEOUT_SEGUNDOS = int(os.environ.get("SMTP_TIMEOUT_SEGUNDOS", 10))
+    # Inactividad tras la cual se verifica con NOOP antes de reutilizar
+    SMTP_VERIFICAR_SEGUNDOS = int(os.environ.get("SMTP_VERIFICAR_SEGUNDOS", 30))
+    # Inactividad tras la cual se descarta sin verificar
+    SMTP_MAX_INACTIVIDAD_SEGUNDOS = int(
+        os.environ.get("SMTP_MAX_INACTIVIDAD_SEGUNDOS", 240)
+    )
+    SMTP_CIRCUITO_FALLOS = int(os.environ.get("SMTP_CIRCUITO_FALLOS", 5))
+    SMTP_CIRCUITO_SEGUNDOS = int(os.environ.get("SMTP_CIRCUITO_SEGUNDOS", 60))
+
     # Configuración de Stripe
     STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "")
     STRIPE_PUBLISHABLE_KEY = os.environ.get("STRIPE_PUBLISHABLE_KEY", "")
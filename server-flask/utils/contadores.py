@@ -0,0 +1,129 @@
+"""
+Contadores de postulaciones por vacante (columnas de VACANTE).
+
+Las rutas que crean, cancelan o cambian el estado de una postulación
+ajustan los contadores con un UPDATE relativo (col = col + 1) dentro de su
+transacción, así dos peticiones simultáneas no se pisan. Si algo los
+descuadra, recalcular_contadores los rehace desde POSTULACION con una sola
+consulta agrupada (comando recalcular-contadores).
+"""
+
+from sqlalchemy.orm.util import identity_key
+from utils.db import db
+from models.modelo_vacante import Vacante
+from models.modelo_postulacion import Postulacion
+
+# Estado de la postulación -> columna de VACANTE que lo cuenta
+COLUMNAS_ESTADO = {
+    "pendiente": "postulaciones_pendientes",
+    "aceptada": "postulaciones_aceptadas",
+    "rechazada": "postulaciones_rechazadas",
+}
+
+
+def _ajustar(id_vac, cambios):
+    """Suma los deltas de `cambios` (columna -> delta) de forma atómica"""
+    cambios = {columna: delta for columna, delta in cambios.items() if delta}
+    if not cambios:
+        return
+    db.session.execute(
+        db.update(Vacante)
+        .where(Vacante.id_vac == id_vac)
+        .values({c: getattr(Vacante, c) + d for c, d in cambios.items()})
+        .execution_options(synchronize_session=False)
+    )
+    # Si la vacante ya está cargada en la sesión, se vuelve a leer de la base
+    vacante = db.session.identity_map.get(identity_key(Vacante, id_vac))
+    if vacante is not None:
+        db.session.expire(vacante, list(cambios))
+
+
+def _columna(estado):
+    return COLUMNAS_ESTADO.get((estado or "").lower())
+
+
+def contar_postulacion(id_vac, estado="pendiente"):
+    cambios = {"total_postulaciones": 1}
+    if _columna(estado):
+        cambios[_columna(estado)] = 1
+    _ajustar(id_vac, cambios)
+
+
+def descontar_postulacion(id_vac, estado):
+    cambios = {"total_postulaciones": -1}
+    if _columna(estado):
+        cambios[_columna(estado)] = -1
+    _ajustar(id_vac, cambios)
+
+
+def cambiar_estado_contadores(id_vac, anterior, nuevo):
+    if _columna(anterior) == _columna(nuevo):
+        return
+    cambios = {}
+    if _columna(anterior):
+        cambios[_columna(anterior)] = -1
+    if _columna(nuevo):
+        cambios[_columna(nuevo)] = 1
+    _ajustar(id_vac, cambios)
+
+
+def cambiar_estados_contadores(transiciones):
+    """
+    Aplica varios cambios de estado (id_vac, anterior, nuevo) con un UPDATE
+    por vacante en lugar de uno por postulación
+    """
+    deltas = {}
+    for id_vac, anterior, nuevo in transiciones:
+        if _columna(anterior) == _columna(nuevo):
+            continue
+        cambios = deltas.setdefault(id_vac, {})
+        if _columna(anterior):
+            cambios[_columna(anterior)] = cambios.get(_columna(anterior), 0) - 1
+        if _columna(nuevo):
+            cambios[_columna(nuevo)] = cambios.get(_columna(nuevo), 0) + 1
+    for id_vac, cambios in deltas.items():
+        _ajustar(id_vac, cambios)
+
+
+def recalcular_contadores(ids_vac=None):
+    """
+    Rehace los contadores desde POSTULACION con una consulta agrupada.
+    Sin `ids_vac` recalcula todas las vacantes. No confirma la transacción.
+    """
+    conteos = db.session.query(
+        Postulacion.id_vac,
+        db.func.lower(Postulacion.estado_post),
+        db.func.count(Postulacion.id_post),
+    ).group_by(Postulacion.id_vac, db.func.lower(Postulacion.estado_post))
+    vacantes = db.session.query(Vacante.id_vac)
+    if ids_vac is not None:
+        ids_vac = list(ids_vac)
+        if not ids_vac:
+            return 0
+        conteos = conteos.filter(Postulacion.id_vac.in_(ids_vac))
+        vacantes = vacantes.filter(Vacante.id_vac.in_(ids_vac))
+
+    filas = {
+        fila[0]: {
+            "id_vac": fila[0],
+            "total_postulaciones": 0,
+            **{columna: 0 for columna in COLUMNAS_ESTADO.values()},
+        }
+        for fila in vacantes
+    }
+    for id_vac, estado, total in conteos:
+        fila = filas.get(id_vac)
+        if fila is None:
+            continue
+        fila["total_postulaciones"] += total
+        if estado in COLUMNAS_ESTADO:
+            fila[COLUMNAS_ESTADO[estado]] += total
+
+    if filas:
+        # UPDATE por clave primaria en lote (executemany)
+        db.session.execute(db.update(Vacante), list(filas.values()))
+        for id_vac in filas:
+            vacante = db.session.identity_map.get(identity_key(Vacante, id_vac))
+            if vacante is not None:
+                db.session.expire(vacante)
+    return len(filas)
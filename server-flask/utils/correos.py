@@ -0,0 +1,194 @@
+"""
+Bandeja de salida de correos (outbox).
+
+Las rutas no hablan con el servidor SMTP: encolar_mensaje inserta el correo
+en CORREO_SALIENTE dentro de la misma transacción que el cambio que lo
+origina, así un correo solo existe si el cambio se confirmó y la latencia
+del SMTP no llega a la respuesta.
+
+El comando `flask enviar-correos` drena la tabla: reclama un lote de
+pendientes, lo reparte en un pool acotado de hilos (cada hilo envía su parte
+por una conexión persistente de utils/smtp.PoolSMTP) y registra el
+resultado de cada correo. Los fallidos se reintentan con espera exponencial
+hasta CORREOS_MAX_INTENTOS.
+Al reclamar un correo se aplaza su próximo intento CORREOS_BLOQUEO_SEGUNDOS,
+de modo que si el worker muere a mitad del envío otro lo retoma después.
+
+Para probarlo en local basta un servidor SMTP de prueba:
+    python -m aiosmtpd -n -l localhost:1025
+    MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=False flask enviar-correos
+"""
+
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_mail import Message
+from utils.db import db
+from utils.smtp import obtener_pool, es_error_de_conexion
+from models.modelo_correo_saliente import CorreoSaliente
+
+logger = logging.getLogger(__name__)
+
+
+def encolar_correo(destinatario, asunto, html, remitente=None):
+    """Agrega el correo a la bandeja de salida (se confirma con la ruta)"""
+    correo = CorreoSaliente(
+        id_correo=str(uuid.uuid4()),
+        destinatario=destinatario,
+        remitente=remitente,
+        asunto=asunto,
+        html=html,
+        estado="pendiente",
+        intentos=0,
+        proximo_intento=datetime.utcnow(),
+    )
+    db.session.add(correo)
+    return correo
+
+
+def encolar_mensaje(mensaje):
+    """Encola un flask_mail.Message, un correo por destinatario"""
+    for destinatario in mensaje.recipients:
+        encolar_correo(destinatario, mensaje.subject, mensaje.html, mensaje.sender)
+
+
+def espera_reintento(intentos):
+    """Segundos hasta el siguiente intento tras `intentos` fallidos"""
+    base = current_app.config["CORREOS_REINTENTO_BASE_SEGUNDOS"]
+    maximo = current_app.config["CORREOS_REINTENTO_MAXIMO_SEGUNDOS"]
+    return min(base * 2 ** (intentos - 1), maximo)
+
+
+def reclamar_lote(tamano):
+    """
+    Marca como "enviando" hasta `tamano` correos vencidos y los devuelve como
+    diccionarios (los hilos de envío no usan la sesión). Confirma la
+    transacción.
+    """
+    ahora = datetime.utcnow()
+    consulta = (
+        db.session.query(CorreoSaliente)
+        .filter(
+            CorreoSaliente.estado.in_(["pendiente", "enviando"]),
+            CorreoSaliente.proximo_intento <= ahora,
+        )
+        .order_by(CorreoSaliente.proximo_intento)
+        .limit(tamano)
+    )
+    # Varios workers pueden drenar la tabla sin tomar los mismos correos
+    if db.engine.dialect.name == "mysql":
+        consulta = consulta.with_for_update(skip_locked=True)
+
+    bloqueo = ahora + timedelta(seconds=current_app.config["CORREOS_BLOQUEO_SEGUNDOS"])
+    lote = []
+    for correo in consulta.all():
+        correo.estado = "enviando"
+        correo.intentos += 1
+        correo.proximo_intento = bloqueo
+        lote.append(
+            {
+                "id_correo": correo.id_correo,
+                "destinatario": correo.destinatario,
+                "remitente": correo.remitente,
+                "asunto": correo.asunto,
+                "html": correo.html,
+                "intentos": correo.intentos,
+            }
+        )
+    db.session.commit()
+    return lote
+
+
+def _enviar_grupo(app, correos):
+    """
+    Envía los correos por una conexión del pool SMTP; devuelve
+    [(id_correo, error)]
+    """
+    resultados = []
+    with app.app_context():
+        try:
+            with obtener_pool(app).conexion() as conexion:
+                for correo in correos:
+                    try:
+                        conexion.send(
+                            Message(
+                                subject=correo["asunto"],
+                                recipients=[correo["destinatario"]],
+                                html=correo["html"],
+                                sender=correo["remitente"],
+                            )
+                        )
+                        resultados.append((correo["id_correo"], None))
+                    except Exception as e:
+                        # Si se cayó la conexión, el pool la descarta
+                        if es_error_de_conexion(e):
+                            raise
+                        resultados.append((correo["id_correo"], str(e)))
+        except Exception as e:
+            # Sin conexión o circuito abierto: falla el resto del grupo
+            enviados = {id_correo for id_correo, _ in resultados}
+            resultados.extend(
+                (correo["id_correo"], str(e))
+                for correo in correos
+                if correo["id_correo"] not in enviados
+            )
+    return resultados
+
+
+def registrar_resultados(lote, resultados):
+    """Guarda el estado de entrega de cada correo. Confirma la transacción."""
+    ahora = datetime.utcnow()
+    intentos = {correo["id_correo"]: correo["intentos"] for correo in lote}
+    maximo = current_app.config["CORREOS_MAX_INTENTOS"]
+    enviados = fallidos = 0
+    for id_correo, error in resultados:
+        if error is None:
+            valores = {"estado": "enviado", "fecha_envio": ahora, "ultimo_error": None}
+            enviados += 1
+        elif intentos[id_correo] >= maximo:
+            valores = {"estado": "fallido", "ultimo_error": error}
+            fallidos += 1
+        else:
+            valores = {
+                "estado": "pendiente",
+                "ultimo_error": error,
+                "proximo_intento": ahora
+                + timedelta(seconds=espera_reintento(intentos[id_correo])),
+            }
+            fallidos += 1
+        db.session.query(CorreoSaliente).filter_by(id_correo=id_correo).update(
+            valores, synchronize_session=False
+        )
+    db.session.commit()
+    return enviados, fallidos
+
+
+def procesar_correos(pool, hilos, tamano_lote):
+    """
+    Reclama un lote, lo envía repartido entre `hilos` conexiones del pool y
+    registra los resultados. Devuelve (enviados, fallidos).
+    """
+    app = current_app._get_current_object()
+    # Con el relay caído no se reclaman correos ni se gastan sus intentos
+    if obtener_pool(app).interruptor.abierto():
+        return 0, 0
+
+    lote = reclamar_lote(tamano_lote)
+    if not lote:
+        return 0, 0
+
+    grupos = [lote[i::hilos] for i in range(hilos) if lote[i::hilos]]
+    resultados = []
+    for parcial in pool.map(lambda grupo: _enviar_grupo(app, grupo), grupos):
+        resultados.extend(parcial)
+
+    for id_correo, error in resultados:
+        if error is not None:
+            logger.warning(f"Error al enviar correo {id_correo}: {error}")
+    return registrar_resultados(lote, resultados)
+
+
+def crear_pool(hilos):
+    return ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="correos")
@@ -1,4 +1,32 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import logging
 
+logger = logging.getLogger(__name__)
 
 db = SQLAlchemy()
+
+
+def al_confirmar(funcion):
+    """
+    Registra una función que se ejecuta solo si la transacción actual se
+    confirma (commit). Si la transacción se revierte, la función se descarta.
+    Las funciones no deben ejecutar SQL: reciben los datos ya capturados.
+    """
+    db.session.info.setdefault("al_confirmar", []).append(funcion)
+
+
+@event.listens_for(Session, "after_commit")
+def _ejecutar_al_confirmar(session):
+    for funcion in session.info.pop("al_confirmar", []):
+        try:
+            funcion()
+        except Exception as e:
+            # Un efecto secundario fallido no debe romper la respuesta ya confirmada
+            logger.error(f"Error en tarea posterior al commit: {str(e)}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_al_confirmar(session):
+    session.info.pop("al_confirmar", None)
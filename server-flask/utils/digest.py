@@ -0,0 +1,183 @@
+"""
+Resumen (digest) por correo de los cambios de estado de postulaciones.
+
+Con CORREOS_DIGEST activo, las rutas no arman un correo por cada cambio:
+agregar_a_digest guarda el cambio en NOTIFICACION_PENDIENTE dentro de su
+transacción. despachar_digests (llamado en cada vuelta de
+`flask enviar-correos`) toma los destinatarios cuyo cambio más antiguo ya
+cumplió CORREOS_DIGEST_VENTANA_SEGUNDOS, arma un solo correo con todos sus
+cambios y lo deja en la bandeja de salida. Una revisión masiva de 200
+postulaciones de 20 freelancers produce 20 correos en lugar de 200.
+
+Las plantillas se compilan una vez al importar el módulo; cada correo solo
+las evalúa con sus datos.
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from jinja2 import Environment
+from utils.db import db
+from utils.correos import encolar_correo
+from models.modelo_notificacion_pendiente import NotificacionPendiente
+from models.modelo_usuarios import Usuario
+
+_entorno = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+ASUNTO_UNO = _entorno.from_string(
+    "{% if cambio.estado == 'aceptada' %}"
+    "¡Felicidades! Tu postulación fue aceptada - {{ cambio.vacante }}"
+    "{% else %}"
+    "Actualización sobre tu postulación - {{ cambio.vacante }}"
+    "{% endif %}"
+)
+ASUNTO_VARIOS = _entorno.from_string(
+    "Tienes {{ cambios | length }} actualizaciones en tus postulaciones"
+)
+CUERPO = _entorno.from_string("""<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #16a085 0%, #16685a 100%);
+                  color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .vacancy-info { background: white; padding: 20px; border-radius: 10px;
+                        margin: 20px 0; border-left: 4px solid #7f8c8d; }
+        .vacancy-info.aceptada { border-left-color: #27ae60; }
+        .badge { color: white; padding: 5px 15px; border-radius: 20px;
+                 display: inline-block; background: #7f8c8d; }
+        .badge.aceptada { background: #27ae60; }
+        .footer { text-align: center; margin-top: 30px; color: #777; font-size: 14px; }
+        .button { background: #16a085; color: white; padding: 12px 30px;
+                  text-decoration: none; border-radius: 5px; display: inline-block;
+                  margin: 20px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Actualización de tus postulaciones</h1>
+        </div>
+        <div class="content">
+            <p>Hola {{ nombre }},</p>
+            <p>Estas son las novedades de tus postulaciones:</p>
+{% for cambio in cambios %}
+            <div class="vacancy-info {{ cambio.estado }}">
+                <h3>📋 {{ cambio.vacante }}</h3>
+{% if cambio.estado == 'aceptada' %}
+                <span class="badge aceptada">✓ Postulación Aceptada</span>
+                <p>La empresa se pondrá en contacto contigo pronto con los siguientes pasos.</p>
+{% else %}
+                <span class="badge">Postulación no seleccionada</span>
+                <p>En esta ocasión la empresa decidió continuar con otros candidatos.</p>
+{% endif %}
+                <p><strong>Descripción:</strong> {{ cambio.descripcion }}</p>
+{% if cambio.salario %}
+                <p><strong>Salario:</strong> ${{ "{:,.0f}".format(cambio.salario) }}</p>
+{% endif %}
+            </div>
+{% endfor %}
+            <a href="http://localhost:5173/freelance-dashboard" class="button">
+                Ver Mis Postulaciones
+            </a>
+        </div>
+        <div class="footer">
+            <p>FreeBridge - Conectando talento con oportunidades</p>
+            <p>Este es un correo automático, por favor no respondas a este mensaje.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+
+def agregar_a_digest(usuario, vacante, postulacion, estado):
+    """Guarda el cambio para el próximo resumen del usuario (sin confirmar)"""
+    db.session.add(
+        NotificacionPendiente(
+            id_notif=str(uuid.uuid4()),
+            id_usu=usuario.id_usu,
+            id_post=postulacion.id_post,
+            datos=json.dumps(
+                {
+                    "estado": estado,
+                    "vacante": vacante.nomb_vacante,
+                    "descripcion": vacante.descripcion,
+                    "salario": float(vacante.salario) if vacante.salario else None,
+                },
+                ensure_ascii=False,
+            ),
+            fecha_creacion=datetime.utcnow(),
+        )
+    )
+
+
+def renderizar_digest(nombre, cambios):
+    """Devuelve (asunto, html) del resumen"""
+    if len(cambios) == 1:
+        asunto = ASUNTO_UNO.render(cambio=cambios[0])
+    else:
+        asunto = ASUNTO_VARIOS.render(cambios=cambios)
+    return asunto, CUERPO.render(nombre=nombre, cambios=cambios)
+
+
+def despachar_digests(limite=500):
+    """
+    Convierte en correos de la bandeja de salida los resúmenes cuya ventana
+    se cumplió, hasta `limite` destinatarios. Devuelve (correos, cambios).
+    """
+    ventana = current_app.config["CORREOS_DIGEST_VENTANA_SEGUNDOS"]
+    corte = datetime.utcnow() - timedelta(seconds=ventana)
+
+    vencidos = (
+        db.session.query(NotificacionPendiente.id_usu)
+        .group_by(NotificacionPendiente.id_usu)
+        .having(db.func.min(NotificacionPendiente.fecha_creacion) <= corte)
+        .limit(limite)
+        .subquery()
+    )
+    filas = (
+        db.session.query(
+            NotificacionPendiente.id_notif,
+            NotificacionPendiente.id_post,
+            NotificacionPendiente.datos,
+            Usuario.id_usu,
+            Usuario.nombre,
+            Usuario.correo,
+        )
+        .join(Usuario, NotificacionPendiente.id_usu == Usuario.id_usu)
+        .filter(NotificacionPendiente.id_usu.in_(db.select(vencidos.c.id_usu)))
+        .order_by(NotificacionPendiente.id_usu, NotificacionPendiente.fecha_creacion)
+        .all()
+    )
+    if not filas:
+        return 0, 0
+
+    destinatarios = {}
+    for id_notif, id_post, datos, id_usu, nombre, correo in filas:
+        destinatario = destinatarios.setdefault(
+            id_usu, {"nombre": nombre, "correo": correo, "cambios": {}}
+        )
+        # Si la misma postulación cambió varias veces, solo cuenta la última
+        destinatario["cambios"][id_post] = json.loads(datos)
+
+    for destinatario in destinatarios.values():
+        cambios = list(destinatario["cambios"].values())
+        asunto, html = renderizar_digest(destinatario["nombre"], cambios)
+        encolar_correo(destinatario["correo"], asunto, html)
+
+    # Si otro worker ya despachó alguno, se descarta esta vuelta completa
+    ids = [fila[0] for fila in filas]
+    borradas = (
+        db.session.query(NotificacionPendiente)
+        .filter(NotificacionPendiente.id_notif.in_(ids))
+        .delete(synchronize_session=False)
+    )
+    if borradas != len(ids):
+        db.session.rollback()
+        return 0, 0
+    db.session.commit()
+    return len(destinatarios), len(ids)
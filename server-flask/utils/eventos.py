@@ -0,0 +1,123 @@
+"""
+Canal de eventos en tiempo real (Server-Sent Events).
+
+Las rutas de escritura publican eventos para un usuario con
+publicar_al_confirmar; el evento solo sale si la transacción se confirma.
+CentroEventos reparte cada evento a las conexiones SSE abiertas de ese
+usuario en este proceso, cada una con su propia cola acotada.
+
+Cada conexión SSE queda abierta indefinidamente, así que con workers
+síncronos ocuparía un hilo por cliente. En producción se debe servir con
+workers cooperativos (gunicorn -k gevent), donde miles de conexiones
+inactivas cuestan unos pocos KB cada una; el centro usa threading y queue,
+que gevent convierte en primitivas cooperativas con monkey patching.
+
+El centro es local al proceso: con varios workers o nodos, un evento solo
+llega a las conexiones del proceso que lo publicó. Por eso los eventos no
+llevan cursor y son solo un aviso adelantado: los clientes siguen
+consultando periódicamente (y al reconectarse) los endpoints de
+notificaciones, que avanzan el cursor con lo confirmado en cualquier worker.
+Para repartirlos entre procesos basta con reemplazar CentroEventos.publicar
+por un bus compartido (por ejemplo Redis pub/sub) que termine llamando a
+_entregar en cada uno.
+"""
+
+import itertools
+import json
+import queue
+import threading
+import time
+from utils.db import al_confirmar
+
+
+class Suscripcion:
+    """Una conexión SSE abierta"""
+
+    def __init__(self, id_usu, capacidad):
+        self.id_usu = id_usu
+        self.cola = queue.Queue(maxsize=capacidad)
+        self.activa = True
+
+
+class CentroEventos:
+    """Reparto en memoria de eventos por usuario"""
+
+    def __init__(self, capacidad_cola=100):
+        self._lock = threading.Lock()
+        self._suscripciones = {}  # id_usu -> {Suscripcion}
+        self._capacidad_cola = capacidad_cola
+        self._secuencia = itertools.count(1)
+
+    def suscribir(self, id_usu):
+        suscripcion = Suscripcion(id_usu, self._capacidad_cola)
+        with self._lock:
+            self._suscripciones.setdefault(id_usu, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        suscripcion.activa = False
+        with self._lock:
+            suscripciones = self._suscripciones.get(suscripcion.id_usu)
+            if suscripciones is not None:
+                suscripciones.discard(suscripcion)
+                if not suscripciones:
+                    del self._suscripciones[suscripcion.id_usu]
+
+    def conexiones(self):
+        with self._lock:
+            return sum(len(s) for s in self._suscripciones.values())
+
+    def publicar(self, id_usu, evento, datos):
+        self._entregar(id_usu, (next(self._secuencia), evento, datos))
+
+    def _entregar(self, id_usu, mensaje):
+        with self._lock:
+            suscripciones = list(self._suscripciones.get(id_usu, ()))
+        for suscripcion in suscripciones:
+            try:
+                suscripcion.cola.put_nowait(mensaje)
+            except queue.Full:
+                # Cliente que no consume: se cierra y recupera al reconectar
+                self.cancelar(suscripcion)
+
+
+centro_eventos = CentroEventos()
+
+
+def publicar_al_confirmar(id_usu, evento, datos):
+    """Publica el evento para el usuario cuando la transacción se confirme"""
+    al_confirmar(lambda: centro_eventos.publicar(id_usu, evento, datos))
+
+
+def flujo_sse(suscripcion, intervalo_latido, reintento_ms=5000, vigente=None):
+    """
+    Generador del cuerpo text/event-stream de una suscripción. Envía un
+    comentario de latido cada `intervalo_latido` segundos sin eventos, lo
+    que además detecta clientes desconectados. Con la misma frecuencia
+    llama a `vigente()`; si devuelve False (token expirado o sesión
+    revocada) cierra el canal y el cliente debe reconectar con otro token.
+    """
+    try:
+        yield f"retry: {reintento_ms}\n\n"
+        ultimo_control = time.monotonic()
+        while suscripcion.activa:
+            if vigente is not None and (
+                time.monotonic() - ultimo_control >= intervalo_latido
+            ):
+                if not vigente():
+                    return
+                ultimo_control = time.monotonic()
+            try:
+                id_evento, evento, datos = suscripcion.cola.get(
+                    timeout=intervalo_latido
+                )
+            except queue.Empty:
+                yield ": latido\n\n"
+                continue
+            yield (
+                f"id: {id_evento}\n"
+                f"event: {evento}\n"
+                f"data: {json.dumps(datos, ensure_ascii=False)}\n\n"
+            )
+    finally:
+        centro_eventos.cancelar(suscripcion)
@@ -0,0 +1,210 @@
+"""
+Filtros y conteos por faceta del feed de vacantes.
+
+Trabaja sobre el modelo de lectura TARJETA_VACANTE, que ya trae las
+columnas de la empresa, así que ni el filtrado ni el conteo necesitan joins.
+Los conteos salen de una sola consulta agregada agrupada por las columnas
+de faceta (duración, tamaño y ciudad de la empresa, rango de salario). El
+resultado tiene tantas filas como combinaciones distintas existan, no
+tantas como vacantes, y con él se calculan en Python los conteos de cada
+faceta aplicando los filtros de las demás (conteo disyuntivo), que es lo
+que necesita la interfaz para mostrar cuántos resultados daría cada chip.
+"""
+
+from datetime import date, datetime, timedelta
+from utils.db import db
+from models.modelo_tarjeta_vacante import TarjetaVacante
+
+# Rangos de salario (COP) para la faceta de salario: (etiqueta, mínimo, máximo)
+RANGOS_SALARIO = [
+    ("0-1000000", 0, 1_000_000),
+    ("1000000-3000000", 1_000_000, 3_000_000),
+    ("3000000-6000000", 3_000_000, 6_000_000),
+    ("6000000+", 6_000_000, None),
+]
+SIN_SALARIO = "sin_especificar"
+
+FACETAS = ("duracion_proyecto", "tamaño", "ciudad", "salario")
+
+
+def _fecha(valor, nombre):
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        raise ValueError(f"El parámetro {nombre} debe ser una fecha ISO (AAAA-MM-DD)")
+
+
+def _solo_fecha(valor):
+    """True si el valor es una fecha sin hora (AAAA-MM-DD)"""
+    try:
+        date.fromisoformat(valor)
+        return True
+    except ValueError:
+        return False
+
+
+def _numero(valor, nombre):
+    try:
+        return float(valor)
+    except ValueError:
+        raise ValueError(f"El parámetro {nombre} debe ser numérico")
+
+
+def leer_filtros(args):
+    """Lee los filtros de la URL. Lanza ValueError si alguno es inválido"""
+    filtros = {
+        "duracion_proyecto": args.getlist("duracion"),
+        "tamaño": args.getlist("tamaño") or args.getlist("tamano"),
+        "ciudad": args.getlist("ciudad"),
+        "salario_min": None,
+        "salario_max": None,
+        "desde": None,
+        "hasta": None,
+        "antes_de": None,
+    }
+    if args.get("salario_min"):
+        filtros["salario_min"] = _numero(args["salario_min"], "salario_min")
+    if args.get("salario_max"):
+        filtros["salario_max"] = _numero(args["salario_max"], "salario_max")
+    if args.get("publicada_desde"):
+        filtros["desde"] = _fecha(args["publicada_desde"], "publicada_desde")
+    if args.get("publicada_hasta"):
+        hasta = _fecha(args["publicada_hasta"], "publicada_hasta")
+        if _solo_fecha(args["publicada_hasta"]):
+            # Una fecha sin hora incluye todo ese día
+            filtros["antes_de"] = hasta + timedelta(days=1)
+        else:
+            filtros["hasta"] = hasta
+    return filtros
+
+
+def _condicion_salario(filtros):
+    condiciones = []
+    if filtros["salario_min"] is not None:
+        condiciones.append(TarjetaVacante.salario >= filtros["salario_min"])
+    if filtros["salario_max"] is not None:
+        condiciones.append(TarjetaVacante.salario <= filtros["salario_max"])
+    return db.and_(*condiciones) if condiciones else None
+
+
+def _condiciones_base(estado, filtros):
+    """Filtros que no son faceta: estado y ventana de publicación"""
+    condiciones = [TarjetaVacante.estado_vac == estado]
+    if filtros["desde"] is not None:
+        condiciones.append(TarjetaVacante.fecha_publicacion >= filtros["desde"])
+    if filtros["hasta"] is not None:
+        condiciones.append(TarjetaVacante.fecha_publicacion <= filtros["hasta"])
+    if filtros["antes_de"] is not None:
+        condiciones.append(TarjetaVacante.fecha_publicacion < filtros["antes_de"])
+    return condiciones
+
+
+def aplicar_filtros(consulta, estado, filtros):
+    """Aplica todos los filtros a una consulta sobre TarjetaVacante"""
+    consulta = consulta.filter(*_condiciones_base(estado, filtros))
+    if filtros["duracion_proyecto"]:
+        consulta = consulta.filter(
+            TarjetaVacante.duracion_proyecto.in_(filtros["duracion_proyecto"])
+        )
+    salario = _condicion_salario(filtros)
+    if salario is not None:
+        consulta = consulta.filter(salario)
+    if filtros["tamaño"]:
+        consulta = consulta.filter(TarjetaVacante.tamaño_emp.in_(filtros["tamaño"]))
+    if filtros["ciudad"]:
+        consulta = consulta.filter(TarjetaVacante.id_ciud_emp.in_(filtros["ciudad"]))
+    return consulta
+
+
+def _rango_salario():
+    casos = [(TarjetaVacante.salario.is_(None), SIN_SALARIO)]
+    for etiqueta, minimo, maximo in RANGOS_SALARIO:
+        if maximo is None:
+            casos.append((TarjetaVacante.salario >= minimo, etiqueta))
+        else:
+            casos.append((TarjetaVacante.salario < maximo, etiqueta))
+    return db.case(*casos)
+
+
+def contar_facetas(estado, filtros):
+    """Conteos por faceta con una sola consulta agregada"""
+    condicion_salario = _condicion_salario(filtros)
+    en_rango = (
+        db.case((condicion_salario, 1), else_=0)
+        if condicion_salario is not None
+        else db.literal(1)
+    )
+    rango = _rango_salario().label("rango")
+    en_rango = en_rango.label("en_rango")
+
+    combinaciones = (
+        db.session.query(
+            TarjetaVacante.duracion_proyecto,
+            TarjetaVacante.tamaño_emp,
+            TarjetaVacante.id_ciud_emp,
+            TarjetaVacante.nomb_ciud_emp,
+            rango,
+            en_rango,
+            db.func.count().label("total"),
+        )
+        .filter(*_condiciones_base(estado, filtros))
+        .group_by(
+            TarjetaVacante.duracion_proyecto,
+            TarjetaVacante.tamaño_emp,
+            TarjetaVacante.id_ciud_emp,
+            TarjetaVacante.nomb_ciud_emp,
+            rango,
+            en_rango,
+        )
+        .all()
+    )
+
+    activos = {
+        "duracion_proyecto": set(filtros["duracion_proyecto"]),
+        "tamaño": set(filtros["tamaño"]),
+        "ciudad": set(filtros["ciudad"]),
+    }
+
+    def cumple(fila, excepto):
+        valores = {
+            "duracion_proyecto": fila[0],
+            "tamaño": fila[1],
+            "ciudad": fila[2],
+        }
+        for faceta, seleccion in activos.items():
+            if faceta != excepto and seleccion and valores[faceta] not in seleccion:
+                return False
+        return excepto == "salario" or bool(fila[5])
+
+    conteos = {faceta: {} for faceta in FACETAS}
+    nombres_ciudad = {}
+    for fila in combinaciones:
+        duracion, tamaño, id_ciud, nomb_ciud, rango_fila, _, total = fila
+        nombres_ciudad[id_ciud] = nomb_ciud
+        for faceta, valor in (
+            ("duracion_proyecto", duracion),
+            ("tamaño", tamaño),
+            ("ciudad", id_ciud),
+            ("salario", rango_fila),
+        ):
+            if cumple(fila, faceta):
+                conteos[faceta][valor] = conteos[faceta].get(valor, 0) + total
+
+    def ordenar(valores):
+        return sorted(valores.items(), key=lambda par: (-par[1], str(par[0])))
+
+    return {
+        "duracion_proyecto": [
+            {"valor": v, "total": n} for v, n in ordenar(conteos["duracion_proyecto"])
+        ],
+        "tamaño": [{"valor": v, "total": n} for v, n in ordenar(conteos["tamaño"])],
+        "ciudad": [
+            {"valor": v, "nombre": nombres_ciudad.get(v), "total": n}
+            for v, n in ordenar(conteos["ciudad"])
+        ],
+        "salario": [
+            {"valor": etiqueta, "total": conteos["salario"][etiqueta]}
+            for etiqueta in [r[0] for r in RANGOS_SALARIO] + [SIN_SALARIO]
+            if etiqueta in conteos["salario"]
+        ],
+    }
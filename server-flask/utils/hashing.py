@@ -0,0 +1,110 @@
+"""
+Hash de contraseñas fuera del hilo de la petición.
+
+generate_password_hash y check_password_hash son lentos a propósito (scrypt
+o pbkdf2). Ejecutarlos en el hilo de la petición deja a un worker síncrono
+ocupado decenas de milisegundos por login; en una ráfaga de logins los
+workers se saturan y el resto de endpoints espera detrás.
+
+EjecutorHash los envía a un pool acotado de procesos (HASH_PROCESOS), que
+no comparten el GIL con los hilos de Flask. Como mucho admite
+HASH_PENDIENTES_MAXIMO trabajos en curso o en cola; si no hay cupo en
+HASH_ESPERA_SEGUNDOS lanza HashOcupado y la ruta responde 503 en lugar de
+acumular logins que ya nadie espera. Con HASH_PROCESOS=0 se calcula en el
+mismo hilo (desarrollo y pruebas).
+
+La política de hash es HASH_METODO, en el formato de werkzeug
+("scrypt:32768:8:1", "pbkdf2:sha256:600000"). necesita_rehash() indica si
+un hash guardado se hizo con otros parámetros; login lo vuelve a calcular
+con la contraseña recién verificada, así subir el costo no obliga a nadie a
+cambiar su contraseña.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashOcupado(Exception):
+    """No hay cupo en el pool de hash dentro del tiempo de espera"""
+
+
+class EjecutorHash:
+    def __init__(self, procesos, pendientes_maximo, espera):
+        self._procesos = procesos
+        self._espera = espera
+        self._cupos = threading.BoundedSemaphore(pendientes_maximo)
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _obtener_pool(self):
+        with self._lock:
+            # Tras un fork (gunicorn) el pool del padre no sirve en el hijo
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._procesos,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def ejecutar(self, funcion, *args):
+        if not self._procesos:
+            return funcion(*args)
+        if not self._cupos.acquire(timeout=self._espera):
+            raise HashOcupado("Demasiadas solicitudes de autenticación")
+        try:
+            return self._obtener_pool().submit(funcion, *args).result()
+        finally:
+            self._cupos.release()
+
+    def cerrar(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+_lock_ejecutor = threading.Lock()
+
+
+def obtener_ejecutor(app=None):
+    """Ejecutor de hash de la aplicación (uno por proceso)"""
+    app = app or current_app._get_current_object()
+    with _lock_ejecutor:
+        ejecutor = app.extensions.get("ejecutor_hash")
+        if ejecutor is None:
+            ejecutor = app.extensions["ejecutor_hash"] = EjecutorHash(
+                app.config["HASH_PROCESOS"],
+                app.config["HASH_PENDIENTES_MAXIMO"],
+                app.config["HASH_ESPERA_SEGUNDOS"],
+            )
+            atexit.register(ejecutor.cerrar)
+        return ejecutor
+
+
+def generar_hash(contraseña, metodo=None):
+    metodo = metodo or current_app.config["HASH_METODO"]
+    return obtener_ejecutor().ejecutar(generate_password_hash, contraseña, metodo)
+
+
+def verificar_hash(hash_guardado, contraseña):
+    return obtener_ejecutor().ejecutar(check_password_hash, hash_guardado, contraseña)
+
+
+@lru_cache(maxsize=8)
+def _prefijo(metodo):
+    # werkzeug completa los parámetros omitidos ("scrypt" -> "scrypt:32768:8:1")
+    return generate_password_hash("", metodo).split("$", 1)[0]
+
+
+def necesita_rehash(hash_guardado, metodo=None):
+    """True si el hash no se hizo con la política actual"""
+    metodo = metodo or current_app.config["HASH_METODO"]
+    return hash_guardado.split("$", 1)[0] != _prefijo(metodo)
@@ -0,0 +1,89 @@
+"""
+Historial de cambios de estado de postulaciones y marcas de lectura.
+"""
+
+import uuid
+from utils.db import db
+from utils.paginacion import ahora_al_segundo
+from models.modelo_freelancer import Freelancer
+from models.modelo_historial_postulacion import HistorialPostulacion
+from models.modelo_marca_lectura import MarcaLectura
+
+# Canal de la marca de lectura de los cambios de postulaciones del freelancer
+CANAL_CAMBIOS_POSTULACIONES = "cambios_postulaciones"
+
+
+def registrar_cambio_estado(postulacion, anterior, nuevo):
+    """
+    Agrega el cambio a la sesión (se confirma con la transacción de la ruta)
+    y lo devuelve, o None si el estado no cambió. La ruta debe numerar los
+    cambios con asignar_secuencias antes del commit
+    """
+    if (anterior or "").lower() == (nuevo or "").lower():
+        return None
+    cambio = HistorialPostulacion(
+        id_hist=str(uuid.uuid4()),
+        id_post=postulacion.id_post,
+        id_free=postulacion.id_free,
+        id_vac=postulacion.id_vac,
+        estado_anterior=anterior,
+        estado_nuevo=nuevo,
+        fecha_cambio=ahora_al_segundo(),
+    )
+    db.session.add(cambio)
+    return cambio
+
+
+def asignar_secuencias(cambios):
+    """
+    Numera los cambios con la secuencia de su freelancer
+    (FREELANCER.secuencia_cambios), un UPDATE por freelancer y una sola
+    lectura. Las filas de FREELANCER quedan bloqueadas hasta el commit, así
+    que los cambios de cada freelancer se confirman en orden de secuencia y
+    la marca de lectura no cubre ninguno que aún no se vio. Se bloquean en
+    orden de id_free para que dos lotes simultáneos no se traben.
+    """
+    por_freelancer = {}
+    for cambio in cambios:
+        por_freelancer.setdefault(cambio.id_free, []).append(cambio)
+    if not por_freelancer:
+        return
+
+    # Los cambios aún no tienen secuencia: no se pueden enviar a la base antes
+    with db.session.no_autoflush:
+        for id_free in sorted(por_freelancer):
+            db.session.execute(
+                db.update(Freelancer)
+                .where(Freelancer.id_free == id_free)
+                .values(
+                    secuencia_cambios=Freelancer.secuencia_cambios
+                    + len(por_freelancer[id_free])
+                )
+                .execution_options(synchronize_session=False)
+            )
+        ultimas = dict(
+            db.session.query(Freelancer.id_free, Freelancer.secuencia_cambios).filter(
+                Freelancer.id_free.in_(list(por_freelancer))
+            )
+        )
+        for id_free, lista in por_freelancer.items():
+            primera = ultimas[id_free] - len(lista) + 1
+            for desplazamiento, cambio in enumerate(lista):
+                cambio.secuencia = primera + desplazamiento
+
+
+def obtener_marca(id_usu, canal):
+    """Secuencia del último elemento visto, o None"""
+    marca = db.session.get(MarcaLectura, (id_usu, canal))
+    return marca.secuencia_vista if marca else None
+
+
+def guardar_marca(id_usu, canal, secuencia):
+    """Avanza la marca de lectura (nunca la retrocede). No confirma"""
+    marca = db.session.get(MarcaLectura, (id_usu, canal))
+    if marca is None:
+        db.session.add(
+            MarcaLectura(id_usu=id_usu, canal=canal, secuencia_vista=secuencia)
+        )
+    elif secuencia > marca.secuencia_vista:
+        marca.secuencia_vista = secuencia
@@ -0,0 +1,178 @@
+"""
+Límite de solicitudes por IP y por cuenta (token bucket).
+
+Login, registro y recuperación de contraseña no tenían freno: una ráfaga de
+credential stuffing ocupa el pool de hash (utils/hashing.py) y llena
+password_reset_tokens. limitar() decora la ruta y responde 429 con
+Retry-After antes de consultar la base o calcular un hash.
+
+Cada regla es "capacidad/segundos" (LIMITE_<NOMBRE>_IP, LIMITE_<NOMBRE>_CUENTA):
+se admiten ráfagas de hasta `capacidad` solicitudes y la cubeta se rellena
+a razón de capacidad/segundos. La cubeta se guarda como un solo número, el
+instante en que vuelve a estar llena (formulación GCRA del token bucket);
+una cubeta llena equivale a no tener entrada, así que solo ocupan memoria
+las claves que se usaron hace poco. Hay como mucho LIMITES_MAX_CLAVES por
+proceso.
+
+Por defecto cada worker lleva su propia cuenta (el límite efectivo se
+multiplica por el número de workers). Con LIMITES_REDIS_URL las cubetas se
+comparten en Redis con un script atómico; si Redis falla se usa la cuenta
+local en lugar de dejar pasar todo.
+"""
+
+import logging
+import math
+import threading
+import time
+from functools import lru_cache, wraps
+from flask import current_app, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=32)
+def _regla(texto):
+    """Convierte "5/60" en (capacidad, segundos por solicitud)"""
+    capacidad, segundos = texto.split("/")
+    capacidad = int(capacidad)
+    return capacidad, float(segundos) / capacidad
+
+
+class CubetasLocales:
+    def __init__(self, maximo):
+        self._maximo = maximo
+        self._llenas_en = {}  # clave -> instante (monotonic) en que se llena
+        self._lock = threading.Lock()
+
+    def consumir(self, clave, capacidad, intervalo):
+        """Segundos a esperar (0 si se admite la solicitud)"""
+        ahora = time.monotonic()
+        with self._lock:
+            llena_en = max(self._llenas_en.pop(clave, ahora), ahora)
+            nueva = llena_en + intervalo
+            espera = nueva - ahora - capacidad * intervalo
+            # Reinsertar deja el orden del dict de menos a más reciente
+            self._llenas_en[clave] = llena_en if espera > 0 else nueva
+            if len(self._llenas_en) > self._maximo:
+                self._podar(ahora)
+            return max(espera, 0.0)
+
+    def _podar(self, ahora):
+        self._llenas_en = {
+            clave: llena_en
+            for clave, llena_en in self._llenas_en.items()
+            if llena_en > ahora
+        }
+        # Si siguen sobrando, se olvidan las menos recientes (con margen para
+        # no recorrer el dict en cada solicitud)
+        while len(self._llenas_en) > self._maximo * 0.9:
+            del self._llenas_en[next(iter(self._llenas_en))]
+
+
+# Mismo cálculo que CubetasLocales.consumir, en milisegundos
+_SCRIPT_REDIS = """
+local ahora = tonumber(ARGV[1])
+local intervalo = tonumber(ARGV[2])
+local rafaga = tonumber(ARGV[3])
+local llena_en = math.max(tonumber(redis.call('GET', KEYS[1]) or ahora), ahora)
+local nueva = llena_en + intervalo
+local espera = nueva - ahora - rafaga
+if espera > 0 then
+    return espera
+end
+redis.call('SET', KEYS[1], nueva, 'PX', math.ceil(nueva - ahora))
+return 0
+"""
+
+
+class CubetasRedis:
+    def __init__(self, url, respaldo):
+        import redis  # Dependencia opcional: solo con LIMITES_REDIS_URL
+
+        self._cliente = redis.Redis.from_url(url, socket_timeout=0.2)
+        self._script = self._cliente.register_script(_SCRIPT_REDIS)
+        self._respaldo = respaldo
+
+    def consumir(self, clave, capacidad, intervalo):
+        intervalo_ms = intervalo * 1000
+        try:
+            espera_ms = self._script(
+                keys=[f"limite:{clave}"],
+                args=[int(time.time() * 1000), intervalo_ms, capacidad * intervalo_ms],
+            )
+            return float(espera_ms) / 1000
+        except Exception as e:
+            logger.warning(f"Redis no disponible para límites, uso local: {e}")
+            return self._respaldo.consumir(clave, capacidad, intervalo)
+
+
+_lock_cubetas = threading.Lock()
+
+
+def obtener_cubetas(app=None):
+    """Almacén de cubetas de la aplicación (uno por proceso)"""
+    app = app or current_app._get_current_object()
+    with _lock_cubetas:
+        cubetas = app.extensions.get("limites")
+        if cubetas is None:
+            cubetas = CubetasLocales(app.config["LIMITES_MAX_CLAVES"])
+            if app.config["LIMITES_REDIS_URL"]:
+                cubetas = CubetasRedis(app.config["LIMITES_REDIS_URL"], cubetas)
+            app.extensions["limites"] = cubetas
+        return cubetas
+
+
+def ip_cliente():
+    """IP del cliente; detrás de proxies se toma de X-Forwarded-For"""
+    proxies = current_app.config["LIMITES_PROXIES_CONFIABLES"]
+    ruta = request.access_route
+    if proxies and len(ruta) >= proxies:
+        return ruta[-proxies]
+    return request.remote_addr
+
+
+def campo_json(nombre):
+    """Clave de cuenta tomada del cuerpo JSON (correo, email)"""
+
+    def leer():
+        data = request.get_json(silent=True) or {}
+        valor = data.get(nombre)
+        return valor.strip().lower() if isinstance(valor, str) else None
+
+    return leer
+
+
+def limitar(nombre, cuenta=None):
+    """
+    Aplica LIMITE_<NOMBRE>_IP y, si `cuenta` devuelve una clave,
+    LIMITE_<NOMBRE>_CUENTA. Responde 429 con Retry-After al agotarse.
+    """
+    prefijo = f"LIMITE_{nombre.upper()}"
+
+    def decorador(f):
+        @wraps(f)
+        def decorada(*args, **kwargs):
+            config = current_app.config
+            if not config["LIMITES_ACTIVOS"] or request.method == "OPTIONS":
+                return f(*args, **kwargs)
+
+            claves = [(f"{prefijo}_IP", f"{nombre}:ip:{ip_cliente()}")]
+            clave_cuenta = cuenta() if cuenta else None
+            if clave_cuenta and config.get(f"{prefijo}_CUENTA"):
+                claves.append((f"{prefijo}_CUENTA", f"{nombre}:cuenta:{clave_cuenta}"))
+
+            cubetas = obtener_cubetas()
+            for regla, clave in claves:
+                capacidad, intervalo = _regla(config[regla])
+                espera = cubetas.consumir(clave, capacidad, intervalo)
+                if espera > 0:
+                    return (
+                        jsonify({"error": "Demasiadas solicitudes, intenta más tarde"}),
+                        429,
+                        {"Retry-After": str(math.ceil(espera))},
+                    )
+            return f(*args, **kwargs)
+
+        return decorada
+
+    return decorador
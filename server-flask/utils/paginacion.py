@@ -0,0 +1,53 @@
+import base64
+from datetime import datetime
+
+
+def ahora_al_segundo():
+    """
+    utcnow() sin microsegundos. Las columnas DATETIME de MySQL guardan
+    segundos enteros; las fechas usadas en cursores deben coincidir con lo
+    guardado para no saltarse filas del mismo segundo.
+    """
+    return datetime.utcnow().replace(microsecond=0)
+
+
+def codificar_cursor(fecha, identificador):
+    """Codifica la posición (fecha, id) de la última fila entregada en un cursor opaco"""
+    crudo = f"{fecha.isoformat()}|{identificador}"
+    return base64.urlsafe_b64encode(crudo.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor):
+    """Devuelve la tupla (fecha, id) de un cursor. Lanza ValueError si es inválido"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        crudo = base64.urlsafe_b64decode(cursor + relleno).decode("utf-8")
+        fecha, identificador = crudo.split("|", 1)
+        return datetime.fromisoformat(fecha), identificador
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
+def decodificar_secuencia(cursor):
+    """
+    Cursor de los feeds de notificaciones: el número de secuencia (entero no
+    negativo) del último elemento entregado. Lanza ValueError si es inválido
+    """
+    try:
+        secuencia = int(cursor)
+    except (TypeError, ValueError):
+        raise ValueError("Cursor inválido")
+    if secuencia < 0:
+        raise ValueError("Cursor inválido")
+    return secuencia
+
+
+def obtener_limite(valor, por_defecto, maximo):
+    """Normaliza el parámetro limit de la URL al rango [1, maximo]"""
+    if valor is None or valor == "":
+        return por_defecto
+    try:
+        limite = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError("El parámetro limit debe ser un entero")
+    return max(1, min(limite, maximo))
@@ -0,0 +1,141 @@
+"""
+Caché de usuarios autenticados (principales) por proceso.
+
+token_required necesitaba una consulta en cada petición solo para confirmar
+que el usuario del JWT sigue existiendo. La caché guarda, por id_usu, una
+copia de las columnas del usuario y de su perfil (empresa o freelancer);
+con un acierto, restaurar() reconstruye los objetos y los une a la sesión
+con merge(load=False), sin tocar la base de datos. Las rutas los usan igual
+que si se hubieran consultado (pueden modificarlos o eliminarlos).
+
+Invalidación:
+- Cualquier cambio confirmado a un Usuario, Empresa o Freelancer por la
+  sesión saca a ese usuario de la caché (evento after_flush; se aplica al
+  confirmar, como utils.db.al_confirmar).
+- Cada usuario tiene version_token; el JWT lleva la versión con que se
+  emitió. revocar_tokens() la incrementa (restablecer contraseña, cambio de
+  estado), con lo que los tokens anteriores dejan de valer.
+- La caché es local al proceso: en otros workers una entrada puede seguir
+  viva hasta PRINCIPALES_TTL_SEGUNDOS, que acota cuánto tarda allí una
+  revocación.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from utils.db import db
+from models.modelo_usuarios import Usuario
+from models.modelo_empresa import Empresa
+from models.modelo_freelancer import Freelancer
+
+
+class CachePrincipales:
+    """LRU con expiración de copias de usuarios, por id_usu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()  # id_usu -> (copia, expira)
+        self._generaciones = {}  # id_usu -> contador de invalidaciones
+
+    def obtener(self, id_usu):
+        with self._lock:
+            entrada = self._entradas.get(id_usu)
+            if entrada is None:
+                return None
+            if entrada[1] < time.monotonic():
+                del self._entradas[id_usu]
+                return None
+            self._entradas.move_to_end(id_usu)
+            return entrada[0]
+
+    def generacion(self, id_usu):
+        with self._lock:
+            return self._generaciones.get(id_usu, 0)
+
+    def guardar(self, id_usu, copia, generacion, ttl, maximo):
+        with self._lock:
+            # Si se invalidó mientras se consultaba, la copia puede ser vieja
+            if generacion != self._generaciones.get(id_usu, 0):
+                return
+            self._entradas[id_usu] = (copia, time.monotonic() + ttl)
+            self._entradas.move_to_end(id_usu)
+            while len(self._entradas) > maximo:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, *ids_usu):
+        with self._lock:
+            for id_usu in ids_usu:
+                self._generaciones[id_usu] = self._generaciones.get(id_usu, 0) + 1
+                self._entradas.pop(id_usu, None)
+
+
+cache_principales = CachePrincipales()
+
+
+def _columnas(objeto):
+    return {c.key: getattr(objeto, c.key) for c in inspect(objeto).mapper.column_attrs}
+
+
+def copiar(usuario):
+    """Copia inmutable de un usuario cargado con su perfil"""
+    return (
+        tuple(_columnas(usuario).items()),
+        tuple(_columnas(usuario.empresa).items()) if usuario.empresa else None,
+        tuple(_columnas(usuario.freelancer).items()) if usuario.freelancer else None,
+    )
+
+
+def restaurar(copia):
+    """Usuario unido a la sesión a partir de una copia, sin consultas"""
+    columnas_usuario, columnas_empresa, columnas_freelancer = copia
+    usuario = Usuario(**dict(columnas_usuario))
+    # Perfil ya resuelto: acceder a usuario.empresa/freelancer no consulta
+    usuario.empresa = Empresa(**dict(columnas_empresa)) if columnas_empresa else None
+    usuario.freelancer = (
+        Freelancer(**dict(columnas_freelancer)) if columnas_freelancer else None
+    )
+    for objeto in (usuario, usuario.empresa, usuario.freelancer):
+        if objeto is not None:
+            make_transient_to_detached(objeto)
+    return db.session.merge(usuario, load=False)
+
+
+def revocar_tokens(usuario):
+    """
+    Invalida los JWT emitidos hasta ahora para el usuario (se aplica al
+    confirmar la transacción)
+    """
+    usuario.version_token = Usuario.version_token + 1
+
+
+@event.listens_for(Usuario.estado, "set")
+def _revocar_al_cambiar_estado(usuario, valor, anterior, iniciador):
+    # Bloquear o desactivar una cuenta cierra sus sesiones abiertas
+    if inspect(usuario).persistent and valor != anterior:
+        revocar_tokens(usuario)
+
+
+def _id_usu(objeto):
+    if isinstance(objeto, (Usuario, Empresa, Freelancer)):
+        return inspect(objeto).committed_state.get("id_usu", objeto.id_usu)
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidar_modificados(session, contexto):
+    ids = {
+        _id_usu(objeto)
+        for objeto in list(session.dirty) + list(session.deleted)
+        if _id_usu(objeto) is not None
+    }
+    ids.update(
+        objeto.id_usu
+        for objeto in session.new
+        if isinstance(objeto, (Empresa, Freelancer))
+    )
+    if ids:
+        session.info.setdefault("al_confirmar", []).append(
+            lambda: cache_principales.invalidar(*ids)
+        )
@@ -0,0 +1,173 @@
+"""
+Ranking de postulantes de una vacante para la empresa.
+
+Cada postulación recibe un puntaje que combina:
+- la similitud coseno TF-IDF entre el perfil del freelancer (profesión y
+  experiencia) y la vacante (nombre y requisitos), con IDF calculado sobre
+  los perfiles de los postulantes de esa vacante, para que pesen los
+  términos que los distinguen entre sí;
+- el promedio de calificaciones del freelancer, suavizado hacia un valor
+  neutro cuando tiene pocas calificaciones.
+
+Todos los postulantes se puntúan en una sola pasada: los perfiles forman
+una matriz dispersa que se multiplica por el vector de la vacante. El
+ranking se guarda en la caché de respuestas con etiquetas por vacante y por
+freelancer, así que solo se recalcula cuando cambia una postulación, una
+calificación, el perfil de un postulante o la vacante.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from flask import current_app
+from utils.db import db
+from utils.busqueda import tokenizar
+from utils.cache import cache_respuestas
+from utils.recomendaciones import terminos_perfil
+from utils.serializadores import serializar_postulacion_empresa, plan_freelancer_usuario
+from models.modelo_postulacion import Postulacion
+from models.modelo_freelancer import Freelancer
+from models.modelo_calificacion import Calificacion
+
+# Peso de cada componente en el puntaje final (suman 1)
+PESO_SIMILITUD = 0.7
+PESO_CALIFICACION = 0.3
+
+# Suavizado del promedio: equivale a sumar CALIFICACIONES_PREVIAS votos de
+# CALIFICACION_PREVIA estrellas a las calificaciones reales
+CALIFICACION_PREVIA = 3.0
+CALIFICACIONES_PREVIAS = 2
+
+
+def _terminos_vacante(vacante):
+    """Nombre (peso 3) y requisitos (peso 2), como en la búsqueda"""
+    terminos = {}
+    for texto, peso in ((vacante.nomb_vacante, 3), (vacante.requisitos, 2)):
+        for termino in tokenizar(texto):
+            terminos[termino] = terminos.get(termino, 0) + peso
+    return terminos
+
+
+def similitudes(terminos_objetivo, perfiles):
+    """
+    Similitud coseno TF-IDF de cada perfil contra el objetivo.
+    `perfiles` es una lista de diccionarios término -> frecuencia.
+    """
+    vocabulario = {}
+    filas, columnas, frecuencias = [], [], []
+    for fila, terminos in enumerate(perfiles):
+        for termino, frecuencia in terminos.items():
+            filas.append(fila)
+            columnas.append(vocabulario.setdefault(termino, len(vocabulario)))
+            frecuencias.append(frecuencia)
+
+    objetivo = [
+        (vocabulario[t], f) for t, f in terminos_objetivo.items() if t in vocabulario
+    ]
+    if not objetivo:
+        return np.zeros(len(perfiles))
+
+    forma = (len(perfiles), len(vocabulario))
+    columnas = np.array(columnas, dtype=np.int32)
+    tf = 1 + np.log(np.array(frecuencias, dtype=np.float64))
+    df = np.bincount(columnas, minlength=forma[1])
+    idf = np.log((1 + forma[0]) / (1 + df)) + 1
+
+    matriz = sp.csr_matrix((tf * idf[columnas], (filas, columnas)), shape=forma)
+    normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+    normas[normas == 0] = 1.0
+
+    vector = np.zeros(forma[1])
+    cols_objetivo, frec_objetivo = zip(*objetivo)
+    cols_objetivo = np.array(cols_objetivo)
+    vector[cols_objetivo] = (1 + np.log(np.array(frec_objetivo, dtype=np.float64))) * (
+        idf[cols_objetivo]
+    )
+    vector /= np.linalg.norm(vector)
+
+    return (matriz @ vector) / normas
+
+
+def _calcular(vacante):
+    postulantes = db.select(Postulacion.id_free).where(
+        Postulacion.id_vac == vacante.id_vac
+    )
+    promedios = (
+        db.session.query(
+            Calificacion.id_free,
+            db.func.avg(Calificacion.puntuacion).label("promedio"),
+            db.func.count(Calificacion.id_calif).label("total"),
+        )
+        .filter(Calificacion.id_free.in_(postulantes))
+        .group_by(Calificacion.id_free)
+        .subquery()
+    )
+    filas = (
+        db.session.query(
+            Postulacion, Freelancer, promedios.c.promedio, promedios.c.total
+        )
+        .join(Freelancer, Postulacion.id_free == Freelancer.id_free)
+        .outerjoin(promedios, promedios.c.id_free == Freelancer.id_free)
+        .options(*plan_freelancer_usuario())
+        .filter(Postulacion.id_vac == vacante.id_vac)
+        .all()
+    )
+    if not filas:
+        return []
+
+    similitud = similitudes(
+        _terminos_vacante(vacante),
+        [terminos_perfil(f.profesion, f.experiencia) for _, f, _, _ in filas],
+    )
+    promedio = np.array([float(p or 0) for _, _, p, _ in filas])
+    total = np.array([t or 0 for _, _, _, t in filas], dtype=np.float64)
+    ajustado = (promedio * total + CALIFICACION_PREVIA * CALIFICACIONES_PREVIAS) / (
+        total + CALIFICACIONES_PREVIAS
+    )
+    puntaje = PESO_SIMILITUD * similitud + PESO_CALIFICACION * ajustado / 5
+
+    ranking = []
+    for i in np.argsort(-puntaje, kind="stable"):
+        postulacion, _, prom, tot = filas[i]
+        item = serializar_postulacion_empresa(
+            postulacion, rating=round(float(prom), 1) if prom is not None else 0
+        )
+        item["total_calificaciones"] = int(tot or 0)
+        item["similitud"] = round(float(similitud[i]), 4)
+        item["puntaje"] = round(float(puntaje[i]), 4)
+        ranking.append(item)
+
+    return ranking
+
+
+def ranking_postulaciones(vacante):
+    """Postulaciones de la vacante ordenadas por puntaje, desde la caché"""
+    clave = ("ranking_postulaciones", vacante.id_vac)
+    entrada = cache_respuestas.obtener(clave)
+    if entrada is not None:
+        return entrada[1]
+
+    # Las generaciones de las etiquetas se leen antes de calcular para no
+    # guardar un ranking que quedó viejo por un cambio confirmado mientras tanto
+    ids_freelancer = [
+        fila[0]
+        for fila in db.session.query(Postulacion.id_free).filter_by(
+            id_vac=vacante.id_vac
+        )
+    ]
+    etiquetas = (
+        f"vacante:{vacante.id_vac}",
+        f"postulaciones:{vacante.id_vac}",
+    ) + tuple(f"freelancer:{id_free}" for id_free in ids_freelancer)
+    generaciones = cache_respuestas.generaciones(etiquetas)
+
+    ranking = _calcular(vacante)
+    cache_respuestas.guardar(
+        clave,
+        None,
+        ranking,
+        etiquetas,
+        generaciones,
+        current_app.config["CACHE_RESPUESTAS_TTL_SEGUNDOS"],
+        current_app.config["CACHE_RESPUESTAS_MAX_ENTRADAS"],
+    )
+    return ranking
@@ -0,0 +1,401 @@
+"""
+Recomendación de vacantes para freelancers por similitud TF-IDF.
+
+Cada vacante se representa como un vector TF-IDF (nombre, descripción y
+requisitos, con los mismos pesos por campo y el mismo tokenizador que la
+búsqueda) normalizado a norma 1, y todas juntas forman una matriz dispersa
+CSR de SciPy. El perfil del freelancer (profesión y experiencia) se
+convierte en un vector con el mismo vocabulario, de modo que recomendar es
+un producto matriz-vector seguido de un top-k con argpartition.
+
+Las vacantes creadas o editadas se guardan como filas pendientes que
+reemplazan a su fila de la matriz base; cuando se acumulan demasiadas se
+fusionan con la base sin volver a la base de datos. La matriz completa se
+reconstruye en un hilo en segundo plano al arrancar y cada
+RECOMENDACIONES_RESINCRONIZAR_SEGUNDOS, igual que el índice de búsqueda:
+las consultas usan la matriz anterior mientras tanto y los cambios que
+llegan durante la reconstrucción se repiten sobre la nueva. Los IDF quedan
+fijos entre reconstrucciones completas.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+import numpy as np
+import scipy.sparse as sp
+from flask import current_app
+from utils.db import db, al_confirmar
+from utils.busqueda import tokenizar, terminos_vacante, IndiceNoDisponible
+
+logger = logging.getLogger(__name__)
+
+# Espera entre intentos si una reconstrucción falla sin intervalo configurado
+_REINTENTO_SEGUNDOS = 30
+
+# Peso de cada campo del perfil del freelancer
+PESOS_PERFIL = {"profesion": 3, "experiencia": 1}
+
+# Filas pendientes a partir de las cuales se fusionan con la matriz base
+MAX_PENDIENTES = 1000
+
+
+def terminos_perfil(profesion, experiencia):
+    """Frecuencias ponderadas por campo del perfil de un freelancer"""
+    frecuencias = Counter()
+    for campo, texto in (("profesion", profesion), ("experiencia", experiencia)):
+        peso = PESOS_PERFIL[campo]
+        for termino in tokenizar(texto):
+            frecuencias[termino] += peso
+    return frecuencias
+
+
+class RecomendadorVacantes:
+    """
+    Matriz TF-IDF de vacantes (fila = slot, columna = término).
+
+    Los slots funcionan como en IndiceVacantes: cada vacante ocupa uno fijo
+    mientras está en el recomendador y los libres se reutilizan.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._lock_reconstruccion = threading.Lock()
+        self._vocabulario = {}  # termino -> columna
+        self._idf = np.zeros(0, dtype=np.float64)  # columna -> idf
+        self._base = sp.csr_matrix((0, 0), dtype=np.float64)
+        self._en_base = np.zeros(0, dtype=bool)  # slot -> su fila base es vigente
+        self._pendientes = {}  # slot -> (columnas, valores)
+        self._slots = {}  # id_vac -> slot
+        self._ids = []  # slot -> id_vac (None si está libre)
+        self._libres = []
+        self._estados = np.zeros(0, dtype=np.int16)  # slot -> código de estado
+        self._codigos_estado = {}
+        self._total_docs = 0
+        self._construido_en = None
+        self._listo = threading.Event()
+        self._diario = None  # operaciones durante una reconstrucción
+        self._lock_inicio = threading.Lock()
+        self._pid = None
+
+    # ---------- vectores ----------
+
+    def _codigo_estado(self, estado):
+        # El código 0 queda reservado para slots libres
+        return self._codigos_estado.setdefault(estado, len(self._codigos_estado) + 1)
+
+    def _columna(self, termino):
+        """Columna del término; los términos nuevos reciben idf de df = 1"""
+        columna = self._vocabulario.get(termino)
+        if columna is None:
+            columna = len(self._vocabulario)
+            self._vocabulario[termino] = columna
+            if columna >= len(self._idf):
+                self._idf = np.concatenate([self._idf, np.zeros(max(columna, 1024))])
+            self._idf[columna] = math.log((1 + self._total_docs) / 2) + 1
+        return columna
+
+    def _vector(self, terminos, agregar_terminos):
+        """Frecuencias -> (columnas, valores) TF-IDF con norma 1"""
+        columnas, frecuencias = [], []
+        for termino, frecuencia in terminos.items():
+            if agregar_terminos:
+                columna = self._columna(termino)
+            else:
+                columna = self._vocabulario.get(termino)
+                if columna is None:
+                    continue
+            columnas.append(columna)
+            frecuencias.append(frecuencia)
+        columnas = np.array(columnas, dtype=np.int32)
+        valores = (1 + np.log(np.array(frecuencias, dtype=np.float64))) * self._idf[
+            columnas
+        ]
+        norma = np.linalg.norm(valores)
+        if norma:
+            valores /= norma
+        return columnas, valores
+
+    # ---------- mantenimiento ----------
+
+    def _nuevo_slot(self, id_vac):
+        if self._libres:
+            slot = self._libres.pop()
+            self._ids[slot] = id_vac
+        else:
+            slot = len(self._ids)
+            self._ids.append(id_vac)
+            if slot >= len(self._estados):
+                crecer = max(len(self._estados), 1024)
+                self._estados = np.concatenate(
+                    [self._estados, np.zeros(crecer, dtype=np.int16)]
+                )
+                self._en_base = np.concatenate(
+                    [self._en_base, np.zeros(crecer, dtype=bool)]
+                )
+        self._slots[id_vac] = slot
+        return slot
+
+    def _quitar(self, id_vac):
+        slot = self._slots.pop(id_vac, None)
+        if slot is None:
+            return
+        self._ids[slot] = None
+        self._estados[slot] = 0
+        self._en_base[slot] = False
+        self._pendientes.pop(slot, None)
+        self._libres.append(slot)
+
+    def _reemplazar(self, id_vac, estado, terminos):
+        slot = self._slots.get(id_vac)
+        if slot is None:
+            slot = self._nuevo_slot(id_vac)
+        self._en_base[slot] = False
+        self._pendientes[slot] = self._vector(terminos, agregar_terminos=True)
+        self._estados[slot] = self._codigo_estado(estado)
+        if len(self._pendientes) > MAX_PENDIENTES:
+            self._fusionar()
+
+    def _cambiar_estado(self, id_vac, estado):
+        slot = self._slots.get(id_vac)
+        if slot is not None:
+            self._estados[slot] = self._codigo_estado(estado)
+
+    def _aplicar(self, operacion, *args):
+        """Aplica una operación y la anota si hay una reconstrucción en curso"""
+        with self._lock:
+            getattr(self, operacion)(*args)
+            if self._diario is not None:
+                self._diario.append((operacion, args))
+
+    def indexar(self, id_vac, estado, nomb_vacante, descripcion, requisitos):
+        """Agrega o reemplaza una vacante como fila pendiente"""
+        terminos = terminos_vacante(nomb_vacante, descripcion, requisitos)
+        self._aplicar("_reemplazar", id_vac, estado, terminos)
+
+    def cambiar_estado(self, id_vac, estado):
+        self._aplicar("_cambiar_estado", id_vac, estado)
+
+    def eliminar(self, id_vac):
+        self._aplicar("_quitar", id_vac)
+
+    def _fusionar(self):
+        """Incorpora las filas pendientes a la matriz base"""
+        filas, columnas, valores = [], [], []
+        for slot, (cols, vals) in self._pendientes.items():
+            filas.append(np.full(len(cols), slot, dtype=np.int32))
+            columnas.append(cols)
+            valores.append(vals)
+        forma = (len(self._ids), len(self._vocabulario))
+
+        base = self._base.copy()
+        base.resize(forma)
+        vigentes = self._en_base[: forma[0]].astype(np.float64)
+        base = sp.diags(vigentes, format="csr") @ base
+        if filas:
+            base = base + sp.csr_matrix(
+                (
+                    np.concatenate(valores),
+                    (np.concatenate(filas), np.concatenate(columnas)),
+                ),
+                shape=forma,
+            )
+        base.eliminate_zeros()
+
+        self._base = base.tocsr()
+        self._en_base[: forma[0]] = False
+        self._en_base[np.fromiter(self._slots.values(), dtype=np.int64)] = True
+        self._pendientes = {}
+
+    def reconstruir(self):
+        """Reconstruye la matriz completa desde la tabla VACANTE"""
+        with self._lock_reconstruccion:
+            with self._lock:
+                self._diario = []
+            try:
+                self._reconstruir()
+            finally:
+                with self._lock:
+                    self._diario = None
+
+    def _reconstruir(self):
+        from models.modelo_vacante import Vacante
+
+        filas = db.session.query(
+            Vacante.id_vac,
+            Vacante.estado_vac,
+            Vacante.nomb_vacante,
+            Vacante.descripcion,
+            Vacante.requisitos,
+        ).yield_per(1000)
+
+        documentos = [
+            (id_vac, estado, terminos_vacante(nombre, descripcion, requisitos))
+            for id_vac, estado, nombre, descripcion, requisitos in filas
+        ]
+
+        # Se construye aparte y se reemplaza de una vez para no bloquear consultas
+        nuevo = RecomendadorVacantes()
+        df = Counter()
+        for _, _, terminos in documentos:
+            df.update(terminos.keys())
+        nuevo._total_docs = len(documentos)
+        nuevo._vocabulario = {termino: i for i, termino in enumerate(df)}
+        nuevo._idf = (
+            np.log(
+                (1 + len(documentos)) / (1 + np.fromiter(df.values(), dtype=np.float64))
+            )
+            + 1
+        )
+
+        # Todas las filas de una vez: TF sublineal * IDF y normalización por fila
+        filas, columnas, frecuencias = [], [], []
+        vocabulario = nuevo._vocabulario
+        for id_vac, estado, terminos in documentos:
+            slot = nuevo._nuevo_slot(id_vac)
+            nuevo._estados[slot] = nuevo._codigo_estado(estado)
+            filas.extend([slot] * len(terminos))
+            columnas.extend(vocabulario[t] for t in terminos)
+            frecuencias.extend(terminos.values())
+        filas = np.array(filas, dtype=np.int32)
+        columnas = np.array(columnas, dtype=np.int32)
+        valores = (1 + np.log(np.array(frecuencias, dtype=np.float64))) * nuevo._idf[
+            columnas
+        ]
+        normas = np.sqrt(
+            np.bincount(filas, weights=valores**2, minlength=len(documentos))
+        )
+        normas[normas == 0] = 1.0
+        valores /= normas[filas]
+        nuevo._base = sp.csr_matrix(
+            (valores, (filas, columnas)), shape=(len(documentos), len(vocabulario))
+        )
+        nuevo._en_base[: len(documentos)] = True
+
+        with self._lock:
+            # Cambios confirmados mientras se leía la tabla
+            for operacion, args in self._diario:
+                getattr(nuevo, operacion)(*args)
+            for atributo in (
+                "_vocabulario",
+                "_idf",
+                "_base",
+                "_en_base",
+                "_pendientes",
+                "_slots",
+                "_ids",
+                "_libres",
+                "_estados",
+                "_codigos_estado",
+                "_total_docs",
+            ):
+                setattr(self, atributo, getattr(nuevo, atributo))
+            self._construido_en = time.monotonic()
+        self._listo.set()
+
+    def _mantener(self, app):
+        intervalo = app.config["RECOMENDACIONES_RESINCRONIZAR_SEGUNDOS"]
+        # Tras un fork la matriz del padre ya sirve: se espera al siguiente turno
+        if self._construido_en is not None:
+            if not intervalo:
+                return
+            time.sleep(intervalo)
+        while True:
+            try:
+                with app.app_context():
+                    self.reconstruir()
+                    db.session.remove()
+                if not intervalo:
+                    return
+            except Exception as e:
+                logger.error(f"Error al reconstruir las recomendaciones: {str(e)}")
+            time.sleep(intervalo or _REINTENTO_SEGUNDOS)
+
+    def iniciar(self, app):
+        """Construye la matriz y la mantiene al día en un hilo de este proceso"""
+        with self._lock_inicio:
+            # Tras un fork (gunicorn) el hilo del padre no existe en el hijo
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(
+                target=self._mantener,
+                args=(app,),
+                name="recomendaciones",
+                daemon=True,
+            ).start()
+
+    def _asegurar_actualizado(self):
+        app = current_app._get_current_object()
+        if self._pid != os.getpid():
+            self.iniciar(app)
+        if self._construido_en is None and not self._listo.wait(
+            app.config["INDICES_ESPERA_SEGUNDOS"]
+        ):
+            raise IndiceNoDisponible("Las recomendaciones se están calculando")
+
+    # ---------- consulta ----------
+
+    def recomendar(self, freelancer, estado="abierta", limite=20, excluir=()):
+        """Devuelve [(id_vac, similitud)] ordenado por similitud coseno"""
+        self._asegurar_actualizado()
+        # El perfil ya viene cargado con la petición; tokenizarlo es barato
+        terminos = terminos_perfil(freelancer.profesion, freelancer.experiencia)
+
+        with self._lock:
+            columnas, valores = self._vector(terminos, agregar_terminos=False)
+            if not len(columnas):
+                return []
+
+            perfil = np.zeros(len(self._vocabulario), dtype=np.float64)
+            perfil[columnas] = valores
+
+            puntajes = np.zeros(len(self._ids), dtype=np.float64)
+            filas_base = self._base.shape[0]
+            puntajes[:filas_base] = self._base @ perfil[: self._base.shape[1]]
+            puntajes[~self._en_base[: len(puntajes)]] = 0.0
+            for slot, (cols, vals) in self._pendientes.items():
+                puntajes[slot] = vals @ perfil[cols]
+
+            codigo = self._codigos_estado.get(estado)
+            puntajes[self._estados[: len(puntajes)] != codigo] = 0.0
+            for id_vac in excluir:
+                slot = self._slots.get(id_vac)
+                if slot is not None:
+                    puntajes[slot] = 0.0
+
+            candidatos = np.flatnonzero(puntajes)
+            if len(candidatos) > limite:
+                mejores = np.argpartition(puntajes[candidatos], -limite)[-limite:]
+                candidatos = candidatos[mejores]
+            candidatos = candidatos[np.argsort(-puntajes[candidatos], kind="stable")]
+
+            return [(self._ids[slot], float(puntajes[slot])) for slot in candidatos]
+
+
+recomendador_vacantes = RecomendadorVacantes()
+
+
+# ---------- integración con las rutas de escritura ----------
+# Los cambios se aplican solo cuando la transacción se confirma.
+
+
+def indexar_recomendacion_al_confirmar(vacante):
+    datos = (
+        vacante.id_vac,
+        vacante.estado_vac,
+        vacante.nomb_vacante,
+        vacante.descripcion,
+        vacante.requisitos,
+    )
+    al_confirmar(lambda: recomendador_vacantes.indexar(*datos))
+
+
+def cambiar_estado_recomendacion_al_confirmar(id_vac, estado):
+    al_confirmar(lambda: recomendador_vacantes.cambiar_estado(id_vac, estado))
+
+
+def eliminar_recomendacion_al_confirmar(id_vac):
+    al_confirmar(lambda: recomendador_vacantes.eliminar(id_vac))
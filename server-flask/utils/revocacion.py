@@ -0,0 +1,165 @@
+"""
+Índice en memoria de sesiones revocadas.
+
+Cada access token lleva el id de su sesión (claim "sid"). Para saber si la
+sesión fue revocada (logout, reutilización de un refresh token, cambio de
+contraseña) sin consultar la base en cada petición, cada proceso mantiene
+un filtro de Bloom con los ids revocados:
+
+- Si el sid no está en el filtro, la sesión no está revocada: O(1), sin SQL.
+  Es el caso de casi todas las peticiones.
+- Si está, puede ser un falso positivo (menos de 1% con el tamaño por
+  defecto y 100 000 revocaciones vivas), así que se confirma con una
+  consulta por clave primaria. Solo pagan esa consulta los tokens revocados
+  y los falsos positivos.
+
+Un hilo por proceso sincroniza el filtro desde SESION.revocada_en cada
+REVOCACION_SYNC_SEGUNDOS; las revocaciones hechas en el mismo proceso se
+agregan al confirmar la transacción. Una revocación solo importa mientras
+pueda existir un access token de esa sesión sin expirar, por eso el filtro
+se reconstruye cada ACCESO_TOKEN_MINUTOS solo con las revocaciones de ese
+último intervalo y no crece sin límite.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from utils.db import db, al_confirmar
+from models.modelo_sesion import Sesion
+
+logger = logging.getLogger(__name__)
+
+
+class FiltroBloom:
+    def __init__(self, bits, hashes):
+        self._m = bits
+        self._k = hashes
+        self._bits = bytearray((bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _posiciones(self, clave):
+        resumen = hashlib.blake2b(clave.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], "little")
+        h2 = int.from_bytes(resumen[8:], "little") | 1
+        return [(h1 + i * h2) % self._m for i in range(self._k)]
+
+    def agregar(self, clave):
+        with self._lock:
+            for posicion in self._posiciones(clave):
+                self._bits[posicion >> 3] |= 1 << (posicion & 7)
+
+    def __contains__(self, clave):
+        bits = self._bits
+        return all(
+            bits[posicion >> 3] & (1 << (posicion & 7))
+            for posicion in self._posiciones(clave)
+        )
+
+
+class IndiceRevocaciones:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lock_inicio = threading.Lock()
+        self._filtro = None
+        self._pid = None
+        self._ultima_sync = None
+        self._ultima_reconstruccion = 0.0
+
+    def _nuevo_filtro(self, config):
+        return FiltroBloom(
+            config["REVOCACION_BLOOM_BITS"], config["REVOCACION_BLOOM_HASHES"]
+        )
+
+    def _ids_revocados_desde(self, desde):
+        return [
+            fila[0]
+            for fila in db.session.query(Sesion.id_sesion).filter(
+                Sesion.revocada_en >= desde
+            )
+        ]
+
+    def sincronizar(self, app):
+        """Agrega las revocaciones nuevas; reconstruye el filtro si toca"""
+        config = app.config
+        vida_acceso = timedelta(minutes=config["ACCESO_TOKEN_MINUTOS"])
+        ahora = datetime.utcnow()
+        reconstruir = (
+            self._filtro is None
+            or time.monotonic() - self._ultima_reconstruccion
+            >= vida_acceso.total_seconds()
+        )
+        if reconstruir:
+            filtro = self._nuevo_filtro(config)
+            # Margen para commits con marca de tiempo algo anterior
+            ids = self._ids_revocados_desde(ahora - vida_acceso - timedelta(seconds=5))
+        else:
+            filtro = self._filtro
+            ids = self._ids_revocados_desde(self._ultima_sync - timedelta(seconds=5))
+        db.session.remove()
+
+        for id_sesion in ids:
+            filtro.agregar(id_sesion)
+        with self._lock:
+            self._filtro = filtro
+            self._ultima_sync = ahora
+            if reconstruir:
+                self._ultima_reconstruccion = time.monotonic()
+
+    def _sincronizar_siempre(self, app):
+        intervalo = app.config["REVOCACION_SYNC_SEGUNDOS"]
+        while True:
+            time.sleep(intervalo)
+            try:
+                with app.app_context():
+                    self.sincronizar(app)
+            except Exception as e:
+                logger.error(f"Error al sincronizar revocaciones: {str(e)}")
+
+    def _iniciar(self, app):
+        with self._lock_inicio:
+            # Tras un fork (gunicorn) el hilo del padre no existe en el hijo
+            if self._pid == os.getpid():
+                return
+            self._filtro = None
+            # La primera carga es síncrona para no aceptar sesiones ya revocadas
+            with app.app_context():
+                self.sincronizar(app)
+            threading.Thread(
+                target=self._sincronizar_siempre,
+                args=(app,),
+                name="revocaciones",
+                daemon=True,
+            ).start()
+            self._pid = os.getpid()
+
+    def agregar(self, id_sesion):
+        filtro = self._filtro
+        if filtro is not None:
+            filtro.agregar(id_sesion)
+
+    def revocada(self, app, id_sesion):
+        if self._pid != os.getpid():
+            self._iniciar(app)
+        if id_sesion not in self._filtro:
+            return False
+        # Posible falso positivo: se confirma con la base
+        revocada_en = (
+            db.session.query(Sesion.revocada_en).filter_by(id_sesion=id_sesion).scalar()
+        )
+        return revocada_en is not None
+
+
+indice_revocaciones = IndiceRevocaciones()
+
+
+def revocar_sesion(sesion, motivo):
+    """Revoca la sesión (sin confirmar); el índice se actualiza al confirmar"""
+    if sesion.revocada_en is not None:
+        return
+    sesion.revocada_en = datetime.utcnow()
+    sesion.motivo_revocacion = motivo
+    id_sesion = sesion.id_sesion
+    al_confirmar(lambda: indice_revocaciones.agregar(id_sesion))
@@ -0,0 +1,240 @@
+"""
+Serialización compartida para los listados de la API.
+
+Cada serializador tiene su plan de carga (joinedload) asociado: las
+consultas de listado aplican el plan y los serializadores solo leen
+relaciones ya cargadas, de modo que un listado cuesta un número fijo de
+consultas sin importar cuántas filas devuelva.
+"""
+
+import os
+from sqlalchemy.orm import configure_mappers, joinedload
+from utils.db import db
+from models.modelo_vacante import Vacante
+from models.modelo_empresa import Empresa
+from models.modelo_freelancer import Freelancer
+from models.modelo_postulacion import Postulacion
+from models.modelo_usuarios import Usuario
+from models.modelo_calificacion import Calificacion
+
+# ==================== PLANES DE CARGA ====================
+# Las relaciones inversas (backref) solo existen en la clase después de
+# configurar los mappers, por eso los planes se construyen al usarse.
+
+
+def plan_vacante_empresa():
+    """Vacante -> Empresa -> Usuario"""
+    configure_mappers()
+    return [joinedload(Vacante.empresa).joinedload(Empresa.usuario)]
+
+
+def plan_postulacion_vacante():
+    """Postulacion -> Vacante -> Empresa -> Usuario"""
+    configure_mappers()
+    return [
+        joinedload(Postulacion.vacante)
+        .joinedload(Vacante.empresa)
+        .joinedload(Empresa.usuario)
+    ]
+
+
+def plan_postulacion_freelancer():
+    """Postulacion -> Freelancer -> Usuario y Postulacion -> Vacante"""
+    configure_mappers()
+    return [
+        joinedload(Postulacion.freelancer).joinedload(Freelancer.usuario),
+        joinedload(Postulacion.vacante),
+    ]
+
+
+def plan_freelancer_usuario():
+    """Freelancer -> Usuario"""
+    configure_mappers()
+    return [joinedload(Freelancer.usuario)]
+
+
+# ==================== SERIALIZADORES ====================
+
+# Caracteres de la experiencia que se envían en los listados de postulantes;
+# el texto completo se pide en el detalle de la postulación
+EXTRACTO_EXPERIENCIA = 100
+
+
+def _fecha(valor):
+    return valor.isoformat() if valor else None
+
+
+def serializar_contadores(v):
+    """Contadores de postulaciones de una vacante"""
+    return {
+        "total": v.total_postulaciones or 0,
+        "pendientes": v.postulaciones_pendientes or 0,
+        "aceptadas": v.postulaciones_aceptadas or 0,
+        "rechazadas": v.postulaciones_rechazadas or 0,
+    }
+
+
+def serializar_vacante(v, incluir_empresa=True):
+    """Vacante tal como se muestra en los listados"""
+    resultado = {
+        "id": v.id_vac,
+        "nombre": v.nomb_vacante,
+        "descripcion": v.descripcion,
+        "requisitos": v.requisitos,
+        "salario": float(v.salario) if v.salario else None,
+        "duracion_proyecto": v.duracion_proyecto,
+        "fecha_publicacion": _fecha(v.fecha_publicacion),
+        "estado": v.estado_vac,
+    }
+    if incluir_empresa:
+        resultado["empresa"] = (
+            {"id": v.empresa.id_emp, "nombre": v.empresa.usuario.nombre}
+            if v.empresa
+            else None
+        )
+    return resultado
+
+
+def serializar_vacante_detalle(v):
+    """Vacante con los datos de la empresa que muestra la vista de detalle"""
+    return {
+        "id": v.id_vac,
+        "nombre": v.nomb_vacante,
+        "descripcion": v.descripcion,
+        "requisitos": v.requisitos,
+        "salario": float(v.salario) if v.salario else None,
+        "fecha_publicacion": _fecha(v.fecha_publicacion),
+        "estado": v.estado_vac,
+        "empresa": (
+            {
+                "id": v.empresa.id_emp,
+                "nombre": v.empresa.usuario.nombre,
+                "tamaño": v.empresa.tamaño,
+            }
+            if v.empresa
+            else None
+        ),
+    }
+
+
+def url_hoja_vida(freelancer):
+    """URL pública de la hoja de vida del freelancer (o None)"""
+    return _url_hoja_vida(freelancer.hoja_vida) if freelancer else None
+
+
+def _url_hoja_vida(ruta):
+    if not ruta:
+        return None
+    # Solo se expone el nombre del archivo, no la ruta almacenada
+    filename = os.path.basename(ruta)
+    return f"/api/uploads/hojas_vida/{filename}"
+
+
+def serializar_postulacion_freelancer(p):
+    """Postulación vista por el freelancer (requiere plan_postulacion_vacante)"""
+    return {
+        "id": p.id_post,
+        "estado": p.estado_post,
+        "fecha": _fecha(p.fecha_post),
+        "vacante": (
+            {
+                "id": p.vacante.id_vac,
+                "nombre": p.vacante.nomb_vacante,
+                "empresa": (
+                    p.vacante.empresa.usuario.nombre if p.vacante.empresa else None
+                ),
+            }
+            if p.vacante
+            else None
+        ),
+    }
+
+
+def columnas_postulacion_empresa():
+    """
+    Columnas del listado de postulantes de la empresa (proyección en lugar de
+    entidades completas). De la experiencia solo se lee el extracto; se pide
+    un carácter más para saber si está recortada.
+    """
+    return (
+        Postulacion.id_post,
+        Postulacion.estado_post,
+        Postulacion.fecha_post,
+        Vacante.id_vac,
+        Vacante.nomb_vacante,
+        Freelancer.id_free,
+        Freelancer.profesion,
+        Freelancer.avatar,
+        Freelancer.hoja_vida,
+        Usuario.nombre,
+        db.func.substr(Freelancer.experiencia, 1, EXTRACTO_EXPERIENCIA + 1).label(
+            "extracto"
+        ),
+    )
+
+
+def promedios_calificacion(ids_free):
+    """id_free -> promedio de sus calificaciones, en una consulta agrupada"""
+    ids = list(set(ids_free))
+    if not ids:
+        return {}
+    filas = (
+        db.session.query(Calificacion.id_free, db.func.avg(Calificacion.puntuacion))
+        .filter(Calificacion.id_free.in_(ids))
+        .group_by(Calificacion.id_free)
+    )
+    return {id_free: round(float(promedio), 1) for id_free, promedio in filas}
+
+
+def serializar_resumen_postulacion_empresa(fila, rating=0):
+    """
+    Fila de columnas_postulacion_empresa tal como la muestra el listado;
+    `rating` sale de promedios_calificacion
+    """
+    extracto = fila.extracto or ""
+    return {
+        "id": fila.id_post,
+        "estado": fila.estado_post,
+        "fecha": _fecha(fila.fecha_post),
+        "nombre": fila.nombre or "Sin nombre",
+        "puesto": fila.profesion or "No especificado",
+        "rating": rating,
+        "avatar": fila.avatar,
+        "experiencia": extracto[:EXTRACTO_EXPERIENCIA],
+        "experiencia_recortada": len(extracto) > EXTRACTO_EXPERIENCIA,
+        "hoja_vida": _url_hoja_vida(fila.hoja_vida),
+        "freelancer": {"id": fila.id_free},
+        "vacante": {"id": fila.id_vac, "nombre": fila.nomb_vacante},
+    }
+
+
+def serializar_postulacion_empresa(p, rating=0):
+    """Postulación vista por la empresa (requiere plan_postulacion_freelancer)"""
+    freelancer = p.freelancer
+    vacante = p.vacante
+    return {
+        "id": p.id_post,
+        "estado": p.estado_post,
+        "fecha": _fecha(p.fecha_post),
+        "nombre": (
+            freelancer.usuario.nombre
+            if freelancer and freelancer.usuario
+            else "Sin nombre"
+        ),
+        "puesto": freelancer.profesion if freelancer else "No especificado",
+        "rating": rating,
+        "avatar": freelancer.avatar if freelancer else None,
+        "experiencia": freelancer.experiencia if freelancer else "",
+        "hoja_vida": url_hoja_vida(freelancer),
+        "freelancer": {
+            "id": freelancer.id_free if freelancer else None,
+        },
+        "vacante": (
+            {
+                "id": vacante.id_vac,
+                "nombre": vacante.nomb_vacante,
+            }
+            if vacante
+            else None
+        ),
+    }
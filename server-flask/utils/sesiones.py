@@ -0,0 +1,140 @@
+"""
+Emisión de access tokens y refresh tokens rotativos.
+
+login crea una Sesion y devuelve un access token corto
+(ACCESO_TOKEN_MINUTOS) y un refresh token ("<id>.<secreto>", válido
+REFRESCO_TOKEN_DIAS). De cada refresh token solo se guarda el SHA-256 del
+secreto. Cada uso en /api/auth/refresh lo marca como usado y emite el par
+siguiente en la misma sesión.
+
+Si se presenta un refresh token ya usado fuera de REFRESCO_GRACIA_SEGUNDOS
+(dos pestañas que refrescan a la vez caen dentro de la gracia), se asume
+robado y se revoca la sesión completa. También se revoca si el usuario
+cambió su version_token (contraseña restablecida, cambio de estado).
+"""
+
+import hashlib
+import hmac
+import secrets
+import uuid
+from datetime import datetime, timedelta
+import jwt
+from flask import current_app
+from utils.db import db
+from utils.revocacion import revocar_sesion
+from models.modelo_sesion import Sesion, TokenRefresco
+from models.modelo_usuarios import Usuario
+
+
+class RefrescoInvalido(Exception):
+    """El refresh token no sirve; el mensaje va en la respuesta 401"""
+
+
+def _hash(secreto):
+    return hashlib.sha256(secreto.encode()).hexdigest()
+
+
+def _token_acceso(usuario, sesion):
+    minutos = current_app.config["ACCESO_TOKEN_MINUTOS"]
+    return jwt.encode(
+        {
+            "user_id": usuario.id_usu,
+            "rol": usuario.rol,
+            "token_version": usuario.version_token,
+            "sid": sesion.id_sesion,
+            "exp": datetime.utcnow() + timedelta(minutes=minutos),
+        },
+        current_app.config["SECRET_KEY"],
+        algorithm="HS256",
+    )
+
+
+def _nuevo_refresco(sesion):
+    secreto = secrets.token_urlsafe(32)
+    refresco = TokenRefresco(
+        id_token=str(uuid.uuid4()),
+        id_sesion=sesion.id_sesion,
+        hash_secreto=_hash(secreto),
+        fecha_creacion=datetime.utcnow(),
+        expira=datetime.utcnow()
+        + timedelta(days=current_app.config["REFRESCO_TOKEN_DIAS"]),
+    )
+    db.session.add(refresco)
+    return f"{refresco.id_token}.{secreto}"
+
+
+def _par(usuario, sesion):
+    return {
+        "token": _token_acceso(usuario, sesion),
+        "refresh_token": _nuevo_refresco(sesion),
+        "expires_in": current_app.config["ACCESO_TOKEN_MINUTOS"] * 60,
+    }
+
+
+def iniciar_sesion(usuario):
+    """Crea la sesión y su primer par de tokens (sin confirmar)"""
+    sesion = Sesion(
+        id_sesion=str(uuid.uuid4()),
+        id_usu=usuario.id_usu,
+        version_token=usuario.version_token,
+        fecha_creacion=datetime.utcnow(),
+    )
+    db.session.add(sesion)
+    return _par(usuario, sesion)
+
+
+def _buscar(refresh_token):
+    id_token, _, secreto = (refresh_token or "").partition(".")
+    fila = (
+        db.session.query(TokenRefresco, Sesion)
+        .join(Sesion, TokenRefresco.id_sesion == Sesion.id_sesion)
+        .filter(TokenRefresco.id_token == id_token)
+        .first()
+    )
+    if fila is None or not hmac.compare_digest(fila[0].hash_secreto, _hash(secreto)):
+        raise RefrescoInvalido("Refresh token inválido")
+    return fila
+
+
+def rotar(refresh_token):
+    """
+    Canjea un refresh token por un par nuevo. Lanza RefrescoInvalido;
+    una revocación por reutilización queda pendiente de confirmar.
+    """
+    refresco, sesion = _buscar(refresh_token)
+    ahora = datetime.utcnow()
+
+    if sesion.revocada_en is not None:
+        raise RefrescoInvalido("Sesión revocada")
+    if refresco.expira < ahora:
+        raise RefrescoInvalido("Refresh token expirado")
+
+    # Marcar como usado solo si nadie lo usó antes (dos refrescos simultáneos
+    # no pueden obtener ambos un par nuevo)
+    marcado = (
+        db.session.query(TokenRefresco)
+        .filter(
+            TokenRefresco.id_token == refresco.id_token,
+            TokenRefresco.usado_en.is_(None),
+        )
+        .update({"usado_en": ahora}, synchronize_session=False)
+    )
+    if not marcado:
+        db.session.refresh(refresco)
+        gracia = timedelta(seconds=current_app.config["REFRESCO_GRACIA_SEGUNDOS"])
+        if refresco.usado_en is None or refresco.usado_en + gracia < ahora:
+            revocar_sesion(sesion, "reutilizacion")
+        raise RefrescoInvalido("Refresh token ya usado")
+
+    usuario = db.session.get(Usuario, sesion.id_usu)
+    if usuario is None or usuario.version_token != sesion.version_token:
+        revocar_sesion(sesion, "version")
+        raise RefrescoInvalido("Sesión revocada")
+
+    return _par(usuario, sesion)
+
+
+def cerrar_sesion(refresh_token):
+    """Revoca la sesión del refresh token (sin confirmar)"""
+    _, sesion = _buscar(refresh_token)
+    revocar_sesion(sesion, "logout")
@@ -0,0 +1,236 @@
+"""
+Transporte SMTP con conexiones persistentes para el worker de correos.
+
+Flask-Mail abre una conexión (con su negociación TLS y login) en cada
+mail.send o bloque connect(). PoolSMTP mantiene unas pocas conexiones ya
+autenticadas y las reutiliza entre lotes:
+
+    with pool.conexion() as conexion:   # misma interfaz que mail.connect()
+        for mensaje in lote:
+            conexion.send(mensaje)
+
+Antes de reutilizar una conexión que estuvo inactiva se verifica con NOOP;
+si el servidor la cerró se abre otra. Las que llevan demasiado tiempo
+inactivas se descartan sin probar, porque la mayoría de relays las cortan.
+
+Un interruptor de circuito cuenta los fallos de conexión seguidos: al
+llegar a SMTP_CIRCUITO_FALLOS deja de intentar durante
+SMTP_CIRCUITO_SEGUNDOS y conexion() falla de inmediato con CircuitoAbierto,
+en lugar de que cada hilo espere el timeout de un relay caído. Pasado ese
+tiempo deja pasar un solo intento de prueba antes de cerrarse de nuevo.
+"""
+
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from flask_mail import Connection
+
+
+class CircuitoAbierto(Exception):
+    """El relay SMTP falló repetidamente y no se intentará por un tiempo"""
+
+
+class InterruptorCircuito:
+    def __init__(self, umbral, enfriamiento):
+        self._lock = threading.Lock()
+        self._umbral = umbral
+        self._enfriamiento = enfriamiento
+        self._fallos = 0
+        self._abierto_hasta = None
+        self._prueba_en_curso = False
+
+    def abierto(self):
+        with self._lock:
+            return (
+                self._abierto_hasta is not None
+                and time.monotonic() < self._abierto_hasta
+            )
+
+    def permitir(self):
+        """True si se puede intentar una conexión nueva"""
+        with self._lock:
+            if self._abierto_hasta is None:
+                return True
+            # Semiabierto: solo un intento de prueba a la vez
+            if time.monotonic() >= self._abierto_hasta and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                return True
+            return False
+
+    def exito(self):
+        with self._lock:
+            self._fallos = 0
+            self._abierto_hasta = None
+            self._prueba_en_curso = False
+
+    def fallo(self):
+        with self._lock:
+            self._fallos += 1
+            if self._prueba_en_curso or self._fallos >= self._umbral:
+                self._abierto_hasta = time.monotonic() + self._enfriamiento
+            self._prueba_en_curso = False
+
+
+class ConexionSMTP(Connection):
+    """Conexión de Flask-Mail que no se cierra al salir del bloque with"""
+
+    def __init__(self, mail, timeout):
+        super().__init__(mail)
+        self.timeout = timeout
+        self.ultimo_uso = time.monotonic()
+
+    def configure_host(self):
+        # Igual que Flask-Mail, pero con timeout para no colgarse con un
+        # relay que no responde
+        if self.mail.use_ssl:
+            host = smtplib.SMTP_SSL(
+                self.mail.server, self.mail.port, timeout=self.timeout
+            )
+        else:
+            host = smtplib.SMTP(self.mail.server, self.mail.port, timeout=self.timeout)
+        host.set_debuglevel(int(self.mail.debug))
+        if self.mail.use_tls:
+            host.starttls()
+        if self.mail.username and self.mail.password:
+            host.login(self.mail.username, self.mail.password)
+        return host
+
+    def abrir(self):
+        if not self.mail.suppress:
+            self.host = self.configure_host()
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # La devuelve o descarta PoolSMTP
+        pass
+
+    def sana(self, verificar_despues, max_inactividad):
+        if self.host is None:
+            return bool(self.mail.suppress)
+        inactiva = time.monotonic() - self.ultimo_uso
+        if inactiva > max_inactividad:
+            return False
+        if inactiva <= verificar_despues:
+            return True
+        try:
+            return self.host.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def cerrar(self):
+        if self.host is None:
+            return
+        try:
+            self.host.quit()
+        except (smtplib.SMTPException, OSError):
+            self.host.close()
+        self.host = None
+
+
+def es_error_de_conexion(error):
+    """
+    Distingue la conexión rota o el relay caído de un rechazo de un mensaje
+    concreto (destinatario inválido, 4xx/5xx de DATA), que no la invalida
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, OSError)
+
+
+class PoolSMTP:
+    def __init__(
+        self, mail, tamano, timeout, verificar_despues, max_inactividad, interruptor
+    ):
+        self._mail = mail
+        self._timeout = timeout
+        self._verificar_despues = verificar_despues
+        self._max_inactividad = max_inactividad
+        self._lock = threading.Lock()
+        self._libres = []
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self.interruptor = interruptor
+
+    def _tomar_libre(self):
+        with self._lock:
+            # LIFO: la más reciente tiene menos probabilidad de estar cortada
+            return self._libres.pop() if self._libres else None
+
+    def _obtener(self):
+        while True:
+            conexion = self._tomar_libre()
+            if conexion is None:
+                break
+            if conexion.sana(self._verificar_despues, self._max_inactividad):
+                return conexion
+            conexion.cerrar()
+
+        if not self.interruptor.permitir():
+            raise CircuitoAbierto("Relay SMTP no disponible")
+        try:
+            conexion = ConexionSMTP(self._mail, self._timeout).abrir()
+        except Exception:
+            self.interruptor.fallo()
+            raise
+        self.interruptor.exito()
+        return conexion
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión abierta; si se rompe en uso, se descarta"""
+        if self.interruptor.abierto():
+            raise CircuitoAbierto("Relay SMTP no disponible")
+        self._cupos.acquire()
+        try:
+            conexion = self._obtener()
+            try:
+                yield conexion
+            except Exception as e:
+                if es_error_de_conexion(e):
+                    conexion.cerrar()
+                    self.interruptor.fallo()
+                    raise
+                self._devolver(conexion)
+                raise
+            else:
+                self._devolver(conexion)
+        finally:
+            self._cupos.release()
+
+    def _devolver(self, conexion):
+        conexion.ultimo_uso = time.monotonic()
+        with self._lock:
+            self._libres.append(conexion)
+
+    def cerrar(self):
+        with self._lock:
+            libres, self._libres = self._libres, []
+        for conexion in libres:
+            conexion.cerrar()
+
+
+_lock_pools = threading.Lock()
+
+
+def obtener_pool(app):
+    """Pool SMTP de la aplicación (uno por proceso)"""
+    with _lock_pools:
+        pool = app.extensions.get("pool_smtp")
+        if pool is None:
+            pool = app.extensions["pool_smtp"] = PoolSMTP(
+                app.extensions["mail"],
+                tamano=app.config["SMTP_POOL_TAMANO"],
+                timeout=app.config["SMTP_TIMEOUT_SEGUNDOS"],
+                verificar_despues=app.config["SMTP_VERIFICAR_SEGUNDOS"],
+                max_inactividad=app.config["SMTP_MAX_INACTIVIDAD_SEGUNDOS"],
+                interruptor=InterruptorCircuito(
+                    app.config["SMTP_CIRCUITO_FALLOS"],
+                    app.config["SMTP_CIRCUITO_SEGUNDOS"],
+                ),
+            )
+        return pool
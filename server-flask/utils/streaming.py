@@ -0,0 +1,78 @@
+"""
+Respuestas JSON en streaming para listados grandes.
+
+En lugar de construir la lista completa y pasarla a jsonify, el cuerpo se
+genera elemento por elemento a partir de una consulta con yield_per (cursor
+del lado del servidor), así la memoria del worker depende del tamaño del
+lote y no del número de filas.
+
+Los errores de permisos o de datos deben resolverse antes de empezar el
+stream: una vez enviados los encabezados ya no se puede cambiar el código
+de estado. Si la consulta falla a mitad de camino el error se registra y el
+cuerpo queda truncado (JSON inválido), lo que el cliente detecta al parsear.
+"""
+
+from flask import current_app, stream_with_context
+
+# Filas que se traen de la base de datos por cada viaje
+TAMANO_LOTE = 500
+
+
+def _elementos(filas, serializar, contador):
+    dumps = current_app.json.dumps
+    primero = True
+    for fila in filas:
+        elemento = serializar(fila)
+        if elemento is None:
+            continue
+        contador[0] += 1
+        if primero:
+            primero = False
+            yield dumps(elemento)
+        else:
+            yield "," + dumps(elemento)
+
+
+def _registrar_errores(generador):
+    try:
+        yield from generador
+    except Exception:
+        current_app.logger.exception("Error generando una respuesta en streaming")
+        raise
+
+
+def respuesta_lista(consulta, serializar, lote=TAMANO_LOTE):
+    """
+    Respuesta con un arreglo JSON. `serializar` recibe cada fila de la
+    consulta y devuelve un dict, o None para omitirla.
+    """
+
+    def generar():
+        yield "["
+        yield from _elementos(consulta.yield_per(lote), serializar, [0])
+        yield "]"
+
+    return current_app.response_class(
+        stream_with_context(_registrar_errores(generar())),
+        mimetype="application/json",
+    )
+
+
+def respuesta_objeto(campos, clave, consulta, serializar, lote=TAMANO_LOTE):
+    """
+    Respuesta con un objeto JSON: los `campos` fijos, el arreglo `clave`
+    generado desde la consulta y al final "total" con el número de elementos.
+    """
+
+    def generar():
+        dumps = current_app.json.dumps
+        contador = [0]
+        yield dumps(campos)[:-1]
+        yield ("," if campos else "") + dumps(clave) + ":["
+        yield from _elementos(consulta.yield_per(lote), serializar, contador)
+        yield '],"total":' + str(contador[0]) + "}"
+
+    return current_app.response_class(
+        stream_with_context(_registrar_errores(generar())),
+        mimetype="application/json",
+    )
@@ -0,0 +1,124 @@
+"""
+Mantenimiento del modelo de lectura TARJETA_VACANTE.
+
+Las funciones de este módulo se llaman dentro de la transacción de cada
+ruta de escritura, antes del commit, para que la tarjeta quede confirmada
+(o revertida) junto con el cambio que la originó.
+"""
+
+import json
+from sqlalchemy.orm import configure_mappers, joinedload
+from utils.db import db
+from models.modelo_vacante import Vacante
+from models.modelo_empresa import Empresa
+from models.modelo_tarjeta_vacante import TarjetaVacante
+from utils.serializadores import serializar_vacante
+
+
+def _plan_tarjeta():
+    configure_mappers()
+    return [
+        joinedload(Vacante.empresa).joinedload(Empresa.usuario),
+        joinedload(Vacante.empresa).joinedload(Empresa.ciudad),
+    ]
+
+
+def serializar_tarjeta(vacante, total_postulaciones):
+    """Contenido JSON de la tarjeta de una vacante"""
+    datos = serializar_vacante(vacante)
+    empresa = vacante.empresa
+    if empresa:
+        datos["empresa"].update(
+            {
+                "tamaño": empresa.tamaño,
+                "logo": empresa.logo,
+                "ciudad": (
+                    {"id": empresa.ciudad.id_ciud, "nombre": empresa.ciudad.nomb_ciud}
+                    if empresa.ciudad
+                    else None
+                ),
+            }
+        )
+    datos["total_postulaciones"] = total_postulaciones
+    return datos
+
+
+def _refrescar(condicion):
+    """Recalcula las tarjetas de las vacantes que cumplen la condición"""
+    vacantes = Vacante.query.options(*_plan_tarjeta()).filter(condicion).all()
+    if not vacantes:
+        return
+
+    existentes = {
+        t.id_vac: t
+        for t in TarjetaVacante.query.filter(
+            TarjetaVacante.id_vac.in_([v.id_vac for v in vacantes])
+        )
+    }
+    for vacante in vacantes:
+        total = vacante.total_postulaciones or 0
+        tarjeta = existentes.get(vacante.id_vac)
+        if tarjeta is None:
+            tarjeta = TarjetaVacante(id_vac=vacante.id_vac)
+            db.session.add(tarjeta)
+        empresa = vacante.empresa
+        tarjeta.id_emp = vacante.id_emp
+        tarjeta.estado_vac = vacante.estado_vac
+        tarjeta.fecha_publicacion = vacante.fecha_publicacion
+        tarjeta.salario = vacante.salario
+        tarjeta.duracion_proyecto = vacante.duracion_proyecto
+        tarjeta.tamaño_emp = empresa.tamaño if empresa else None
+        tarjeta.id_ciud_emp = empresa.id_ciud if empresa else None
+        tarjeta.nomb_ciud_emp = (
+            empresa.ciudad.nomb_ciud if empresa and empresa.ciudad else None
+        )
+        tarjeta.total_postulaciones = total
+        tarjeta.datos = json.dumps(serializar_tarjeta(vacante, total))
+
+
+def refrescar_tarjeta(id_vac):
+    refrescar_tarjetas([id_vac])
+
+
+def contar_en_tarjeta(id_vac, delta):
+    """
+    Ajusta solo el total de postulaciones de la tarjeta con un UPDATE
+    relativo, sin volver a serializarla: el listado toma el total de la
+    columna y no del JSON
+    """
+    db.session.execute(
+        db.update(TarjetaVacante)
+        .where(TarjetaVacante.id_vac == id_vac)
+        .values(total_postulaciones=TarjetaVacante.total_postulaciones + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refrescar_tarjetas(ids_vac):
+    if ids_vac:
+        _refrescar(Vacante.id_vac.in_(list(ids_vac)))
+
+
+def refrescar_tarjetas_empresa(id_emp):
+    _refrescar(Vacante.id_emp == id_emp)
+
+
+def eliminar_tarjetas(ids_vac):
+    if ids_vac:
+        TarjetaVacante.query.filter(TarjetaVacante.id_vac.in_(list(ids_vac))).delete(
+            synchronize_session=False
+        )
+
+
+def reconstruir_tarjetas(lote=500):
+    """Reconstruye todas las tarjetas por lotes (comando reconstruir-tarjetas)"""
+    ids = [fila[0] for fila in db.session.query(Vacante.id_vac).all()]
+    for inicio in range(0, len(ids), lote):
+        refrescar_tarjetas(ids[inicio : inicio + lote])
+        db.session.commit()
+    # Tarjetas huérfanas de vacantes que ya no existen
+    TarjetaVacante.query.filter(
+        ~TarjetaVacante.id_vac.in_(db.select(Vacante.id_vac))
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return len(ids)